@@ -0,0 +1 @@
+"""Performance benchmarks for nalogo (not part of the test suite)."""
@@ -0,0 +1,202 @@
+"""
+Benchmark request hot path of Client against the in-process emulator.
+
+Measures create/cancel throughput, create latency percentiles at several
+concurrency levels, a refresh storm (all tokens expire under load) and the
+cost of the error path. Requests go through the real Client, codec, auth
+and HTTP layers; only the network is replaced by FakeNalogService.
+
+Usage:
+    python -m benchmarks.bench_client [--receipts N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import functools
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import httpx
+
+from nalogo.client import Client
+from nalogo.dto.income import CancelCommentType
+from nalogo.exceptions import DomainException, raise_for_status
+from nalogo.income import IncomeAPI
+from nalogo.testing import FakeNalogService
+
+
+async def login(service: FakeNalogService) -> Client:
+    """Client authenticated against emulator (caller closes it)."""
+    client = Client(transport=service.transport())
+    await client.authenticate(
+        await client.create_new_access_token(service.inn, service.password)
+    )
+    return client
+
+
+async def run_concurrently(
+    operations: int, concurrency: int, operation: Callable[[int], Awaitable[Any]]
+) -> list[float]:
+    """Run operation(i) for i in range(operations), return per-call seconds."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def timed(index: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await operation(index)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(timed(i) for i in range(operations)))
+    return latencies
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Get q-th percentile (0..100) using inclusive interpolation."""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+async def bench_throughput(
+    receipts: int, concurrency: int, latency: float
+) -> dict[str, float]:
+    """Create and then cancel receipts, return operations per second."""
+    service = FakeNalogService(latency=latency)
+    uuids: list[str] = []
+    async with await login(service) as client:
+        income = client.income()
+
+        async def create(index: int) -> None:
+            result = await income.create(f"Service {index}", 100, 1)
+            uuids.append(result["approvedReceiptUuid"])
+
+        async def cancel(index: int) -> None:
+            await income.cancel(uuids[index], CancelCommentType.CANCEL)
+
+        start = time.perf_counter()
+        await run_concurrently(receipts, concurrency, create)
+        created = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await run_concurrently(receipts, concurrency, cancel)
+        cancelled = time.perf_counter() - start
+
+    return {
+        "create_ops_per_sec": receipts / created,
+        "cancel_ops_per_sec": receipts / cancelled,
+    }
+
+
+async def _create(income: IncomeAPI, index: int) -> dict[str, Any]:
+    """Create receipt number index."""
+    return await income.create(f"Service {index}", 100, 1)
+
+
+async def bench_latency(
+    receipts: int, concurrency_levels: list[int], latency: float
+) -> dict[str, float]:
+    """Measure create latency p50/p99 in milliseconds per concurrency level."""
+    results: dict[str, float] = {}
+    for concurrency in concurrency_levels:
+        service = FakeNalogService(latency=latency)
+        async with await login(service) as client:
+            latencies = await run_concurrently(
+                receipts,
+                concurrency,
+                functools.partial(_create, client.income()),
+            )
+        results[f"create_p50_ms_c{concurrency}"] = percentile(latencies, 50) * 1000
+        results[f"create_p99_ms_c{concurrency}"] = percentile(latencies, 99) * 1000
+    return results
+
+
+async def bench_refresh_storm(concurrency: int, latency: float) -> dict[str, float]:
+    """Expire tokens, fire concurrent requests, count refreshes and duration."""
+    service = FakeNalogService(latency=latency)
+    async with await login(service) as client:
+        user = client.user()
+        service.expire_tokens()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user.get() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "refresh_storm_ms": elapsed * 1000,
+        "refresh_storm_token_requests": float(service.requests["auth_token"]),
+    }
+
+
+def bench_error_path(iterations: int) -> dict[str, float]:
+    """
+    Measure raise_for_status() cost for 500 response in microseconds.
+
+    Error log records are still built but discarded, so terminal output
+    does not dominate the measurement.
+    """
+    request = httpx.Request("GET", "https://lknpd.nalog.ru/api/v1/user")
+    response = httpx.Response(
+        500, json={"code": 500, "message": "Internal error"}, request=request
+    )
+    ok = httpx.Response(200, json={}, request=request)
+
+    start = time.process_time()
+    for _ in range(iterations):
+        raise_for_status(ok)
+    success = time.process_time() - start
+
+    logger = logging.getLogger("nalogo")
+    handler = logging.NullHandler()
+    propagate = logger.propagate
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        start = time.process_time()
+        for _ in range(iterations):
+            with contextlib.suppress(DomainException):
+                raise_for_status(response)
+        failure = time.process_time() - start
+    finally:
+        logger.removeHandler(handler)
+        logger.propagate = propagate
+
+    return {
+        "status_ok_us": success / iterations * 1_000_000,
+        "status_error_us": failure / iterations * 1_000_000,
+    }
+
+
+async def bench(
+    receipts: int, concurrency: int, latency: float, levels: list[int]
+) -> dict[str, float]:
+    """Run all client benchmarks."""
+    results: dict[str, float] = {}
+    results.update(await bench_throughput(receipts, concurrency, latency))
+    results.update(await bench_latency(receipts, levels, latency))
+    results.update(await bench_refresh_storm(concurrency, latency))
+    results.update(bench_error_path(receipts * 10))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--receipts", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.001)
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        bench(args.receipts, args.concurrency, args.latency, args.levels)
+    )
+    for name, value in results.items():
+        print(f"{name:>32}: {value:,.2f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
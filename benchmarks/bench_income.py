@@ -0,0 +1,102 @@
+"""
+Benchmark per-receipt CPU cost of building /income request bodies.
+
+Compares the validating pydantic path (IncomeRequest.model_dump) with the
+fast path for pre-validated input (FastIncomeRequest.to_json). Network is
+not involved.
+
+Usage:
+    python -m benchmarks.bench_income [--receipts N] [--services N]
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+from nalogo.dto.fast import FastClient, FastIncomeRequest, FastServiceItem
+from nalogo.dto.income import (
+    IncomeClient,
+    IncomeRequest,
+    IncomeServiceItem,
+    IncomeType,
+    services_total,
+)
+
+INN = "7707083893"
+DISPLAY_NAME = "ООО Ромашка"
+
+
+def pydantic_body(services: int) -> dict[str, Any]:
+    """Build request body the way IncomeAPI.create_multiple_items() does."""
+    items = [
+        IncomeServiceItem(
+            name=f"Service {i}", amount=Decimal("100.50"), quantity=Decimal(1)
+        )
+        for i in range(services)
+    ]
+    now = datetime.now(UTC)
+    request = IncomeRequest(
+        operation_time=now,
+        request_time=now,
+        services=items,
+        total_amount=str(services_total(items)),
+        client=IncomeClient(
+            income_type=IncomeType.FROM_LEGAL_ENTITY,
+            inn=INN,
+            display_name=DISPLAY_NAME,
+        ),
+    )
+    return request.model_dump()
+
+
+def fast_body(services: int) -> dict[str, Any]:
+    """Build request body the way IncomeAPI.create_trusted_items() does."""
+    items = [
+        FastServiceItem(f"Service {i}", Decimal("100.50"), Decimal(1))
+        for i in range(services)
+    ]
+    request = FastIncomeRequest.build(
+        items,
+        datetime.now(UTC),
+        FastClient(
+            income_type=IncomeType.FROM_LEGAL_ENTITY,
+            inn=INN,
+            display_name=DISPLAY_NAME,
+        ),
+    )
+    return request.to_json()
+
+
+def bench(receipts: int, services: int) -> dict[str, float]:
+    """Build request bodies on both paths and return microseconds per receipt."""
+    paths: dict[str, Callable[[int], dict[str, Any]]] = {
+        "pydantic": pydantic_body,
+        "fast": fast_body,
+    }
+    results: dict[str, float] = {}
+    for name, build in paths.items():
+        start = time.process_time()
+        for _ in range(receipts):
+            build(services)
+        elapsed = time.process_time() - start
+        results[name] = elapsed / receipts * 1_000_000
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--receipts", type=int, default=20_000)
+    parser.add_argument("--services", type=int, default=1)
+    args = parser.parse_args()
+
+    results = bench(args.receipts, args.services)
+    for name, cost in results.items():
+        print(f"income {name:>8}: {cost:.1f} us/receipt")  # noqa: T201
+    print(f"speedup: {results['pydantic'] / results['fast']:.1f}x")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark per-request overhead of the AsyncHTTPClient middleware chain.
+
+Requests go to an httpx.MockTransport answering immediately, so the
+measured time is the client's own work: building the request, running
+the default chain (error status, token refresh, auth) and sending it.
+
+The cost of one middleware is far below the noise of a whole request, so
+it is measured on the chain alone: a context is passed through many
+no-op middlewares to an endpoint returning a ready response, and the
+time of an empty chain is subtracted.
+
+Usage:
+    python -m benchmarks.bench_middleware [--requests N]
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any
+
+import httpx
+
+from nalogo._http import AsyncHTTPClient, AuthProvider
+from nalogo.middleware import Middleware, RequestContext, build_chain
+
+
+class _StaticAuth(AuthProvider):
+    async def get_token(self) -> dict[str, Any] | None:
+        return {"token": "token", "refreshToken": "refresh"}
+
+    async def refresh(self, _refresh_token: str) -> dict[str, Any] | None:
+        return None
+
+
+class NoopMiddleware(Middleware):
+    """Middleware using the default hooks."""
+
+
+def _client(middlewares: int) -> AsyncHTTPClient:
+    transport = httpx.MockTransport(lambda _request: httpx.Response(200, json={}))
+    return AsyncHTTPClient(
+        "https://lknpd.nalog.ru/api/v1",
+        _StaticAuth(),
+        transport=transport,
+        middlewares=[NoopMiddleware() for _ in range(middlewares)],
+    )
+
+
+async def _per_request_us(client: AsyncHTTPClient, requests: int) -> float:
+    for _ in range(min(requests, 100)):
+        await client.get("/user")
+    start = time.perf_counter()
+    for _ in range(requests):
+        await client.get("/user")
+    elapsed = time.perf_counter() - start
+    await client.aclose()
+    return elapsed / requests * 1_000_000
+
+
+async def _chain_seconds(
+    middlewares: int, ctx: RequestContext, calls: int, rounds: int
+) -> float:
+    """Best of rounds time of calls through a chain of no-op middlewares."""
+    response = httpx.Response(200, json={}, request=ctx.request)
+
+    async def endpoint(_ctx: RequestContext) -> httpx.Response:
+        return response
+
+    handler = build_chain([NoopMiddleware() for _ in range(middlewares)], endpoint)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(calls):
+            await handler(ctx)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def bench(requests: int, extra: int = 50, rounds: int = 5) -> dict[str, float]:
+    """
+    Measure request cost with default chain and cost of one middleware.
+
+    Args:
+        requests: Requests sent through the client; also calls per round
+            through the bare chain
+        extra: No-op middlewares in the measured chain
+        rounds: Chain timing rounds, the fastest one is used
+
+    Returns:
+        middleware_request_us: Request with default chain in microseconds
+        middleware_each_us: Added cost of one no-op middleware
+    """
+    client = _client(0)
+    ctx = RequestContext(
+        "GET", "/user", httpx.Request("GET", client.base_url + "/user"), client
+    )
+    empty = await _chain_seconds(0, ctx, requests, rounds)
+    loaded = await _chain_seconds(extra, ctx, requests, rounds)
+    return {
+        "middleware_request_us": await _per_request_us(client, requests),
+        "middleware_each_us": (loaded - empty) / (requests * extra) * 1_000_000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    for name, value in asyncio.run(bench(args.requests)).items():
+        print(f"{name:>24}: {value:,.2f}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
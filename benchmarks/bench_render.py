@@ -0,0 +1,57 @@
+"""
+Benchmark local receipt rendering throughput.
+
+Usage:
+    python -m benchmarks.bench_render [--receipts N] [--services N]
+"""
+
+import argparse
+import time
+from typing import Any
+
+from nalogo.receipt_render import render_receipt
+
+
+def make_receipt(index: int, services: int) -> dict[str, Any]:
+    """Build receipt payload shaped like ReceiptAPI.json() response."""
+    return {
+        "receiptId": f"200{index:07d}",
+        "operationTime": "2024-01-01T12:00:00+03:00",
+        "inn": "500100732259",
+        "services": [
+            {"name": f"Service {i}", "quantity": 1, "amount": "100.50"}
+            for i in range(services)
+        ],
+        "totalAmount": str(100.5 * services),
+        "incomeType": "FROM_LEGAL_ENTITY",
+        "clientInn": "7707083893",
+        "clientDisplayName": "ООО <Ромашка>",
+        "cancellationInfo": None,
+    }
+
+
+def bench(receipts: int, services: int) -> dict[str, float]:
+    """Render every receipt in both formats and return receipts/sec."""
+    payloads = [make_receipt(i, services) for i in range(receipts)]
+    results: dict[str, float] = {}
+    for fmt in ("html", "text"):
+        start = time.perf_counter()
+        for payload in payloads:
+            render_receipt(payload, fmt=fmt, seller_name="Иванов Иван Иванович")
+        elapsed = time.perf_counter() - start
+        results[fmt] = receipts / elapsed
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--receipts", type=int, default=10_000)
+    parser.add_argument("--services", type=int, default=3)
+    args = parser.parse_args()
+
+    for fmt, rate in bench(args.receipts, args.services).items():
+        print(f"render {fmt:>4}: {rate:,.0f} receipts/s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Run all benchmarks, save results as JSON and fail on regressions.
+
+Each metric is compared with the same metric in a baseline results file;
+a run fails (exit code 1) if any metric is worse than baseline by more
+than the threshold (relative, default 10%) and by more than the absolute
+floor of its unit, so sub-microsecond timings do not fail on noise.
+Throughput metrics regress when they drop, timings and counts when they
+grow.
+
+Usage:
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json --threshold 0.15
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import platform
+import sys
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from benchmarks import bench_client, bench_income, bench_middleware, bench_render
+
+# Metric name suffixes for which a larger value is better
+HIGHER_IS_BETTER = ("_per_sec",)
+
+# Metric name suffix -> smallest absolute change that can be a regression
+ABSOLUTE_FLOOR = {"_us": 0.25}
+
+
+@dataclass(frozen=True)
+class Regression:
+    """Metric that got worse than baseline by more than threshold."""
+
+    name: str
+    baseline: float
+    current: float
+    change: float
+
+
+def higher_is_better(name: str) -> bool:
+    """Check whether larger values of metric are improvements."""
+    return name.endswith(HIGHER_IS_BETTER)
+
+
+def absolute_floor(name: str) -> float:
+    """Get smallest absolute change of metric counted as regression."""
+    for suffix, floor in ABSOLUTE_FLOOR.items():
+        if name.endswith(suffix):
+            return floor
+    return 0.0
+
+
+def run(quick: bool = False) -> dict[str, float]:
+    """
+    Run all benchmarks.
+
+    Args:
+        quick: Use small sizes (smoke run, numbers are noisy)
+
+    Returns:
+        Metric name -> value
+    """
+    receipts = 50 if quick else 500
+    results: dict[str, float] = {}
+
+    income = bench_income.bench(receipts * 4, services=1)
+    results["income_model_dump_us"] = income["pydantic"]
+    results["income_fast_body_us"] = income["fast"]
+
+    for fmt, rate in bench_render.bench(receipts * 2, services=3).items():
+        results[f"render_{fmt}_per_sec"] = rate
+
+    results.update(
+        asyncio.run(
+            bench_client.bench(
+                receipts, concurrency=16, latency=0.001, levels=[1, 8, 32]
+            )
+        )
+    )
+    results.update(asyncio.run(bench_middleware.bench(receipts * 10)))
+    return results
+
+
+def compare(
+    current: dict[str, float], baseline: dict[str, float], threshold: float
+) -> list[Regression]:
+    """
+    Find metrics that regressed against baseline.
+
+    Args:
+        current: Metrics of this run
+        baseline: Metrics of baseline run (metrics missing here are skipped)
+        threshold: Allowed relative change, e.g. 0.1 for 10%
+
+    Returns:
+        List of regressions (empty if none); change is infinite for
+        metrics with zero baseline
+
+    Raises:
+        ValueError: For negative threshold
+    """
+    if threshold < 0:
+        raise ValueError("Threshold cannot be negative")
+
+    regressions: list[Regression] = []
+    for name, value in current.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        delta = value - reference
+        worse = -delta if higher_is_better(name) else delta
+        if worse <= absolute_floor(name):
+            continue
+        if reference and worse / abs(reference) <= threshold:
+            continue
+        change = delta / abs(reference) if reference else math.copysign(math.inf, delta)
+        regressions.append(Regression(name, reference, value, change))
+    return regressions
+
+
+def load(path: str | Path) -> dict[str, float]:
+    """Load metrics from results file written by save()."""
+    with Path(path).open(encoding="utf-8") as f:
+        data: dict[str, Any] = json.load(f)
+    return {name: float(value) for name, value in data["results"].items()}
+
+
+def save(path: str | Path, results: dict[str, float]) -> None:
+    """Save metrics with run metadata as JSON."""
+    data = {
+        "created_at": datetime.now(UTC).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    with target.open("w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--baseline", help="Compare with results JSON file")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    parser.add_argument("--quick", action="store_true", help="Small smoke run")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick)
+    for name, value in sorted(results.items()):
+        print(f"{name:>32}: {value:,.2f}")  # noqa: T201
+    if args.output:
+        save(args.output, results)
+
+    if not args.baseline:
+        return 0
+    regressions = compare(results, load(args.baseline), args.threshold)
+    for regression in regressions:
+        print(  # noqa: T201
+            f"REGRESSION {regression.name}: {regression.baseline:,.2f} -> "
+            f"{regression.current:,.2f} ({regression.change:+.1%})"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
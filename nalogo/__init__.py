@@ -12,8 +12,10 @@ License: MIT
 from .client import Client
 from .exceptions import (
     ClientException,
+    DeadlineExceededException,
     DomainException,
     ForbiddenException,
+    IncomeLimitExceededException,
     NotFoundException,
     PhoneException,
     ServerException,
@@ -26,8 +28,10 @@ __version__ = "1.0.0"
 __all__ = [
     "Client",
     "ClientException",
+    "DeadlineExceededException",
     "DomainException",
     "ForbiddenException",
+    "IncomeLimitExceededException",
     "NotFoundException",
     "PhoneException",
     "ServerException",
@@ -5,11 +5,32 @@ Based on PHP library's AuthenticationPlugin and HTTP architecture.
 
 import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Any
 
 import httpx
 
-from .exceptions import raise_for_status
+from .codec import JSONCodec, default_codec
+from .hedging import HedgePolicy
+from .metrics import HTTPMetrics
+from .middleware import (
+    AdaptiveTimeoutMiddleware,
+    AuthMiddleware,
+    DeadlineMiddleware,
+    ErrorStatusMiddleware,
+    HedgingMiddleware,
+    MetricsMiddleware,
+    Middleware,
+    RequestContext,
+    SchedulerMiddleware,
+    TokenRefreshMiddleware,
+    TracingMiddleware,
+    build_chain,
+)
+from .scheduler import RequestScheduler
+from .timeouts import AdaptiveTimeouts, EndpointTimeouts, clamp, remaining
+from .timeouts import deadline as deadline_scope
+from .tracing import NOOP_TRACER, Tracer
 
 
 class AuthProvider(ABC):
@@ -32,6 +53,21 @@ class AsyncHTTPClient:
     - Adds Bearer authorization header
     - On 401 response, attempts token refresh once
     - Retries request with new token (max 2 attempts)
+
+    These steps, error status handling, metrics and tracing run as an
+    ordered middleware chain (see nalogo.middleware); extra middlewares
+    are added with add_middleware().
+
+    JSON bodies are encoded to bytes with the configured codec and
+    responses are decoded from raw content via json().
+
+    Timeouts are selected per endpoint class (EndpointTimeouts) and limited
+    by the call deadline, if any; with adaptive_timeouts they follow
+    observed latency percentiles instead (see nalogo.timeouts). An optional
+    RequestScheduler queues requests by priority class.
+
+    Requests share one pooled httpx.AsyncClient (keep-alive connections are
+    reused); it is created lazily per event loop and closed by aclose().
     """
 
     def __init__(
@@ -39,50 +75,156 @@ class AsyncHTTPClient:
         base_url: str,
         auth_provider: AuthProvider,
         default_headers: dict[str, str] | None = None,
-        timeout: float = 10.0,
+        timeout: float | httpx.Timeout | EndpointTimeouts = 10.0,
+        *,
+        codec: JSONCodec | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limits: httpx.Limits | None = None,
+        metrics: HTTPMetrics | None = None,
+        tracer: Tracer | None = None,
+        middlewares: Sequence[Middleware] = (),
+        deadline: float | None = None,
+        adaptive_timeouts: AdaptiveTimeouts | None = None,
+        hedging: HedgePolicy | None = None,
+        scheduler: RequestScheduler | None = None,
     ):
         self.base_url = base_url
         self.auth_provider = auth_provider
         self.default_headers = default_headers or {}
         self.timeout = timeout
-        self._refresh_lock = asyncio.Lock()
+        self.timeouts = (
+            timeout
+            if isinstance(timeout, EndpointTimeouts)
+            else EndpointTimeouts(timeout)
+        )
+        # Opt-in timeouts from observed latency, replacing self.timeouts
+        self.adaptive_timeouts = adaptive_timeouts
+        # Opt-in hedging of slow idempotent requests
+        self.hedging = hedging
+        # Opt-in priority queueing of requests
+        self.scheduler = scheduler
+        if scheduler is not None and scheduler.metrics is None:
+            scheduler.metrics = metrics
+        self.codec = codec or default_codec()
+        # Custom transport, e.g. nalogo.testing.FakeNalogService.transport()
+        self.transport = transport
+        self.limits = limits or httpx.Limits(max_connections=100)
+        # Request metrics; None disables recording entirely
+        self.metrics = metrics
+        self.tracer = tracer or NOOP_TRACER
+        self._client: httpx.AsyncClient | None = None
+        self._client_loop: asyncio.AbstractEventLoop | None = None
+        self.clients_created = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
         self.max_retries = 2  # Same as PHP AuthenticationPlugin::RETRY_LIMIT
 
-    async def _get_auth_headers(self) -> dict[str, str]:
-        """Get authorization headers from current token."""
-        token_data = await self.auth_provider.get_token()
-        if not token_data or "token" not in token_data:
-            return {}
-
-        return {"Authorization": f"Bearer {token_data['token']}"}
+        # Ordered outermost first; observability layers only when enabled
+        self.middlewares: list[Middleware] = []
+        if self.tracer.enabled:
+            self.middlewares.append(TracingMiddleware(self.tracer))
+        if metrics is not None:
+            self.middlewares.append(MetricsMiddleware(metrics))
+        self.middlewares.append(DeadlineMiddleware(deadline))
+        if scheduler is not None:
+            self.middlewares.append(SchedulerMiddleware(scheduler))
+        self.middlewares.extend(middlewares)
+        self.middlewares.extend(
+            [
+                ErrorStatusMiddleware(),
+                TokenRefreshMiddleware(auth_provider, metrics, self.tracer),
+                AuthMiddleware(auth_provider),
+            ]
+        )
+        if hedging is not None:
+            self.middlewares.append(HedgingMiddleware(hedging, metrics))
+        if adaptive_timeouts is not None:
+            self.middlewares.append(
+                AdaptiveTimeoutMiddleware(adaptive_timeouts, metrics)
+            )
+        self._handler = build_chain(self.middlewares, self._send)
 
-    async def _handle_401_response(
-        self, client: httpx.AsyncClient, request: httpx.Request
-    ) -> httpx.Response | None:
+    def add_middleware(self, middleware: Middleware, index: int | None = None) -> None:
         """
-        Handle 401 response by refreshing token and retrying request.
+        Insert middleware into chain.
 
-        Uses asyncio.Lock to prevent concurrent refresh attempts,
-        similar to PHP's retry storage mechanism.
+        Args:
+            middleware: Middleware to add
+            index: Position in middlewares (outermost is 0); default places
+                it after user middlewares, outside ErrorStatusMiddleware
         """
-        async with self._refresh_lock:
-            token_data = await self.auth_provider.get_token()
-            if not token_data or "refreshToken" not in token_data:
-                return None
-
-            # Attempt token refresh
-            new_token_data = await self.auth_provider.refresh(
-                token_data["refreshToken"]
+        if index is None:
+            index = next(
+                i
+                for i, m in enumerate(self.middlewares)
+                if isinstance(m, ErrorStatusMiddleware)
+            )
+        self.middlewares.insert(index, middleware)
+        self._handler = build_chain(self.middlewares, self._send)
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get shared pooled client, creating it for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._client is None
+            or self._client.is_closed
+            or self._client_loop is not loop
+        ):
+            # Connections are bound to the loop they were opened in
+            self._discard_client()
+            self._client = httpx.AsyncClient(
+                transport=self.transport, limits=self.limits
             )
-            if not new_token_data or "token" not in new_token_data:
-                return None
+            self._client_loop = loop
+            self.clients_created += 1
+        return self._client
 
-            # Update request with new authorization header
-            new_auth_headers = {"Authorization": f"Bearer {new_token_data['token']}"}
-            request.headers.update(new_auth_headers)
+    def _discard_client(self) -> None:
+        """
+        Drop shared client bound to another event loop.
 
-            # Retry request with new token
-            return await client.send(request)
+        Its connections can only be closed in the loop that opened them: if
+        that loop still runs (in another thread) the client is closed there,
+        otherwise the client and its transport are released so the sockets
+        are reclaimed with them. A custom transport belongs to the caller
+        and is left open.
+        """
+        client, loop = self._client, self._client_loop
+        self._client = None
+        self._client_loop = None
+        if client is None or client.is_closed or self.transport is not None:
+            return
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+    async def aclose(self) -> None:
+        """Close shared client and its connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._client_loop = None
+
+    def pool_stats(self) -> dict[str, int]:
+        """
+        Get connection pool statistics.
+
+        Returns:
+            Dictionary with in_flight, peak_in_flight and clients_created
+            request counters, plus connections and idle_connections when the
+            default httpx transport is used
+        """
+        stats = {
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "clients_created": self.clients_created,
+        }
+        # httpx does not expose pool state publicly; read it when available
+        pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if connections is not None:
+            stats["connections"] = len(connections)
+            stats["idle_connections"] = sum(1 for c in connections if c.is_idle())
+        return stats
 
     async def request(
         self,
@@ -90,59 +232,87 @@ class AsyncHTTPClient:
         path: str,
         headers: dict[str, str] | None = None,
         json_data: dict[str, Any] | None = None,
+        deadline: float | None = None,
         **kwargs: Any,
     ) -> httpx.Response:
         """
-        Make HTTP request with automatic auth and 401 retry logic.
+        Make HTTP request through the middleware chain.
 
         Args:
             method: HTTP method (GET, POST, etc.)
             path: API path (e.g., "/income")
-            headers: Additional headers
+            headers: Additional headers; an Authorization header here is
+                sent instead of the current token until a 401 refresh
             json_data: JSON request body
-            **kwargs: Additional httpx.AsyncClient.request arguments
+            deadline: Budget in seconds for the request including token
+                refresh and retry (combined with nalogo.timeouts.deadline())
+            **kwargs: Additional httpx.AsyncClient.build_request arguments
 
         Returns:
             httpx.Response object
 
         Raises:
             Domain exceptions via raise_for_status()
+            DeadlineExceededException: If the deadline runs out
         """
         # Prepare headers
         request_headers = self.default_headers.copy()
-        auth_headers = await self._get_auth_headers()
-        request_headers.update(auth_headers)
         if headers:
             request_headers.update(headers)
 
-        # Prepare request parameters
-        request_kwargs = {
-            "method": method,
-            "url": self.base_url + path,
-            "headers": request_headers,
-            "timeout": self.timeout,
-            **kwargs,
-        }
-
+        content = None
         if json_data is not None:
-            request_kwargs["json"] = json_data
-
-        async with httpx.AsyncClient() as client:
-            # Initial request
-            response = await client.request(**request_kwargs)
+            content = self.codec.dumps(json_data)
+            request_headers.setdefault("Content-Type", "application/json")
+
+        request = self._get_client().build_request(
+            method,
+            self.base_url + path,
+            headers=request_headers,
+            content=content,
+            timeout=self.timeouts.for_path(path),
+            **kwargs,
+        )
+        ctx = RequestContext(method, path, request, self)
+        if headers and any(name.lower() == "authorization" for name in headers):
+            ctx.state["caller_authorization"] = True
+        with deadline_scope(deadline):
+            return await self._handler(ctx)
+
+    async def _send(self, ctx: RequestContext) -> httpx.Response:
+        """Innermost handler: send request on shared client."""
+        budget = remaining()
+        if budget is not None:
+            # Each attempt gets at most the budget left
+            ctx.request.extensions["timeout"] = clamp(
+                ctx.request.extensions["timeout"], budget
+            )
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await self._get_client().send(ctx.request)
+        finally:
+            self.in_flight -= 1
+
+    def json(self, response: httpx.Response) -> Any:
+        """
+        Decode JSON response body with the configured codec.
 
-            # Handle 401 with token refresh (max 1 retry)
-            if response.status_code == 401:
-                # Build request object for retry
-                request = client.build_request(**request_kwargs)
-                retry_response = await self._handle_401_response(client, request)
-                if retry_response is not None:
-                    response = retry_response
+        Args:
+            response: Response returned by request()
 
-            # Check for domain exceptions
-            raise_for_status(response)
+        Returns:
+            Decoded JSON value
 
-            return response
+        Raises:
+            json.JSONDecodeError: For invalid JSON
+        """
+        if not self.tracer.enabled:
+            return self.codec.loads(response.content)
+        with self.tracer.span(
+            "json.parse", {"http.response_size": len(response.content)}
+        ):
+            return self.codec.loads(response.content)
 
     async def get(
         self,
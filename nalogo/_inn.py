@@ -0,0 +1,44 @@
+"""
+INN control-digit checks (FNS algorithm).
+Kept apart from nalogo.validation so the income DTOs can use them.
+"""
+
+# Control digit weights (FNS algorithm)
+_WEIGHTS_10 = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+_WEIGHTS_11 = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+_WEIGHTS_12 = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+
+_LEGAL_INN_LENGTH = 10
+_PERSON_INN_LENGTH = 12
+
+_DIGITS = frozenset("0123456789")
+
+
+def _control_digit(digits: list[int], weights: tuple[int, ...]) -> int:
+    return sum(d * w for d, w in zip(digits, weights, strict=False)) % 11 % 10
+
+
+def inn_error(inn: str) -> str | None:
+    """
+    Validate INN format and control digits.
+
+    Args:
+        inn: INN string (10 digits for organizations, 12 for individuals)
+
+    Returns:
+        Error message or None if INN is valid
+    """
+    if not _DIGITS.issuperset(inn) or not inn:
+        return "INN must contain only numbers"
+    if len(inn) not in (_LEGAL_INN_LENGTH, _PERSON_INN_LENGTH):
+        return "INN length must be 10 or 12 digits"
+
+    digits = [ord(c) - 48 for c in inn]
+    if len(digits) == _LEGAL_INN_LENGTH:
+        valid = _control_digit(digits, _WEIGHTS_10) == digits[9]
+    else:
+        valid = (
+            _control_digit(digits, _WEIGHTS_11) == digits[10]
+            and _control_digit(digits, _WEIGHTS_12) == digits[11]
+        )
+    return None if valid else "INN checksum is invalid"
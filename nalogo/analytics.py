@@ -0,0 +1,469 @@
+"""
+Local income and tax analytics over mirrored receipts.
+Receipts are loaded into compact columnar arrays (amounts as integer
+kopecks) and aggregated with NumPy when installed, pure Python otherwise.
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any
+
+from .dto.income import IncomeType
+from .income import STATUS_CANCELLED, parse_operation_time
+from .money import to_kopecks
+
+if TYPE_CHECKING:
+    from .mirror import IncomeMirror
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+# Tax periods follow Moscow time
+TAX_TIMEZONE = timezone(timedelta(hours=3))
+
+INCOME_TYPES: tuple[IncomeType, ...] = tuple(IncomeType)
+_INCOME_TYPE_CODES = {
+    income_type.value: i for i, income_type in enumerate(INCOME_TYPES)
+}
+
+# NPD rates in percent: 4% for individuals, 6% for legal entities and foreign agencies
+TAX_RATES: dict[IncomeType, int] = {
+    IncomeType.FROM_INDIVIDUAL: 4,
+    IncomeType.FROM_LEGAL_ENTITY: 6,
+    IncomeType.FROM_FOREIGN_AGENCY: 6,
+}
+
+# Tax deduction (bonus) reduces rate by 1% (4% rate) or 2% (6% rate)
+DEDUCTION_RATES: dict[IncomeType, int] = {
+    IncomeType.FROM_INDIVIDUAL: 1,
+    IncomeType.FROM_LEGAL_ENTITY: 2,
+    IncomeType.FROM_FOREIGN_AGENCY: 2,
+}
+
+
+def percent_of(kopecks: int, percent: int) -> int:
+    """Percent of amount in kopecks rounded half up to whole kopecks."""
+    return (kopecks * percent * 2 + 100) // 200
+
+
+def tax_period_id(operation_time: datetime) -> int:
+    """Tax period (YYYYMM) of operation time in Moscow time."""
+    local = operation_time.astimezone(TAX_TIMEZONE)
+    return local.year * 100 + local.month
+
+
+class _Factor:
+    """Maps hashable labels to dense integer codes."""
+
+    def __init__(self) -> None:
+        self.labels: list[Any] = []
+        self._codes: dict[Any, int] = {}
+
+    def code(self, label: Any) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = self._codes[label] = len(self.labels)
+            self.labels.append(label)
+        return code
+
+
+@dataclass
+class IncomeColumns:
+    """
+    Columnar receipt storage.
+
+    Each receipt is one row across parallel arrays: account and client
+    codes (indexes into accounts/clients), tax period (YYYYMM), income type
+    code (index into INCOME_TYPES), amount in kopecks and cancelled flag.
+    Receipts with missing or unknown income type cannot be taxed correctly;
+    they are left out and counted in skipped.
+    """
+
+    accounts: list[str] = field(default_factory=list)
+    clients: list[str | None] = field(default_factory=list)
+    account: "array[int]" = field(default_factory=lambda: array("i"))
+    client: "array[int]" = field(default_factory=lambda: array("i"))
+    period: "array[int]" = field(default_factory=lambda: array("i"))
+    income_type: "array[int]" = field(default_factory=lambda: array("b"))
+    amount: "array[int]" = field(default_factory=lambda: array("q"))
+    cancelled: "array[int]" = field(default_factory=lambda: array("b"))
+    skipped: int = 0
+
+    def __len__(self) -> int:
+        return len(self.amount)
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[dict[str, Any]], account: str = ""
+    ) -> "IncomeColumns":
+        """
+        Load income records in listing format.
+
+        Args:
+            records: Income records (IncomeAPI.iter_incomes(), IncomeMirror.query())
+            account: Account label (e.g. self-employed INN) for all records
+
+        Returns:
+            IncomeColumns instance
+        """
+        builder = _ColumnsBuilder()
+        for record in records:
+            period = record.get("taxPeriodId") or tax_period_id(
+                parse_operation_time(record.get("operationTime"))
+            )
+            builder.append(
+                account,
+                record.get("clientInn"),
+                int(period),
+                record.get("incomeType"),
+                to_kopecks(record.get("totalAmount", 0)),
+                cancelled=bool(record.get("cancellationInfo")),
+            )
+        return builder.build()
+
+    @classmethod
+    def from_mirror(
+        cls,
+        mirror: "IncomeMirror",
+        account: str = "",
+        from_: datetime | None = None,
+        to: datetime | None = None,
+    ) -> "IncomeColumns":
+        """
+        Load receipts from IncomeMirror without decoding JSON payloads.
+
+        Args:
+            mirror: IncomeMirror instance
+            account: Account label for all records
+            from_: Start of operation time range (inclusive)
+            to: End of operation time range (inclusive)
+
+        Returns:
+            IncomeColumns instance
+        """
+        builder = _ColumnsBuilder()
+        for operation_ts, client_inn, status, income_type, kopecks in mirror.rows(
+            from_=from_, to=to
+        ):
+            builder.append(
+                account,
+                client_inn,
+                tax_period_id(datetime.fromtimestamp(operation_ts, UTC)),
+                income_type,
+                kopecks,
+                cancelled=status == STATUS_CANCELLED,
+            )
+        return builder.build()
+
+    @classmethod
+    def concat(cls, parts: Sequence["IncomeColumns"]) -> "IncomeColumns":
+        """
+        Concatenate columns of several accounts.
+
+        Args:
+            parts: IncomeColumns instances
+
+        Returns:
+            Combined IncomeColumns with re-coded accounts and clients
+        """
+        result = cls()
+        accounts = _Factor()
+        clients = _Factor()
+        for part in parts:
+            account_map = array("i", (accounts.code(a) for a in part.accounts))
+            client_map = array("i", (clients.code(c) for c in part.clients))
+            result.account.extend(account_map[code] for code in part.account)
+            result.client.extend(client_map[code] for code in part.client)
+            result.period.extend(part.period)
+            result.income_type.extend(part.income_type)
+            result.amount.extend(part.amount)
+            result.cancelled.extend(part.cancelled)
+            result.skipped += part.skipped
+        result.accounts = accounts.labels
+        result.clients = clients.labels
+        return result
+
+
+class _ColumnsBuilder:
+    """Row-wise appender producing IncomeColumns."""
+
+    def __init__(self) -> None:
+        self.columns = IncomeColumns()
+        self._accounts = _Factor()
+        self._clients = _Factor()
+
+    def append(
+        self,
+        account: str,
+        client_inn: str | None,
+        period: int,
+        income_type: str | None,
+        kopecks: int,
+        *,
+        cancelled: bool,
+    ) -> None:
+        columns = self.columns
+        type_code = _INCOME_TYPE_CODES.get(income_type or "")
+        if type_code is None:
+            columns.skipped += 1
+            return
+        columns.account.append(self._accounts.code(account))
+        columns.client.append(self._clients.code(client_inn))
+        columns.period.append(period)
+        columns.income_type.append(type_code)
+        columns.amount.append(kopecks)
+        columns.cancelled.append(1 if cancelled else 0)
+
+    def build(self) -> IncomeColumns:
+        self.columns.accounts = self._accounts.labels
+        self.columns.clients = self._clients.labels
+        return self.columns
+
+
+@dataclass(frozen=True)
+class TaxEstimate:
+    """
+    Tax estimate of one account for one tax period.
+
+    nominal_tax is income taxed at full rates; tax additionally applies
+    the tax deduction (bonus) when deduction_remaining was given, and is
+    what TaxAPI.get() reports as accrued tax for the period.
+    """
+
+    account: str
+    period: int
+    income: dict[IncomeType, int]
+    nominal_tax: int
+    deduction_used: int
+    tax: int
+
+    @property
+    def total_income(self) -> int:
+        """Total income in kopecks."""
+        return sum(self.income.values())
+
+
+class IncomeAnalytics:
+    """
+    Grouped aggregations over IncomeColumns.
+
+    Cancelled receipts are excluded from all totals. Results are integer
+    kopecks; use kopecks_to_decimal() for rubles.
+
+    Example:
+        >>> columns = IncomeColumns.from_mirror(mirror, account="500100732259")
+        >>> analytics = IncomeAnalytics(columns)
+        >>> analytics.income_totals(period=202401)
+        {'500100732259': 1234500}
+    """
+
+    def __init__(self, columns: IncomeColumns, use_numpy: bool | None = None):
+        """
+        Initialize analytics.
+
+        Args:
+            columns: Receipts in columnar form
+            use_numpy: Force (True) or disable (False) NumPy; auto-detect by default
+
+        Raises:
+            ImportError: If use_numpy=True and NumPy is not installed
+        """
+        if use_numpy and np is None:
+            raise ImportError("NumPy is required for use_numpy=True")
+        self.columns = columns
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+
+    def _array(self, name: str) -> Any:
+        """
+        Zero-copy NumPy view of column.
+
+        Views are not cached: while one exists the array.array cannot be
+        resized, and a cached view would miss rows appended later.
+        """
+        column = getattr(self.columns, name)
+        return np.frombuffer(column, dtype=column.typecode)
+
+    def group_sum(
+        self,
+        by: Sequence[str],
+        period: int | None = None,
+        account: str | None = None,
+    ) -> dict[tuple[int, ...], int]:
+        """
+        Sum amounts of non-cancelled receipts grouped by columns.
+
+        Args:
+            by: Column names to group by ("account", "client", "period",
+                "income_type")
+            period: Only include given tax period (YYYYMM)
+            account: Only include given account
+
+        Returns:
+            Mapping of group codes tuple to total kopecks
+        """
+        columns = self.columns
+        account_code: int | None = None
+        if account is not None:
+            if account not in columns.accounts:
+                return {}
+            account_code = columns.accounts.index(account)
+
+        if self.use_numpy:
+            return self._group_sum_numpy(by, period, account_code)
+
+        keys = [getattr(columns, name) for name in by]
+        totals: dict[tuple[int, ...], int] = {}
+        for row, kopecks in enumerate(columns.amount):
+            if columns.cancelled[row]:
+                continue
+            if period is not None and columns.period[row] != period:
+                continue
+            if account_code is not None and columns.account[row] != account_code:
+                continue
+            key = tuple(column[row] for column in keys)
+            totals[key] = totals.get(key, 0) + kopecks
+        return totals
+
+    def _group_sum_numpy(
+        self, by: Sequence[str], period: int | None, account_code: int | None
+    ) -> dict[tuple[int, ...], int]:
+        mask = self._array("cancelled") == 0
+        if period is not None:
+            mask &= self._array("period") == period
+        if account_code is not None:
+            mask &= self._array("account") == account_code
+        if not mask.any():
+            return {}
+
+        keys = [self._array(name)[mask].astype(np.int64) for name in by]
+        amounts = self._array("amount")[mask]
+        if not keys:
+            return {(): int(amounts.sum())}
+
+        # Compose one int64 key per row from dense per-column codes
+        composite = np.zeros(len(amounts), dtype=np.int64)
+        bases: list[tuple[Any, int]] = []
+        for key in keys:
+            uniques, inverse = np.unique(key, return_inverse=True)
+            composite = composite * len(uniques) + inverse
+            bases.append((uniques, len(uniques)))
+
+        groups, group_index = np.unique(composite, return_inverse=True)
+        sums = np.zeros(len(groups), dtype=np.int64)
+        np.add.at(sums, group_index, amounts)
+
+        totals: dict[tuple[int, ...], int] = {}
+        for group, total in zip(groups.tolist(), sums.tolist(), strict=True):
+            parts: list[int] = []
+            rest = group
+            for uniques, size in reversed(bases):
+                rest, code = divmod(rest, size)
+                parts.append(int(uniques[code]))
+            totals[tuple(reversed(parts))] = total
+        return totals
+
+    def income_totals(self, period: int | None = None) -> dict[str, int]:
+        """
+        Total income per account.
+
+        Args:
+            period: Tax period (YYYYMM); all periods by default
+
+        Returns:
+            Mapping of account to kopecks
+        """
+        accounts = self.columns.accounts
+        return {
+            accounts[code]: total
+            for (code,), total in self.group_sum(("account",), period=period).items()
+        }
+
+    def month_to_date(self, now: datetime | None = None) -> dict[str, int]:
+        """
+        Income of the current tax period per account.
+
+        Args:
+            now: Current moment (default: current UTC time)
+
+        Returns:
+            Mapping of account to kopecks
+        """
+        return self.income_totals(period=tax_period_id(now or datetime.now(UTC)))
+
+    def client_totals(
+        self, period: int | None = None, account: str | None = None
+    ) -> dict[tuple[str, str | None], int]:
+        """
+        Total income per (account, client INN).
+
+        Args:
+            period: Tax period (YYYYMM); all periods by default
+            account: Only include given account
+
+        Returns:
+            Mapping of (account, client INN) to kopecks
+        """
+        accounts = self.columns.accounts
+        clients = self.columns.clients
+        return {
+            (accounts[account_code], clients[client_code]): total
+            for (account_code, client_code), total in self.group_sum(
+                ("account", "client"), period=period, account=account
+            ).items()
+        }
+
+    def tax_estimates(
+        self,
+        period: int,
+        deduction_remaining: dict[str, int] | None = None,
+    ) -> dict[str, TaxEstimate]:
+        """
+        Estimate tax for period per account.
+
+        Tax is computed per income type at 4%/6% rates and rounded half up
+        to kopecks. With deduction_remaining (kopecks of unused tax
+        deduction per account) the reduced rate is applied until the
+        deduction is exhausted.
+
+        Args:
+            period: Tax period (YYYYMM)
+            deduction_remaining: Remaining tax deduction per account in kopecks
+
+        Returns:
+            Mapping of account to TaxEstimate
+        """
+        by_account: dict[int, dict[IncomeType, int]] = {}
+        for (account_code, type_code), total in self.group_sum(
+            ("account", "income_type"), period=period
+        ).items():
+            by_account.setdefault(account_code, {})[INCOME_TYPES[type_code]] = total
+
+        estimates: dict[str, TaxEstimate] = {}
+        for account_code, income in by_account.items():
+            account = self.columns.accounts[account_code]
+            remaining = (deduction_remaining or {}).get(account, 0)
+            nominal = 0
+            used = 0
+            for income_type in INCOME_TYPES:
+                kopecks = income.get(income_type, 0)
+                if not kopecks:
+                    continue
+                nominal += percent_of(kopecks, TAX_RATES[income_type])
+                reduction = min(
+                    percent_of(kopecks, DEDUCTION_RATES[income_type]), remaining
+                )
+                remaining -= reduction
+                used += reduction
+            estimates[account] = TaxEstimate(
+                account=account,
+                period=period,
+                income=income,
+                nominal_tax=nominal,
+                deduction_used=used,
+                tax=nominal - used,
+            )
+        return estimates
@@ -12,6 +12,7 @@ from typing import Any
 import httpx
 
 from ._http import AuthProvider
+from .codec import JSONCodec, default_codec
 from .dto.device import DeviceInfo
 from .exceptions import raise_for_status
 
@@ -40,13 +41,19 @@ class AuthProviderImpl(AuthProvider):
         base_url: str = "https://lknpd.nalog.ru/api",
         storage_path: str | None = None,
         device_id: str | None = None,
+        codec: JSONCodec | None = None,
+        transport: httpx.AsyncBaseTransport | None = None,
     ):
         self.base_url_v1 = f"{base_url}/v1"
         self.base_url_v2 = f"{base_url}/v2"
         self.storage_path = storage_path
         self.device_id = device_id or generate_device_id()
         self.device_info = DeviceInfo(sourceDeviceId=self.device_id)
+        self.codec = codec or default_codec()
+        self.transport = transport
         self._token_data: dict[str, Any] | None = None
+        # Serialized form of _token_data, kept to avoid re-encoding on reads
+        self._token_json: str | None = None
 
         # Default headers similar to PHP Authenticator
         self.default_headers = {
@@ -66,8 +73,8 @@ class AuthProviderImpl(AuthProvider):
             return
 
         try:
-            with open(self.storage_path, encoding="utf-8") as f:
-                self._token_data = json.load(f)
+            with open(self.storage_path, "rb") as f:
+                self._token_data = self.codec.loads(f.read())
         except (json.JSONDecodeError, OSError):
             # Ignore errors, token will be None
             pass
@@ -91,6 +98,14 @@ class AuthProviderImpl(AuthProvider):
         """Get current access token data."""
         return self._token_data
 
+    async def get_token_json(self) -> str | None:
+        """Get current access token data as JSON string (encoded once)."""
+        if self._token_data is None:
+            return None
+        if self._token_json is None:
+            self._token_json = self.codec.dumps(self._token_data).decode("utf-8")
+        return self._token_json
+
     async def set_token(self, token_json: str) -> None:
         """
         Set access token from JSON string.
@@ -99,7 +114,8 @@ class AuthProviderImpl(AuthProvider):
             token_json: JSON string containing token data
         """
         try:
-            self._token_data = json.loads(token_json)
+            self._token_data = self.codec.loads(token_json)
+            self._token_json = token_json
             self._save_token_to_storage()
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid token JSON: {e}")
@@ -126,10 +142,10 @@ class AuthProviderImpl(AuthProvider):
             "deviceInfo": self.device_info.model_dump(),
         }
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=self.transport) as client:
             response = await client.post(
                 f"{self.base_url_v1}/auth/lkfl",
-                json=request_data,
+                content=self.codec.dumps(request_data),
                 headers=self.default_headers,
                 timeout=10.0,
             )
@@ -161,16 +177,16 @@ class AuthProviderImpl(AuthProvider):
             "requireTpToBeActive": True,
         }
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=self.transport) as client:
             response = await client.post(
                 f"{self.base_url_v2}/auth/challenge/sms/start",
-                json=request_data,
+                content=self.codec.dumps(request_data),
                 headers=self.default_headers,
                 timeout=10.0,
             )
 
             raise_for_status(response)
-            return response.json()  # type: ignore[no-any-return]
+            return self.codec.loads(response.content)  # type: ignore[no-any-return]
 
     async def create_new_access_token_by_phone(
         self, phone: str, challenge_token: str, verification_code: str
@@ -198,10 +214,10 @@ class AuthProviderImpl(AuthProvider):
             "deviceInfo": self.device_info.model_dump(),
         }
 
-        async with httpx.AsyncClient() as client:
+        async with httpx.AsyncClient(transport=self.transport) as client:
             response = await client.post(
                 f"{self.base_url_v1}/auth/challenge/sms/verify",
-                json=request_data,
+                content=self.codec.dumps(request_data),
                 headers=self.default_headers,
                 timeout=10.0,
             )
@@ -231,10 +247,10 @@ class AuthProviderImpl(AuthProvider):
         }
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with httpx.AsyncClient(transport=self.transport) as client:
                 response = await client.post(
                     f"{self.base_url_v1}/auth/token",
-                    json=request_data,
+                    content=self.codec.dumps(request_data),
                     headers=self.default_headers,
                     timeout=10.0,
                 )
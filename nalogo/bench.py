@@ -0,0 +1,458 @@
+"""
+Load generator for capacity planning.
+
+Drives a Client with a mix of operations (create, cancel, receipt JSON,
+taxes), either closed-loop with fixed concurrency or open-loop at a
+target request rate, and reports throughput, latency histograms, errors by
+exception class and connection pool stats.
+
+Usage:
+    python -m nalogo.bench --fake --concurrency 32 --duration 10
+    python -m nalogo.bench --base-url https://lknpd.nalog.ru/api \\
+        --token-file token.json --rate 20 --mix create=3,receipt=1,taxes=1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .client import Client
+from .dto.income import CancelCommentType
+from .testing import FakeNalogService
+
+OPERATIONS = ("create", "cancel", "receipt", "taxes")
+DEFAULT_MIX = {"create": 4, "cancel": 1, "receipt": 2, "taxes": 1}
+PERCENTILES = (50.0, 75.0, 90.0, 95.0, 99.0, 99.9, 100.0)
+MAX_SIGNIFICANT_DIGITS = 5
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    """
+    Parse operation mix like "create=3,cancel=1".
+
+    Args:
+        text: Comma-separated name=weight pairs
+
+    Returns:
+        Operation name -> weight (zero weights are dropped)
+
+    Raises:
+        ValueError: For unknown operations, invalid or all-zero weights
+    """
+    mix: dict[str, int] = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(f"Unknown operation: {name}. Must be one of: {OPERATIONS}")
+        try:
+            value = int(weight) if weight else 1
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name}: {weight}") from None
+        if value < 0:
+            raise ValueError(f"Invalid weight for {name}: {weight}")
+        if value:
+            mix[name] = value
+    if not mix:
+        raise ValueError("Operation mix cannot be empty")
+    return mix
+
+
+class LatencyHistogram:
+    """
+    Latency histogram with HDR-style bounded relative error.
+
+    Values are recorded in microseconds and bucketed to the given number of
+    significant decimal digits, so memory does not grow with sample count
+    and every reported percentile is within 10**-digits relative error.
+    """
+
+    def __init__(self, significant_digits: int = 2):
+        """
+        Initialize histogram.
+
+        Args:
+            significant_digits: Bucket precision (1..5)
+
+        Raises:
+            ValueError: For precision out of range
+        """
+        if not 1 <= significant_digits <= MAX_SIGNIFICANT_DIGITS:
+            raise ValueError(
+                f"Significant digits must be between 1 and {MAX_SIGNIFICANT_DIGITS}"
+            )
+        self.significant_digits = significant_digits
+        self.counts: Counter[int] = Counter()
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _bucket(self, micros: float) -> int:
+        if micros < 1:
+            return 0
+        magnitude = int(math.log10(micros)) + 1 - self.significant_digits
+        if magnitude <= 0:
+            return int(micros)
+        step: int = 10**magnitude
+        # Upper bound of bucket, like HDR "highest equivalent value"
+        return math.ceil(micros / step) * step
+
+    def record(self, seconds: float) -> None:
+        """Record latency in seconds."""
+        micros = seconds * 1_000_000
+        self.counts[self._bucket(micros)] += 1
+        self.count += 1
+        self.total += micros
+        self.min = min(self.min, micros)
+        self.max = max(self.max, micros)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add samples of another histogram."""
+        self.counts.update(other.counts)
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> float:
+        """Get q-th percentile (0..100) in microseconds (0 if empty)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(q / 100 * self.count))
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= rank:
+                return float(min(value, self.max))
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        """Get count, min, mean, max and percentiles in milliseconds."""
+        return {
+            "count": self.count,
+            "min_ms": (self.min if self.count else 0.0) / 1000,
+            "mean_ms": (self.total / self.count if self.count else 0.0) / 1000,
+            "max_ms": self.max / 1000,
+            "percentiles_ms": {
+                f"p{q:g}": self.percentile(q) / 1000 for q in PERCENTILES
+            },
+        }
+
+    def to_hdr_text(self) -> str:
+        """
+        Export percentile distribution in HdrHistogram text format.
+
+        Values are in milliseconds, one line per bucket.
+        """
+        lines = [
+            f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>14}",
+            "",
+        ]
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            fraction = seen / self.count
+            inverse = f"{1 / (1 - fraction):14.2f}" if fraction < 1 else f"{'inf':>14}"
+            lines.append(
+                f"{min(value, self.max) / 1000:12.3f} {fraction:14.12f} {seen:10d} {inverse}"
+            )
+        mean = self.total / self.count / 1000 if self.count else 0.0
+        lines.append(
+            f"#[Mean = {mean:12.3f}, Max = {self.max / 1000:12.3f}, "
+            f"Total count = {self.count:12d}]"
+        )
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class LoadReport:
+    """Result of LoadGenerator.run()."""
+
+    duration: float = 0.0
+    completed: int = 0
+    errors: Counter[str] = field(default_factory=Counter)
+    histograms: dict[str, LatencyHistogram] = field(default_factory=dict)
+    pool: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Completed operations per second (including failed ones)."""
+        return self.completed / self.duration if self.duration else 0.0
+
+    def overall(self) -> LatencyHistogram:
+        """Histogram of all operations."""
+        total = LatencyHistogram()
+        for histogram in self.histograms.values():
+            total.merge(histogram)
+        return total
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get JSON-serializable summary."""
+        return {
+            "duration_s": self.duration,
+            "completed": self.completed,
+            "throughput_per_sec": self.throughput,
+            "errors": dict(self.errors),
+            "latency": {
+                "all": self.overall().summary(),
+                **{name: h.summary() for name, h in self.histograms.items()},
+            },
+            "pool": self.pool,
+        }
+
+
+class LoadGenerator:
+    """
+    Runs weighted mix of operations against a Client.
+
+    Cancel and receipt operations target receipts created during the run;
+    until one exists they create a receipt instead. In open-loop mode
+    (rate set), latency is measured from the scheduled start time, so
+    queueing behind a slow server is not hidden (coordinated omission).
+    """
+
+    def __init__(
+        self, client: Client, mix: dict[str, int] | None = None, seed: int | None = None
+    ):
+        self.client = client
+        self.mix = mix or DEFAULT_MIX
+        self._random = random.Random(seed)  # nosec B311 - not for security
+        self._names = list(self.mix)
+        self._weights = [self.mix[name] for name in self._names]
+        self.receipts: list[str] = []
+        self._operations: dict[str, Callable[[], Awaitable[Any]]] = {
+            "create": self._create,
+            "cancel": self._cancel,
+            "receipt": self._receipt,
+            "taxes": self._taxes,
+        }
+
+    async def _create(self) -> None:
+        result = await self.client.income().create("Нагрузочный тест", 100, 1)
+        self.receipts.append(result["approvedReceiptUuid"])
+
+    async def _cancel(self) -> None:
+        if not self.receipts:
+            return await self._create()
+        receipt_uuid = self.receipts.pop(self._random.randrange(len(self.receipts)))
+        await self.client.income().cancel(receipt_uuid, CancelCommentType.CANCEL)
+        return None
+
+    async def _receipt(self) -> None:
+        if not self.receipts:
+            return await self._create()
+        await self.client.receipt().json(self._random.choice(self.receipts))
+        return None
+
+    async def _taxes(self) -> None:
+        await self.client.tax().get()
+
+    async def _execute(self, report: LoadReport, scheduled: float) -> None:
+        name = self._random.choices(self._names, self._weights)[0]
+        try:
+            await self._operations[name]()
+        except Exception as e:
+            report.errors[type(e).__name__] += 1
+        histogram = report.histograms.setdefault(name, LatencyHistogram())
+        histogram.record(time.perf_counter() - scheduled)
+        report.completed += 1
+
+    async def run(
+        self,
+        concurrency: int = 8,
+        duration: float | None = 10.0,
+        requests: int | None = None,
+        rate: float | None = None,
+    ) -> LoadReport:
+        """
+        Generate load.
+
+        Args:
+            concurrency: Workers (closed loop) or max outstanding operations
+                (open loop)
+            duration: Stop after this many seconds
+            requests: Stop after this many operations
+            rate: Target operations per second (None: closed loop)
+
+        Returns:
+            LoadReport
+
+        Raises:
+            ValueError: For invalid settings or no stop condition
+        """
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be greater than 0")
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be greater than 0")
+        if duration is None and requests is None:
+            raise ValueError("Either duration or requests must be set")
+
+        report = LoadReport()
+        started = time.perf_counter()
+        deadline = started + duration if duration is not None else math.inf
+        budget = requests if requests is not None else math.inf
+        issued = 0
+
+        def more() -> bool:
+            return issued < budget and time.perf_counter() < deadline
+
+        if rate is None:
+
+            async def worker() -> None:
+                nonlocal issued
+                while more():
+                    issued += 1
+                    await self._execute(report, time.perf_counter())
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+        else:
+            semaphore = asyncio.Semaphore(concurrency)
+            tasks: set[asyncio.Task[None]] = set()
+
+            async def limited(scheduled: float) -> None:
+                async with semaphore:
+                    await self._execute(report, scheduled)
+
+            interval = 1 / rate
+            while more():
+                scheduled = started + issued * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    if not more():
+                        break
+                issued += 1
+                task = asyncio.create_task(limited(scheduled))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+
+        report.duration = time.perf_counter() - started
+        report.pool = self.client.http_client.pool_stats()
+        return report
+
+
+def format_report(report: LoadReport) -> str:
+    """Format report as human-readable text."""
+    lines = [
+        f"duration:   {report.duration:.2f} s",
+        f"completed:  {report.completed}",
+        f"throughput: {report.throughput:,.1f} ops/s",
+        "",
+        f"{'operation':<10} {'count':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  (ms)",
+    ]
+    rows = {"all": report.overall(), **report.histograms}
+    for name, histogram in rows.items():
+        lines.append(
+            f"{name:<10} {histogram.count:>8} "
+            + " ".join(
+                f"{histogram.percentile(q) / 1000:>9.2f}" for q in (50, 90, 99, 100)
+            )
+        )
+    if report.errors:
+        lines.append("")
+        lines.append("errors:")
+        lines.extend(
+            f"  {name}: {count}" for name, count in report.errors.most_common()
+        )
+    if report.pool:
+        lines.append("")
+        lines.append(
+            "pool: " + ", ".join(f"{key}={value}" for key, value in report.pool.items())
+        )
+    return "\n".join(lines)
+
+
+async def _open_client(args: argparse.Namespace) -> Client:
+    if args.fake:
+        service = FakeNalogService(
+            latency=args.fake_latency,
+            error_rate=args.fake_error_rate,
+            rate_limit=args.fake_rate_limit,
+        )
+        client = Client(transport=service.transport())
+        await client.authenticate(
+            await client.create_new_access_token(service.inn, service.password)
+        )
+        return client
+
+    client = Client(base_url=args.base_url, timeout=args.timeout)
+    if args.token_file:
+        await client.authenticate(Path(args.token_file).read_text(encoding="utf-8"))
+    elif args.inn and args.password:
+        await client.authenticate(
+            await client.create_new_access_token(args.inn, args.password)
+        )
+    else:
+        raise ValueError("Provide --token-file or --inn and --password (or --fake)")
+    return client
+
+
+async def _main(args: argparse.Namespace) -> LoadReport:
+    client = await _open_client(args)
+    async with client:
+        generator = LoadGenerator(client, parse_mix(args.mix), seed=args.seed)
+        return await generator.run(
+            concurrency=args.concurrency,
+            duration=args.duration,
+            requests=args.requests,
+            rate=args.rate,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m nalogo.bench",
+        description="Load generator for Moy Nalog API clients",
+    )
+    parser.add_argument("--base-url", default="https://lknpd.nalog.ru/api")
+    parser.add_argument("--token-file", help="File with access token JSON")
+    parser.add_argument("--inn")
+    parser.add_argument("--password")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--fake", action="store_true", help="Use in-process emulator")
+    parser.add_argument("--fake-latency", type=float, default=0.005)
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--fake-rate-limit", type=int)
+    parser.add_argument(
+        "--mix",
+        default=",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items()),
+        help="Operation weights, e.g. create=3,cancel=1,receipt=2,taxes=1",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rate", type=float, help="Target ops/s (open loop)")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--requests", type=int)
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help="Write JSON summary to this file")
+    parser.add_argument("--hdr", help="Write HDR percentile distribution to this file")
+    args = parser.parse_args(argv)
+
+    try:
+        report = asyncio.run(_main(args))
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(format_report(report))  # noqa: T201
+    if args.output:
+        Path(args.output).write_text(
+            json.dumps(report.to_dict(), indent=2), encoding="utf-8"
+        )
+    if args.hdr:
+        Path(args.hdr).write_text(report.overall().to_hdr_text(), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
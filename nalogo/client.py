@@ -3,15 +3,27 @@ Main client facade for Moy Nalog API.
 Based on PHP library's ApiClient class.
 """
 
-import json
+from collections.abc import Sequence
+from pathlib import Path
 from typing import Any
 
+import httpx
+
 from ._http import AsyncHTTPClient
 from .auth import AuthProviderImpl
-from .income import IncomeAPI
-from .payment_type import PaymentTypeAPI
-from .receipt import ReceiptAPI
-from .tax import TaxAPI
+from .codec import JSONCodec, default_codec
+from .feed import ChangeFeed, FeedCheckpoint
+from .hedging import HedgePolicy
+from .income import IncomeAPI, IncomeListener
+from .limits import IncomeLimitGuard
+from .metrics import HTTPMetrics
+from .middleware import Middleware
+from .payment_type import PaymentTypeAPI, PaymentTypeTable
+from .receipt import ReceiptAPI, ReceiptCache
+from .scheduler import RequestScheduler
+from .tax import TaxAPI, TaxRecordCache
+from .timeouts import AdaptiveTimeouts, EndpointTimeouts
+from .tracing import Tracer
 from .user import UserAPI
 
 
@@ -35,7 +47,22 @@ class Client:
         base_url: str = "https://lknpd.nalog.ru/api",
         storage_path: str | None = None,
         device_id: str | None = None,
-        timeout: float = 10.0,
+        timeout: float | httpx.Timeout | EndpointTimeouts = 10.0,
+        *,
+        receipt_cache_size: int = 0,
+        income_limit_guard: IncomeLimitGuard | None = None,
+        codec: JSONCodec | None = None,
+        payment_type_cache_ttl: float = 0,
+        tax_cache_ttl: float = 0,
+        transport: httpx.AsyncBaseTransport | None = None,
+        limits: httpx.Limits | None = None,
+        metrics: HTTPMetrics | None = None,
+        tracer: Tracer | None = None,
+        middlewares: Sequence[Middleware] = (),
+        deadline: float | None = None,
+        adaptive_timeouts: AdaptiveTimeouts | None = None,
+        hedging: HedgePolicy | None = None,
+        scheduler: RequestScheduler | None = None,
     ):
         """
         Initialize Moy Nalog API client.
@@ -44,16 +71,62 @@ class Client:
             base_url: API base URL (default: https://lknpd.nalog.ru/api)
             storage_path: Optional file path for token storage
             device_id: Optional device ID (auto-generated if not provided)
-            timeout: HTTP request timeout in seconds
+            timeout: HTTP request timeout in seconds, httpx.Timeout with
+                connect/read/write/pool values, or EndpointTimeouts per
+                endpoint class
+            receipt_cache_size: Max receipts kept in JSON cache (0 disables cache)
+            income_limit_guard: Optional annual income limit guard for IncomeAPI
+            codec: JSON codec for bodies and tokens (default: orjson if
+                installed, else stdlib json)
+            payment_type_cache_ttl: Seconds payment types table is cached
+                (0 disables cache)
+            tax_cache_ttl: Seconds per-OKTMO tax records are cached by
+                TaxAPI.history_many()/payments_many() (0 disables cache)
+            transport: Optional httpx transport for all requests (e.g.
+                nalogo.testing.FakeNalogService().transport())
+            limits: Connection pool limits of the shared HTTP client
+                (default: 100 connections)
+            metrics: Optional HTTPMetrics recording request counts, latency,
+                errors and token refreshes (disabled by default)
+            tracer: Optional Tracer for API call and phase spans (e.g.
+                nalogo.tracing.OpenTelemetryTracer; disabled by default)
+            middlewares: Extra request middlewares, outermost first (placed
+                outside error status handling and auth)
+            deadline: Default budget in seconds per request, shared by token
+                refresh and retry (None: only nalogo.timeouts.deadline())
+            adaptive_timeouts: Optional AdaptiveTimeouts deriving request
+                timeouts from observed latency percentiles (overrides timeout)
+            hedging: Optional HedgePolicy sending a second request when an
+                idempotent request is slower than its latency percentile
+            scheduler: Optional RequestScheduler limiting concurrent requests
+                with weighted fair queueing between priority classes
         """
         self.base_url = base_url
         self.timeout = timeout
+        self.income_limit_guard = income_limit_guard
+        self.codec = codec or default_codec()
+        self.receipt_cache = (
+            ReceiptCache(receipt_cache_size) if receipt_cache_size > 0 else None
+        )
+        self.tax_cache = TaxRecordCache(tax_cache_ttl) if tax_cache_ttl > 0 else None
+        self.payment_type_table = (
+            PaymentTypeTable(payment_type_cache_ttl)
+            if payment_type_cache_ttl > 0
+            else None
+        )
+
+        # Receivers of IncomeAPI create/cancel results
+        self.income_listeners: list[IncomeListener] = []
+        if self.receipt_cache is not None:
+            self.income_listeners.append(self.receipt_cache)
 
         # Initialize auth provider
         self.auth_provider = AuthProviderImpl(
             base_url=base_url,
             storage_path=storage_path,
             device_id=device_id,
+            codec=self.codec,
+            transport=transport,
         )
 
         # Initialize HTTP client with auth middleware
@@ -67,11 +140,31 @@ class Client:
                 "Referrer": "https://lknpd.nalog.ru/auth/login",
             },
             timeout=timeout,
+            codec=self.codec,
+            transport=transport,
+            limits=limits,
+            metrics=metrics,
+            tracer=tracer,
+            middlewares=middlewares,
+            deadline=deadline,
+            adaptive_timeouts=adaptive_timeouts,
+            hedging=hedging,
+            scheduler=scheduler,
         )
 
         # User profile data (for receipt operations)
         self._user_profile: dict[str, Any] | None = None
 
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections."""
+        await self.http_client.aclose()
+
+    async def __aenter__(self) -> "Client":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
+
     async def create_new_access_token(self, username: str, password: str) -> str:
         """
         Create new access token using INN and password.
@@ -146,14 +239,10 @@ class Client:
         """
         await self.auth_provider.set_token(access_token)
 
-        # Parse token to extract user profile (like PHP version)
-        try:
-            token_data = json.loads(access_token)
-            if "profile" in token_data:
-                self._user_profile = token_data["profile"]
-        except json.JSONDecodeError:
-            # If token parsing fails, profile will remain None
-            pass
+        # Extract user profile from parsed token (like PHP version)
+        token_data = await self.auth_provider.get_token()
+        if isinstance(token_data, dict) and "profile" in token_data:
+            self._user_profile = token_data["profile"]
 
     async def get_access_token(self) -> str | None:
         """
@@ -164,10 +253,54 @@ class Client:
         Returns:
             Current access token JSON string or None
         """
-        token_data = await self.auth_provider.get_token()
-        if token_data:
-            return json.dumps(token_data)
-        return None
+        return await self.auth_provider.get_token_json()
+
+    def add_income_listener(self, listener: IncomeListener) -> None:
+        """
+        Register receiver of IncomeAPI create/cancel results.
+
+        Args:
+            listener: IncomeListener instance (e.g. IncomeMirror)
+        """
+        if listener not in self.income_listeners:
+            self.income_listeners.append(listener)
+
+    def remove_income_listener(self, listener: IncomeListener) -> None:
+        """
+        Unregister income listener.
+
+        Args:
+            listener: Previously registered IncomeListener
+        """
+        if listener in self.income_listeners:
+            self.income_listeners.remove(listener)
+
+    def change_feed(
+        self, checkpoint_path: str | Path | None = None, **options: Any
+    ) -> ChangeFeed:
+        """
+        Create change feed of receipt created/cancelled events.
+
+        The feed polls the income listing and is registered as income
+        listener, so this client's own create/cancel calls are emitted
+        immediately. Call ChangeFeed.aclose() (or use it as async context
+        manager) to detach it.
+
+        Args:
+            checkpoint_path: Optional file for durable feed checkpoint
+            **options: ChangeFeed options (min_interval, max_interval, ...)
+
+        Returns:
+            ChangeFeed async iterator of ReceiptEvent
+        """
+        feed = ChangeFeed(
+            self.income(),
+            checkpoint=FeedCheckpoint(checkpoint_path),
+            on_close=lambda: self.remove_income_listener(feed),
+            **options,
+        )
+        self.add_income_listener(feed)
+        return feed
 
     def income(self) -> IncomeAPI:
         """
@@ -178,7 +311,12 @@ class Client:
         Returns:
             IncomeAPI instance for creating/cancelling receipts
         """
-        return IncomeAPI(self.http_client)
+        return IncomeAPI(
+            self.http_client,
+            listeners=self.income_listeners,
+            limit_guard=self.income_limit_guard,
+            account=(self._user_profile or {}).get("inn", ""),
+        )
 
     def receipt(self) -> ReceiptAPI:
         """
@@ -199,6 +337,8 @@ class Client:
             http_client=self.http_client,
             base_endpoint=self.base_url,
             user_inn=self._user_profile["inn"],
+            cache=self.receipt_cache,
+            user_display_name=self._user_profile.get("displayName"),
         )
 
     def payment_type(self) -> PaymentTypeAPI:
@@ -210,7 +350,7 @@ class Client:
         Returns:
             PaymentTypeAPI instance for managing payment methods
         """
-        return PaymentTypeAPI(self.http_client)
+        return PaymentTypeAPI(self.http_client, cache=self.payment_type_table)
 
     def tax(self) -> TaxAPI:
         """
@@ -221,7 +361,7 @@ class Client:
         Returns:
             TaxAPI instance for tax information and history
         """
-        return TaxAPI(self.http_client)
+        return TaxAPI(self.http_client, cache=self.tax_cache)
 
     def user(self) -> UserAPI:
         """
@@ -0,0 +1,93 @@
+"""
+JSON codec used for request bodies, responses and stored tokens.
+
+Encodes straight to UTF-8 bytes and decodes from bytes, so bodies are not
+round-tripped through str. orjson is used when installed
+(pip install nalogo[speedups]), otherwise the stdlib json module.
+Both backends produce the same compact, non-ASCII-escaped output as
+httpx's json= encoding and serialize Decimal as string (like PHP
+BigDecimal), matching how the DTOs serialize amounts.
+"""
+
+import json
+from decimal import Decimal
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+
+
+def _default(value: Any) -> Any:
+    """Serialize types unknown to JSON backends."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JSONCodec:
+    """
+    Stdlib json codec.
+
+    Subclass and override dumps()/loads() to plug in another backend,
+    then pass the instance as codec= to Client.
+    """
+
+    name = "json"
+
+    def dumps(self, data: Any) -> bytes:
+        """
+        Encode data to compact UTF-8 JSON bytes.
+
+        Raises:
+            TypeError: For values that cannot be serialized
+            ValueError: For NaN/Infinity floats
+        """
+        return json.dumps(
+            data,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            allow_nan=False,
+            default=_default,
+        ).encode("utf-8")
+
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Decode JSON bytes or string.
+
+        Raises:
+            json.JSONDecodeError: For invalid JSON
+        """
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """
+    orjson codec.
+
+    Decode errors are json.JSONDecodeError subclasses, so callers handle
+    both backends the same way.
+    """
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def dumps(self, data: Any) -> bytes:
+        """Encode data to compact UTF-8 JSON bytes."""
+        try:
+            return orjson.dumps(data, default=_default)
+        except orjson.JSONEncodeError as e:
+            raise TypeError(str(e)) from e
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode JSON bytes or string."""
+        return orjson.loads(data)
+
+
+def default_codec() -> JSONCodec:
+    """Get fastest available codec (orjson if installed, else stdlib)."""
+    return OrjsonCodec() if orjson is not None else JSONCodec()
@@ -1,6 +1,7 @@
 """Data Transfer Objects for Moy Nalog API."""
 
 from .device import DeviceInfo
+from .fast import FastClient, FastIncomeRequest, FastServiceItem
 from .income import (
     AtomDateTime,
     CancelCommentType,
@@ -12,6 +13,7 @@ from .income import (
     PaymentType,
 )
 from .invoice import InvoiceClient, InvoiceServiceItem
+from .lazy import LazyList, LazyModel
 from .payment_type import PaymentType as PaymentTypeModel
 from .payment_type import PaymentTypeCollection
 from .tax import History, HistoryRecords, Payment, PaymentRecords, Tax
@@ -23,6 +25,10 @@ __all__ = [
     "CancelRequest",
     # Device DTOs
     "DeviceInfo",
+    # Fast-path DTOs
+    "FastClient",
+    "FastIncomeRequest",
+    "FastServiceItem",
     "History",
     "HistoryRecords",
     "IncomeClient",
@@ -33,6 +39,9 @@ __all__ = [
     "InvoiceClient",
     # Invoice DTOs
     "InvoiceServiceItem",
+    # Lazy response views
+    "LazyList",
+    "LazyModel",
     "Payment",
     "PaymentRecords",
     "PaymentType",
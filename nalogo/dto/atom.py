@@ -0,0 +1,90 @@
+"""
+ATOM timestamp formatting.
+
+Request bodies carry two UTC timestamps each ("2024-01-01T12:00:00Z" or
+with microseconds "2024-01-01T12:00:00.123456Z"). The formatter caches
+the formatted date/time prefix of the last second seen, so bulk request
+building pays for calendar conversion once per second instead of once
+per timestamp. Output is identical to
+dt.astimezone(UTC).isoformat().replace("+00:00", "Z").
+"""
+
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_SECOND = timedelta(seconds=1)
+
+
+def system_clock() -> datetime:
+    """Current UTC time."""
+    return datetime.now(UTC)
+
+
+class AtomFormatter:
+    """
+    ATOM/ISO 8601 formatter with per-second prefix cache and pluggable clock.
+
+    Example:
+        >>> formatter = AtomFormatter(clock=lambda: datetime(2024, 1, 1, tzinfo=UTC))
+        >>> formatter.now_text()
+        '2024-01-01T00:00:00Z'
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = system_clock):
+        """
+        Initialize formatter.
+
+        Args:
+            clock: Callable returning current aware datetime
+        """
+        self.clock = clock
+        # (epoch second, "YYYY-MM-DDTHH:MM:SS") swapped as one tuple, so
+        # concurrent readers never see a mismatched pair
+        self._cached: tuple[int, str] = (0, "1970-01-01T00:00:00")
+
+    def now(self) -> datetime:
+        """Current time from the clock."""
+        return self.clock()
+
+    def now_text(self) -> str:
+        """Current time from the clock formatted as ATOM string."""
+        return self.format(self.clock())
+
+    def format(self, dt: datetime) -> str:
+        """
+        Format datetime as ATOM string in UTC with Z suffix.
+
+        Args:
+            dt: Datetime (naive values are treated as UTC)
+
+        Returns:
+            Formatted timestamp
+        """
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=UTC)
+        seconds, rest = divmod(dt - _EPOCH, _SECOND)
+
+        cached_seconds, prefix = self._cached
+        if seconds != cached_seconds:
+            prefix = (_EPOCH + timedelta(seconds=seconds)).isoformat()[:19]
+            self._cached = (seconds, prefix)
+
+        microseconds = rest.microseconds
+        if microseconds:
+            return f"{prefix}.{microseconds:06d}Z"
+        return prefix + "Z"
+
+
+# Shared formatter used by request DTOs; replace clock to control timestamps
+atom_formatter = AtomFormatter()
+
+
+def format_atom(dt: datetime) -> str:
+    """Format datetime as ATOM string in UTC with Z suffix (naive values are UTC)."""
+    return atom_formatter.format(dt)
+
+
+def utc_now() -> datetime:
+    """Current UTC time from the shared formatter clock."""
+    return atom_formatter.now()
@@ -0,0 +1,160 @@
+"""
+Lightweight income request DTOs for trusted input.
+
+Slotted dataclasses without pydantic validation, for bulk receipt creation
+from data that was already validated (e.g. by nalogo.validation or by the
+pydantic models themselves). to_json() produces the same wire JSON as
+IncomeRequest.model_dump(). The pydantic models in dto.income remain the
+validating front door for untrusted input.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from ..money import Money, format_decimal
+from .atom import format_atom, utc_now
+from .income import (
+    IncomeClient,
+    IncomeRequest,
+    IncomeServiceItem,
+    IncomeType,
+    PaymentType,
+    atom_value,
+    services_total,
+)
+
+
+@dataclass(slots=True, frozen=True)
+class FastServiceItem:
+    """
+    Service item without validation.
+
+    Name must already be stripped, amount and quantity must be positive.
+    """
+
+    name: str
+    amount: Decimal
+    quantity: Decimal = Decimal(1)
+
+    @classmethod
+    def from_model(cls, item: IncomeServiceItem) -> "FastServiceItem":
+        """Create from validated IncomeServiceItem."""
+        return cls(item.name, item.amount, item.quantity)
+
+    def get_total_amount(self) -> Decimal:
+        """Calculate total amount (amount * quantity)."""
+        return self.amount * self.quantity
+
+    def get_total_money(self) -> Money:
+        """Calculate total amount (amount * quantity) rounded half up to kopecks."""
+        return Money.of(self.amount * self.quantity)
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize like IncomeServiceItem.model_dump()."""
+        return {
+            "name": self.name,
+            "amount": format_decimal(self.amount),
+            "quantity": format_decimal(self.quantity),
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class FastClient:
+    """Client information without validation (INN must be stripped and valid)."""
+
+    contact_phone: str | None = None
+    display_name: str | None = None
+    income_type: IncomeType = IncomeType.FROM_INDIVIDUAL
+    inn: str | None = None
+
+    @classmethod
+    def from_model(cls, client: IncomeClient) -> "FastClient":
+        """Create from validated IncomeClient."""
+        return cls(
+            client.contact_phone, client.display_name, client.income_type, client.inn
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize like IncomeClient.model_dump()."""
+        return {
+            "contactPhone": self.contact_phone,
+            "displayName": self.display_name,
+            "incomeType": self.income_type.value,
+            "inn": self.inn,
+        }
+
+
+DEFAULT_CLIENT = FastClient()
+
+
+@dataclass(slots=True)
+class FastIncomeRequest:
+    """
+    Income creation request without validation.
+
+    Same fields and wire format as IncomeRequest.
+    """
+
+    operation_time: datetime
+    request_time: datetime
+    services: list[FastServiceItem]
+    total_amount: str
+    client: FastClient = DEFAULT_CLIENT
+    payment_type: PaymentType = PaymentType.CASH
+    ignore_max_total_income_restriction: bool = False
+
+    @classmethod
+    def build(
+        cls,
+        services: list[FastServiceItem],
+        operation_time: datetime | None = None,
+        client: FastClient | None = None,
+    ) -> "FastIncomeRequest":
+        """
+        Build request the way IncomeAPI.create_multiple_items() does.
+
+        Args:
+            services: Service items (non-empty)
+            operation_time: Operation datetime (default: now)
+            client: Client information (default: individual client)
+
+        Returns:
+            Request with total amount computed from services
+        """
+        request_time = utc_now()
+        return cls(
+            operation_time=operation_time or request_time,
+            request_time=request_time,
+            services=services,
+            total_amount=str(services_total(services)),
+            client=client or DEFAULT_CLIENT,
+        )
+
+    @classmethod
+    def from_model(cls, request: IncomeRequest) -> "FastIncomeRequest":
+        """Create from validated IncomeRequest."""
+        return cls(
+            operation_time=atom_value(request.operation_time),
+            request_time=atom_value(request.request_time),
+            services=[FastServiceItem.from_model(item) for item in request.services],
+            total_amount=request.total_amount,
+            client=FastClient.from_model(request.client),
+            payment_type=request.payment_type,
+            ignore_max_total_income_restriction=(
+                request.ignore_max_total_income_restriction
+            ),
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        """Serialize like IncomeRequest.model_dump()."""
+        return {
+            "operationTime": format_atom(self.operation_time),
+            "requestTime": format_atom(self.request_time),
+            "services": [service.to_json() for service in self.services],
+            "totalAmount": self.total_amount,
+            "client": self.client.to_json(),
+            "paymentType": self.payment_type.value,
+            "ignoreMaxTotalIncomeRestriction": self.ignore_max_total_income_restriction,
+        }
@@ -3,13 +3,21 @@ Income-related DTO models.
 Based on PHP library's DTO and Enum classes.
 """
 
-from datetime import UTC, datetime
+from collections.abc import Iterable
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 from typing import Any
 
 from pydantic import BaseModel, Field, field_serializer, field_validator
 
+from .._inn import inn_error
+from ..money import Money, format_decimal
+from .atom import format_atom, utc_now
+
+# Longest client display name accepted (before whitespace is stripped)
+DISPLAY_NAME_MAX_LENGTH = 256
+
 
 class IncomeType(str, Enum):
     """Income type enumeration. Maps to PHP Enum\\IncomeType."""
@@ -39,24 +47,17 @@ class AtomDateTime(BaseModel):
     Maps to PHP DTO\\DateTime behavior.
     """
 
-    value: datetime = Field(default_factory=lambda: datetime.now(UTC))
+    value: datetime = Field(default_factory=utc_now)
 
     @field_serializer("value")
     def serialize_datetime(self, dt: datetime) -> str:
         """Serialize datetime to ATOM format with Z suffix."""
-        # Ensure UTC timezone
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=UTC)
-        elif dt.tzinfo != UTC:
-            dt = dt.astimezone(UTC)
-
-        # Format as ISO with Z suffix (similar to PHP DATE_ATOM)
-        return dt.isoformat().replace("+00:00", "Z")
+        return format_atom(dt)
 
     @classmethod
     def now(cls) -> "AtomDateTime":
         """Create AtomDateTime with current UTC time."""
-        return cls(value=datetime.now(UTC))
+        return cls(value=utc_now())
 
     @classmethod
     def from_datetime(cls, dt: datetime) -> "AtomDateTime":
@@ -64,6 +65,18 @@ class AtomDateTime(BaseModel):
         return cls(value=dt)
 
 
+def atom_text(value: "AtomDateTime | datetime") -> str:
+    """Format AtomDateTime or raw datetime as ATOM string."""
+    if isinstance(value, datetime):
+        return format_atom(value)
+    return format_atom(value.value)
+
+
+def atom_value(value: "AtomDateTime | datetime") -> datetime:
+    """Get datetime from AtomDateTime or raw datetime."""
+    return value if isinstance(value, datetime) else value.value
+
+
 class IncomeServiceItem(BaseModel):
     """
     Service item for income creation.
@@ -92,22 +105,42 @@ class IncomeServiceItem(BaseModel):
 
     @field_serializer("amount", "quantity")
     def serialize_decimal(self, value: Decimal) -> str:
-        """Serialize Decimal as string (like PHP BigDecimal)."""
-        return str(value)
+        """Serialize Decimal as plain string (like PHP BigDecimal)."""
+        return format_decimal(value)
 
     def get_total_amount(self) -> Decimal:
         """Calculate total amount (amount * quantity)."""
         return self.amount * self.quantity
 
+    def get_total_money(self) -> Money:
+        """Calculate total amount (amount * quantity) rounded half up to kopecks."""
+        return Money.of(self.amount * self.quantity)
+
     def model_dump(self, **kwargs: Any) -> dict[str, Any]:
         """Custom serialization to match PHP jsonSerialize format."""
         return {
             "name": self.name,
-            "amount": str(self.amount),
-            "quantity": str(self.quantity),
+            "amount": format_decimal(self.amount),
+            "quantity": format_decimal(self.quantity),
         }
 
 
+def services_total(services: "Iterable[IncomeServiceItem | Any]") -> Money:
+    """
+    Calculate receipt total from service items.
+
+    The exact sum of amount * quantity is rounded once, so the total
+    matches the unrounded amounts sent in services.
+
+    Args:
+        services: Items with get_total_amount()
+
+    Returns:
+        Total rounded half up to kopecks
+    """
+    return Money.of(sum((item.get_total_amount() for item in services), Decimal(0)))
+
+
 class IncomeClient(BaseModel):
     """
     Client information for income creation.
@@ -115,7 +148,11 @@ class IncomeClient(BaseModel):
     """
 
     contact_phone: str | None = Field(default=None, description="Client contact phone")
-    display_name: str | None = Field(default=None, description="Client display name")
+    display_name: str | None = Field(
+        default=None,
+        max_length=DISPLAY_NAME_MAX_LENGTH,
+        description="Client display name",
+    )
     income_type: IncomeType = Field(
         default=IncomeType.FROM_INDIVIDUAL, description="Income type"
     )
@@ -124,7 +161,7 @@ class IncomeClient(BaseModel):
     @field_validator("inn")
     @classmethod
     def validate_inn(cls, v: str | None, info: Any) -> str | None:
-        """Validate INN format for legal entities."""
+        """Validate INN format and control digits."""
         if v is None:
             return v
 
@@ -133,13 +170,11 @@ class IncomeClient(BaseModel):
         if not v:
             return None
 
-        # Check if it's numeric
-        if not v.isdigit():
-            raise ValueError("INN must contain only numbers")
-
-        # Check length (10 for legal entities, 12 for individuals)
-        if len(v) not in [10, 12]:
-            raise ValueError("INN length must be 10 or 12 digits")
+        # Check digits, length (10 for legal entities, 12 for individuals)
+        # and control digits
+        error = inn_error(v)
+        if error:
+            raise ValueError(error)
 
         return v
 
@@ -173,8 +208,9 @@ class IncomeRequest(BaseModel):
     Maps to PHP request structure in Income::createMultipleItems().
     """
 
-    operation_time: AtomDateTime = Field(default_factory=AtomDateTime.now)
-    request_time: AtomDateTime = Field(default_factory=AtomDateTime.now)
+    # Raw datetimes are accepted to skip per-request AtomDateTime models
+    operation_time: AtomDateTime | datetime = Field(default_factory=utc_now)
+    request_time: AtomDateTime | datetime = Field(default_factory=utc_now)
     services: list[IncomeServiceItem] = Field(..., min_length=1)
     total_amount: str = Field(..., description="Total amount as string")
     client: IncomeClient = Field(default_factory=IncomeClient)
@@ -192,12 +228,8 @@ class IncomeRequest(BaseModel):
     def model_dump(self, **kwargs: Any) -> dict[str, Any]:
         """Custom serialization to match PHP request format."""
         return {
-            "operationTime": self.operation_time.serialize_datetime(
-                self.operation_time.value
-            ),
-            "requestTime": self.request_time.serialize_datetime(
-                self.request_time.value
-            ),
+            "operationTime": atom_text(self.operation_time),
+            "requestTime": atom_text(self.request_time),
             "services": [service.model_dump() for service in self.services],
             "totalAmount": self.total_amount,
             "client": self.client.model_dump(),
@@ -212,8 +244,9 @@ class CancelRequest(BaseModel):
     Maps to PHP request structure in Income::cancel().
     """
 
-    operation_time: AtomDateTime = Field(default_factory=AtomDateTime.now)
-    request_time: AtomDateTime = Field(default_factory=AtomDateTime.now)
+    # Raw datetimes are accepted to skip per-request AtomDateTime models
+    operation_time: AtomDateTime | datetime = Field(default_factory=utc_now)
+    request_time: AtomDateTime | datetime = Field(default_factory=utc_now)
     comment: CancelCommentType = Field(..., description="Cancellation reason")
     receipt_uuid: str = Field(..., description="Receipt UUID to cancel")
     partner_code: str | None = Field(default=None, description="Partner code")
@@ -229,12 +262,8 @@ class CancelRequest(BaseModel):
     def model_dump(self, **kwargs: Any) -> dict[str, Any]:
         """Custom serialization to match PHP request format."""
         return {
-            "operationTime": self.operation_time.serialize_datetime(
-                self.operation_time.value
-            ),
-            "requestTime": self.request_time.serialize_datetime(
-                self.request_time.value
-            ),
+            "operationTime": atom_text(self.operation_time),
+            "requestTime": atom_text(self.request_time),
             "comment": self.comment.value,
             "receiptUuid": self.receipt_uuid,
             "partnerCode": self.partner_code,
@@ -0,0 +1,164 @@
+"""
+Lazily validated response models.
+Wraps raw API dictionaries and validates model fields one at a time, on
+first access, so reading a few fields of large record lists does not pay
+for full validation of every record.
+"""
+
+from collections.abc import Iterator, Sequence
+from typing import Any, Generic, TypeVar, overload
+
+from pydantic import BaseModel
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+_MISSING = object()
+
+
+class LazyModel(Generic[ModelT]):
+    """
+    Read-only view of raw API data as model_class.
+
+    Attribute access validates just that field (aliases, type coercion and
+    field validators apply as in model_class.model_validate()) and caches
+    the result. to_model() validates the whole record; model methods
+    (e.g. PaymentType.is_favorite()) are called on the validated model.
+
+    Models may set RAW_FIELD class attribute to the name of a field that
+    holds the raw dictionary itself (e.g. History.data).
+
+    Example:
+        >>> user = await client.user().get_typed()
+        >>> user.registration_date  # only this field is validated
+    """
+
+    __slots__ = ("_model", "_model_class", "_raw", "_shell", "_values")
+
+    def __init__(self, model_class: type[ModelT], raw: dict[str, Any]):
+        """
+        Initialize view.
+
+        Args:
+            model_class: Pydantic model describing the record
+            raw: Raw record dictionary from API response
+        """
+        self._model_class = model_class
+        self._raw = raw
+        self._values: dict[str, Any] = {}
+        self._shell: ModelT | None = None
+        self._model: ModelT | None = None
+
+    @property
+    def raw(self) -> dict[str, Any]:
+        """Raw record dictionary."""
+        return self._raw
+
+    def __getattr__(self, name: str) -> Any:
+        field = self._model_class.model_fields.get(name)
+        if field is None:
+            if not name.startswith("_") and hasattr(self._model_class, name):
+                # Methods and properties need the fully validated model
+                return getattr(self.to_model(), name)
+            raise AttributeError(
+                f"{self._model_class.__name__!r} has no field {name!r}"
+            )
+        if name in self._values:
+            return self._values[name]
+        if self._model is not None:
+            return getattr(self._model, name)
+        if name == getattr(self._model_class, "RAW_FIELD", None):
+            return self._raw
+
+        raw_value = self._raw.get(field.alias or name, _MISSING)
+        if raw_value is _MISSING:
+            raw_value = self._raw.get(name, _MISSING)
+        if raw_value is _MISSING:
+            if field.is_required():
+                # Raises ValidationError describing the missing field
+                self.to_model()
+            value = field.get_default(call_default_factory=True)
+        else:
+            if self._shell is None:
+                self._shell = self._model_class.model_construct()
+            self._model_class.__pydantic_validator__.validate_assignment(
+                self._shell, name, raw_value
+            )
+            value = self._shell.__dict__[name]
+
+        self._values[name] = value
+        return value
+
+    def to_model(self) -> ModelT:
+        """
+        Validate whole record.
+
+        Returns:
+            model_class instance
+
+        Raises:
+            pydantic.ValidationError: If record does not match the model
+        """
+        if self._model is None:
+            self._model = self._model_class.model_validate(self._raw)
+        return self._model
+
+    def model_dump(self) -> dict[str, Any]:
+        """Serialize fully validated model (see model_class.model_dump())."""
+        return self.to_model().model_dump()
+
+    def __repr__(self) -> str:
+        return f"LazyModel({self._model_class.__name__}, {self._raw!r})"
+
+
+class LazyList(Sequence[LazyModel[ModelT]]):
+    """
+    Sequence of lazily validated records.
+
+    Views are created on item access; nothing is validated up front.
+    """
+
+    def __init__(self, model_class: type[ModelT], items: list[dict[str, Any]]):
+        """
+        Initialize list.
+
+        Args:
+            model_class: Pydantic model describing each record
+            items: Raw record dictionaries
+        """
+        self._model_class = model_class
+        self._items = items
+
+    @property
+    def raw(self) -> list[dict[str, Any]]:
+        """Raw record dictionaries."""
+        return self._items
+
+    @overload
+    def __getitem__(self, index: int) -> LazyModel[ModelT]: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[LazyModel[ModelT]]: ...
+
+    def __getitem__(
+        self, index: int | slice
+    ) -> LazyModel[ModelT] | list[LazyModel[ModelT]]:
+        if isinstance(index, slice):
+            return [LazyModel(self._model_class, item) for item in self._items[index]]
+        return LazyModel(self._model_class, self._items[index])
+
+    def __iter__(self) -> Iterator[LazyModel[ModelT]]:
+        model_class = self._model_class
+        for item in self._items:
+            yield LazyModel(model_class, item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def to_models(self) -> list[ModelT]:
+        """
+        Validate all records.
+
+        Raises:
+            pydantic.ValidationError: If any record does not match the model
+        """
+        return [self._model_class.model_validate(item) for item in self._items]
@@ -3,9 +3,44 @@ PaymentType-related DTO models.
 Based on PHP library's Model/PaymentType classes.
 """
 
-from typing import Any
+from collections.abc import Callable, Iterable
+from typing import Any, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+T = TypeVar("T")
+
+
+def index_payment_types(
+    items: Iterable[T],
+    id_of: Callable[[T], Any],
+    bik_of: Callable[[T], Any],
+    is_favorite: Callable[[T], bool],
+) -> tuple[dict[Any, T], dict[Any, list[T]], T | None]:
+    """
+    Build id, bank BIK and favorite indexes of payment types.
+
+    Used for both PaymentType models and raw table dictionaries.
+
+    Args:
+        items: Payment types
+        id_of: Get id of item
+        bik_of: Get bank BIK of item
+        is_favorite: Check favorite flag of item
+
+    Returns:
+        Tuple of (by id, by BIK, first favorite)
+    """
+    by_id: dict[Any, T] = {}
+    by_bik: dict[Any, list[T]] = {}
+    favorite = None
+    for item in items:
+        # First entry wins, like a linear scan would
+        by_id.setdefault(id_of(item), item)
+        by_bik.setdefault(bik_of(item), []).append(item)
+        if favorite is None and is_favorite(item):
+            favorite = item
+    return by_id, by_bik, favorite
 
 
 class PaymentType(BaseModel):
@@ -55,10 +90,42 @@ class PaymentTypeCollection(BaseModel):
     """
     Collection of payment types.
     Maps to PHP Model\\PaymentType\\PaymentTypeCollection.
+
+    Hash indexes by id, bank BIK and favorite flag are built once on
+    creation; call reindex() after mutating payment_types in place.
     """
 
     payment_types: list[PaymentType] = Field(default_factory=list)
 
+    _by_id: dict[int, PaymentType] = PrivateAttr(default_factory=dict)
+    _by_bik: dict[str, list[PaymentType]] = PrivateAttr(default_factory=dict)
+    _favorite: PaymentType | None = PrivateAttr(default=None)
+
+    def model_post_init(self, _context: Any) -> None:
+        """Build lookup indexes."""
+        self.reindex()
+
+    def reindex(self) -> None:
+        """Rebuild lookup indexes from payment_types."""
+        self._by_id, self._by_bik, self._favorite = index_payment_types(
+            self.payment_types,
+            lambda p: p.id,
+            lambda p: p.bank_bik,
+            lambda p: p.favorite,
+        )
+
+    def get(self, payment_type_id: int) -> PaymentType | None:
+        """Get payment type by id."""
+        return self._by_id.get(payment_type_id)
+
+    def by_bik(self, bank_bik: str) -> list[PaymentType]:
+        """Get payment types of bank by BIK."""
+        return list(self._by_bik.get(bank_bik, ()))
+
+    def favorite(self) -> PaymentType | None:
+        """Get first payment type marked as favorite."""
+        return self._favorite
+
     def __iter__(self) -> Any:
         """Make collection iterable."""
         return iter(self.payment_types)
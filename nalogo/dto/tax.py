@@ -3,9 +3,32 @@ Tax-related DTO models.
 Based on PHP library's Model/Tax classes.
 """
 
-from typing import Any
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, ClassVar
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+
+def _split_raw_data(value: Any) -> Any:
+    """Accept raw API entry or data=entry, keeping raw entry in data."""
+    if not isinstance(value, dict):
+        return value
+    if "data" in value:
+        return {**value["data"], **value}
+    return {**value, "data": value}
+
+
+def _parse_datetime(value: Any) -> Any:
+    """Parse datetime strings from API (unparsable values become None)."""
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    return value
 
 
 class Tax(BaseModel):
@@ -27,10 +50,28 @@ class History(BaseModel):
     """
     Tax history entry model.
     Maps to PHP Model\\Tax\\History.
+
+    Raw entry is kept in data; known fields are parsed from it.
     """
 
-    # History fields would be defined based on API response
+    RAW_FIELD: ClassVar[str] = "data"
+
     data: dict[str, Any] = Field(default_factory=dict, description="History entry data")
+    tax_period_id: int | None = Field(None, alias="taxPeriodId")
+    tax_amount: Decimal | None = Field(None, alias="taxAmount")
+    bonus_amount: Decimal | None = Field(None, alias="bonusAmount")
+    paid_amount: Decimal | None = Field(None, alias="paidAmount")
+    tax_base_amount: Decimal | None = Field(None, alias="taxBaseAmount")
+    charge_date: datetime | None = Field(None, alias="chargeDate")
+    due_date: datetime | None = Field(None, alias="dueDate")
+    oktmo: str | None = Field(None, description="OKTMO code")
+    region_name: str | None = Field(None, alias="regionName")
+    krsb_tax_charge_id: int | None = Field(None, alias="krsbTaxChargeId")
+
+    _raw_data = model_validator(mode="before")(_split_raw_data)
+    _parse_dates = field_validator("charge_date", "due_date", mode="before")(
+        _parse_datetime
+    )
 
     def model_dump(self, **kwargs: Any) -> dict[str, Any]:
         """Return the raw data dictionary."""
@@ -62,10 +103,29 @@ class Payment(BaseModel):
     """
     Tax payment model.
     Maps to PHP Model\\Tax\\Payment.
+
+    Raw entry is kept in data; known fields are parsed from it.
     """
 
-    # Payment fields would be defined based on API response
+    RAW_FIELD: ClassVar[str] = "data"
+
     data: dict[str, Any] = Field(default_factory=dict, description="Payment data")
+    source_id: int | None = Field(None, alias="sourceId")
+    source_type: str | None = Field(None, alias="sourceType")
+    type: str | None = Field(None, description="Payment type")
+    document_index: str | None = Field(None, alias="documentIndex")
+    amount: Decimal | None = Field(None, description="Payment amount")
+    operation_date: datetime | None = Field(None, alias="operationDate")
+    due_date: datetime | None = Field(None, alias="dueDate")
+    oktmo: str | None = Field(None, description="OKTMO code")
+    kbk: str | None = Field(None, description="Budget classification code")
+    status: str | None = Field(None, description="Payment status")
+    tax_period_id: int | None = Field(None, alias="taxPeriodId")
+
+    _raw_data = model_validator(mode="before")(_split_raw_data)
+    _parse_dates = field_validator("operation_date", "due_date", mode="before")(
+        _parse_datetime
+    )
 
     def model_dump(self, **kwargs: Any) -> dict[str, Any]:
         """Return the raw data dictionary."""
@@ -4,6 +4,7 @@ Mirrors PHP library's exception hierarchy and error handling.
 """
 
 import logging
+from typing import Any
 
 import httpx
 
@@ -118,6 +119,32 @@ class UnknownErrorException(DomainException):
     """Unknown HTTP error code."""
 
 
+class IncomeLimitExceededException(ValueError):
+    """
+    Local pre-submission check: receipt would exceed annual income limit.
+
+    Raised by IncomeLimitGuard before any network call.
+    """
+
+    def __init__(self, message: str, check: Any = None):
+        super().__init__(message)
+        self.check = check
+
+
+class DeadlineExceededException(TimeoutError):
+    """
+    Call did not finish within its deadline.
+
+    Raised by AsyncHTTPClient when the budget set with nalogo.timeouts.deadline()
+    or the deadline argument runs out, including time spent on token refresh
+    and retries.
+    """
+
+    def __init__(self, message: str, budget: float | None = None):
+        super().__init__(message)
+        self.budget = budget
+
+
 def raise_for_status(response: httpx.Response) -> None:
     """
     Raise appropriate domain exception based on HTTP status code.
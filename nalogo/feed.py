@@ -0,0 +1,349 @@
+"""
+Change feed of receipt events.
+Polls the income listing with adaptive intervals and merges in results
+of this client's own IncomeAPI create/cancel calls.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from .exceptions import DomainException
+from .income import (
+    STATUS_CANCELLED,
+    STATUS_REGISTERED,
+    IncomeAPI,
+    IncomeListener,
+    income_record_from_cancel,
+    income_record_from_request,
+    income_status,
+    parse_operation_time,
+)
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "created"
+EVENT_CANCELLED = "cancelled"
+
+SOURCE_POLL = "poll"
+SOURCE_LOCAL = "local"
+
+# Poll errors retried with backoff instead of ending iteration; TimeoutError
+# covers DeadlineExceededException and asyncio timeouts
+_TRANSIENT_ERRORS = (DomainException, httpx.HTTPError, TimeoutError)
+
+
+@dataclass(frozen=True)
+class ReceiptEvent:
+    """Receipt created/cancelled event."""
+
+    kind: str
+    receipt_uuid: str
+    income: dict[str, Any]
+    source: str
+
+
+class FeedCheckpoint:
+    """
+    Durable change feed position.
+
+    Stores last seen status of each receipt within the lookback window
+    and the listing watermark. Saved as JSON file (atomically replaced)
+    when path is given, kept in memory otherwise.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else None
+        self.watermark: datetime | None = None
+        self.seen: dict[str, tuple[str, float]] = {}
+        self._load()
+
+    @property
+    def is_fresh(self) -> bool:
+        """True if feed has never polled with this checkpoint."""
+        return self.watermark is None and not self.seen
+
+    def _load(self) -> None:
+        """Load checkpoint from file."""
+        if not self.path or not self.path.exists():
+            return
+
+        with self.path.open(encoding="utf-8") as f:
+            data = json.load(f)
+        watermark = data.get("watermark")
+        self.watermark = datetime.fromisoformat(watermark) if watermark else None
+        self.seen = {
+            uuid: (status, timestamp)
+            for uuid, (status, timestamp) in data.get("seen", {}).items()
+        }
+
+    def save(self) -> None:
+        """Persist checkpoint to file."""
+        if not self.path:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f"{self.path.name}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "watermark": self.watermark.isoformat() if self.watermark else None,
+                    "seen": self.seen,
+                },
+                f,
+            )
+        tmp_path.replace(self.path)
+
+    def status(self, receipt_uuid: str) -> str | None:
+        """Last seen status of receipt."""
+        entry = self.seen.get(receipt_uuid)
+        return entry[0] if entry else None
+
+    def mark(self, receipt_uuid: str, status: str, operation_time: datetime) -> None:
+        """Record receipt status."""
+        self.seen[receipt_uuid] = (status, operation_time.timestamp())
+
+    def prune(self, before: datetime) -> None:
+        """Forget receipts with operation time before given moment."""
+        threshold = before.timestamp()
+        self.seen = {
+            uuid: entry for uuid, entry in self.seen.items() if entry[1] >= threshold
+        }
+
+
+class ChangeFeed(IncomeListener):
+    """
+    Async iterator of receipt created/cancelled events.
+
+    Polls IncomeAPI listing from checkpoint watermark - lookback. Poll
+    interval starts at min_interval, grows by backoff factor while nothing
+    changes (or on API, HTTP and deadline errors) up to max_interval, and drops back to
+    min_interval once events appear. Events are deduplicated by receipt
+    UUID and status against the checkpoint, so each transition is emitted
+    once, including across restarts with a file checkpoint. Results of
+    this client's own create/cancel calls are emitted immediately.
+
+    The checkpoint advances after the consumer requests the next event,
+    giving at-least-once delivery.
+
+    Example:
+        >>> async with client.change_feed("feed.json") as feed:
+        ...     async for event in feed:
+        ...         print(event.kind, event.receipt_uuid)
+    """
+
+    def __init__(
+        self,
+        income_api: IncomeAPI,
+        checkpoint: FeedCheckpoint | None = None,
+        *,
+        min_interval: float = 5.0,
+        max_interval: float = 300.0,
+        backoff: float = 2.0,
+        lookback: timedelta = timedelta(days=31),
+        replay_existing: bool = False,
+        page_size: int = 100,
+        on_close: Callable[[], None] | None = None,
+    ):
+        """
+        Initialize change feed.
+
+        Args:
+            income_api: IncomeAPI used for polling
+            checkpoint: Feed position (default: fresh in-memory checkpoint)
+            min_interval: Shortest poll interval in seconds
+            max_interval: Longest poll interval in seconds
+            backoff: Interval growth factor for idle polls and errors
+            lookback: How far behind watermark polls re-read the listing
+            replay_existing: With fresh checkpoint, emit receipts already
+                in the listing instead of silently taking them as seen
+            page_size: Listing page size
+            on_close: Callback invoked by aclose()
+        """
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("Intervals must satisfy 0 < min_interval <= max_interval")
+        if backoff < 1:
+            raise ValueError("Backoff factor must be at least 1")
+
+        self.income_api = income_api
+        self.checkpoint = checkpoint or FeedCheckpoint()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.lookback = lookback
+        self.replay_existing = replay_existing
+        self.page_size = page_size
+        self.interval = min_interval
+        self._on_close = on_close
+        # None is put by aclose() to wake a pending wait
+        self._local: asyncio.Queue[ReceiptEvent | None] = asyncio.Queue()
+        self._closed = False
+
+    async def income_created(
+        self, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Queue event for receipt created through IncomeAPI."""
+        record = income_record_from_request(request, response)
+        if record is not None:
+            self._local.put_nowait(
+                ReceiptEvent(
+                    EVENT_CREATED, record["approvedReceiptUuid"], record, SOURCE_LOCAL
+                )
+            )
+
+    async def income_cancelled(
+        self, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Queue event for receipt cancelled through IncomeAPI."""
+        record = income_record_from_cancel(request, response)
+        if record.get("approvedReceiptUuid"):
+            self._local.put_nowait(
+                ReceiptEvent(
+                    EVENT_CANCELLED,
+                    record["approvedReceiptUuid"],
+                    record,
+                    SOURCE_LOCAL,
+                )
+            )
+
+    @staticmethod
+    def _event_status(event: ReceiptEvent) -> str:
+        """Receipt status after event."""
+        return STATUS_CANCELLED if event.kind == EVENT_CANCELLED else STATUS_REGISTERED
+
+    def _is_new(self, event: ReceiptEvent) -> bool:
+        """Check event against checkpoint."""
+        previous = self.checkpoint.status(event.receipt_uuid)
+        if previous == STATUS_CANCELLED:
+            # Cancellation is final, nothing can follow it
+            return False
+        return previous != self._event_status(event)
+
+    def _commit(self, event: ReceiptEvent) -> None:
+        """Advance checkpoint past delivered event."""
+        operation_time = event.income.get("operationTime")
+        self.checkpoint.mark(
+            event.receipt_uuid,
+            self._event_status(event),
+            # Minimal cancel records have no operation time; keep it in window
+            (
+                parse_operation_time(operation_time)
+                if operation_time
+                else datetime.now(UTC)
+            ),
+        )
+        self.checkpoint.save()
+
+    async def poll(self, now: datetime | None = None) -> list[ReceiptEvent]:
+        """
+        Poll income listing once.
+
+        Args:
+            now: Upper bound of operation time (default: current UTC time)
+
+        Returns:
+            New events in listing order (not yet committed to checkpoint)
+
+        Raises:
+            DomainException: For API errors
+        """
+        checkpoint = self.checkpoint
+        seed_only = checkpoint.is_fresh and not self.replay_existing
+        watermark = checkpoint.watermark
+        from_ = watermark - self.lookback if watermark else None
+        now = now or datetime.now(UTC)
+
+        events: list[ReceiptEvent] = []
+        async for record in self.income_api.iter_incomes(
+            from_=from_,
+            to=now,
+            page_size=self.page_size,
+            sort_by="operation_time:asc",
+        ):
+            uuid = record.get("approvedReceiptUuid")
+            if not uuid:
+                continue
+            operation_time = parse_operation_time(record.get("operationTime"))
+            if watermark is None or operation_time > watermark:
+                watermark = operation_time
+
+            status = income_status(record)
+            if seed_only:
+                checkpoint.mark(uuid, status, operation_time)
+                continue
+
+            previous = checkpoint.status(uuid)
+            if previous is None:
+                events.append(ReceiptEvent(EVENT_CREATED, uuid, record, SOURCE_POLL))
+            if status == STATUS_CANCELLED and previous != STATUS_CANCELLED:
+                events.append(ReceiptEvent(EVENT_CANCELLED, uuid, record, SOURCE_POLL))
+
+        # Empty listing still fixes the starting point of the feed
+        checkpoint.watermark = watermark or now
+        checkpoint.prune(checkpoint.watermark - self.lookback - timedelta(days=1))
+        checkpoint.save()
+        return events
+
+    def _next_interval(self, had_events: bool) -> float:
+        """Adapt poll interval."""
+        if had_events:
+            return self.min_interval
+        return min(self.interval * self.backoff, self.max_interval)
+
+    async def _events(self) -> AsyncIterator[ReceiptEvent]:
+        loop = asyncio.get_running_loop()
+        next_poll = loop.time()
+
+        while not self._closed:
+            if loop.time() >= next_poll:
+                try:
+                    events = await self.poll()
+                except _TRANSIENT_ERRORS as e:
+                    logger.warning("Change feed poll failed: %s", e)
+                    events = []
+                    self.interval = min(self.interval * self.backoff, self.max_interval)
+                else:
+                    self.interval = self._next_interval(bool(events))
+                next_poll = loop.time() + self.interval
+
+                for event in events:
+                    # Local event may have delivered this transition already
+                    if self._is_new(event):
+                        yield event
+                        self._commit(event)
+
+            try:
+                local = await asyncio.wait_for(
+                    self._local.get(), timeout=max(next_poll - loop.time(), 0)
+                )
+            except TimeoutError:
+                continue
+
+            if local is not None and self._is_new(local):
+                yield local
+                self._commit(local)
+
+    def __aiter__(self) -> AsyncIterator[ReceiptEvent]:
+        return self._events()
+
+    async def aclose(self) -> None:
+        """Stop feed (waking a pending wait for events) and detach it."""
+        if not self._closed:
+            self._closed = True
+            self._local.put_nowait(None)
+        if self._on_close is not None:
+            self._on_close()
+            self._on_close = None
+
+    async def __aenter__(self) -> "ChangeFeed":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
@@ -0,0 +1,133 @@
+"""
+Request hedging for idempotent reads.
+
+When an eligible request (GET by default) has not answered within the
+endpoint's observed latency percentile, HedgingMiddleware sends a second
+identical request; the first successful response wins and the other one
+is cancelled. Extra load is capped by a token bucket: every eligible
+request adds budget tokens (up to burst) and every hedge spends one, so
+budget=0.05 allows about 5% extra requests.
+
+Example:
+    >>> policy = HedgePolicy(percentile=95, budget=0.05)
+    >>> client = Client(hedging=policy)
+    >>> ...
+    >>> policy.stats()["hedge_rate"]
+"""
+
+from collections.abc import Sequence
+from typing import Any
+
+from .timeouts import MAX_PERCENTILE, LatencyWindow
+
+
+class HedgePolicy:
+    """When to hedge requests, and hedging counters."""
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        budget: float = 0.05,
+        *,
+        burst: float = 10.0,
+        min_delay: float = 0.0,
+        window: int = 500,
+        min_samples: int = 20,
+        methods: Sequence[str] = ("GET",),
+        paths: Sequence[str] | None = None,
+    ):
+        """
+        Initialize hedge policy.
+
+        Args:
+            percentile: Latency percentile (0..100] after which to hedge
+            budget: Hedges allowed per eligible request (0..1]
+            burst: Max hedges that can be saved up
+            min_delay: Lower bound of hedge delay in seconds
+            window: Latencies kept per endpoint
+            min_samples: Latencies needed before hedging an endpoint
+            methods: Idempotent HTTP methods to hedge
+            paths: Path prefixes to hedge (default: all paths)
+
+        Raises:
+            ValueError: For out of range parameters
+        """
+        if not 0 < percentile <= MAX_PERCENTILE:
+            raise ValueError("Percentile must be in (0, 100]")
+        if not 0 < budget <= 1:
+            raise ValueError("Budget must be in (0, 1]")
+        if burst < 1:
+            raise ValueError("Burst must be at least 1")
+        if min_delay < 0:
+            raise ValueError("min_delay cannot be negative")
+        if not 1 <= min_samples <= window:
+            raise ValueError("min_samples must be between 1 and window")
+        self.percentile = percentile
+        self.budget = budget
+        self.burst = burst
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.methods = frozenset(m.upper() for m in methods)
+        self.paths = tuple(paths) if paths is not None else None
+        self.latencies = LatencyWindow(window)
+        self.tokens = burst
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.denied = 0
+        # Hedges skipped because the request scheduler had no free slot
+        self.busy = 0
+
+    def eligible(self, method: str, path: str) -> bool:
+        """Check whether request may be hedged."""
+        if method not in self.methods:
+            return False
+        return self.paths is None or path.startswith(self.paths)
+
+    def delay_for(self, method: str, path: str) -> float | None:
+        """
+        Get seconds to wait before hedging request.
+
+        Also counts the request and adds budget tokens.
+
+        Returns:
+            Delay, or None while the endpoint has too few latency samples
+        """
+        self.requests += 1
+        self.tokens = min(self.tokens + self.budget, self.burst)
+        if self.latencies.count(method, path) < self.min_samples:
+            return None
+        value = self.latencies.percentile(method, path, self.percentile)
+        return None if value is None else max(value, self.min_delay)
+
+    def acquire(self) -> bool:
+        """Spend one token for a hedge; False if budget is exhausted."""
+        if self.tokens < 1:
+            self.denied += 1
+            return False
+        self.tokens -= 1
+        self.hedged += 1
+        return True
+
+    @property
+    def hedge_rate(self) -> float:
+        """Share of eligible requests that were hedged."""
+        return self.hedged / self.requests if self.requests else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Get hedging counters.
+
+        Returns:
+            Dictionary with requests, hedged, hedge_wins, denied, busy and
+            hedge_rate
+        """
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "denied": self.denied,
+            "busy": self.busy,
+            "hedge_rate": self.hedge_rate,
+        }
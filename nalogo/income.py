@@ -3,13 +3,18 @@ Income API implementation.
 Based on PHP library's Api\\Income class.
 """
 
-from datetime import datetime
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncGenerator
+from datetime import UTC, datetime
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 from ._http import AsyncHTTPClient
+from .dto.atom import utc_now
+from .dto.fast import FastClient, FastIncomeRequest, FastServiceItem
 from .dto.income import (
-    AtomDateTime,
     CancelCommentType,
     CancelRequest,
     IncomeClient,
@@ -17,7 +22,116 @@ from .dto.income import (
     IncomeServiceItem,
     IncomeType,
     PaymentType,
+    atom_value,
+    services_total,
 )
+from .tracing import traced
+
+if TYPE_CHECKING:
+    from .limits import IncomeLimitGuard
+
+logger = logging.getLogger(__name__)
+
+STATUS_REGISTERED = "REGISTERED"
+STATUS_CANCELLED = "CANCELLED"
+
+
+class IncomeListener:
+    """
+    Receiver of IncomeAPI create/cancel results.
+
+    Registered via Client.add_income_listener(). Both hooks are no-ops by
+    default; override the ones you need. Exceptions raised by listeners
+    are logged and never propagate to the API caller, since the receipt
+    is already registered by the service at that point.
+    """
+
+    async def income_created(
+        self, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Called after /income succeeded with request body and response."""
+
+    async def income_cancelled(
+        self, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Called after /cancel succeeded with request body and response."""
+
+
+def income_status(record: dict[str, Any]) -> str:
+    """Get receipt status ("REGISTERED" or "CANCELLED") from income record."""
+    return STATUS_CANCELLED if record.get("cancellationInfo") else STATUS_REGISTERED
+
+
+def parse_operation_time(value: str | None) -> datetime:
+    """Parse ATOM/ISO datetime from API payload (naive values are UTC)."""
+    if not value:
+        return datetime.fromtimestamp(0, UTC)
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt
+
+
+def income_record_from_request(
+    request: dict[str, Any], response: dict[str, Any]
+) -> dict[str, Any] | None:
+    """
+    Build income record in listing format from /income request and response.
+
+    Args:
+        request: IncomeRequest.model_dump() body sent to /income
+        response: /income response with approvedReceiptUuid
+
+    Returns:
+        Income record or None if response has no receipt UUID
+    """
+    uuid = response.get("approvedReceiptUuid")
+    if not uuid:
+        return None
+
+    client = request.get("client") or {}
+    services = request.get("services") or []
+    return {
+        "approvedReceiptUuid": uuid,
+        "name": ", ".join(service["name"] for service in services),
+        "services": services,
+        "operationTime": request.get("operationTime"),
+        "requestTime": request.get("requestTime"),
+        "paymentType": request.get("paymentType"),
+        "totalAmount": request.get("totalAmount"),
+        "incomeType": client.get("incomeType"),
+        "clientInn": client.get("inn"),
+        "clientDisplayName": client.get("displayName"),
+        "cancellationInfo": None,
+    }
+
+
+def income_record_from_cancel(
+    request: dict[str, Any], response: dict[str, Any]
+) -> dict[str, Any]:
+    """
+    Build cancelled income record from /cancel request and response.
+
+    Uses response incomeInfo when present, otherwise a minimal record.
+
+    Args:
+        request: CancelRequest.model_dump() body sent to /cancel
+        response: /cancel response
+
+    Returns:
+        Income record with cancellationInfo set
+    """
+    income_info = response.get("incomeInfo")
+    if isinstance(income_info, dict) and income_info.get("approvedReceiptUuid"):
+        record = dict(income_info)
+    else:
+        record = {"approvedReceiptUuid": request.get("receiptUuid")}
+    if not record.get("cancellationInfo"):
+        record["cancellationInfo"] = {
+            "operationTime": request.get("operationTime"),
+            "comment": request.get("comment"),
+        }
+    return record
 
 
 class IncomeAPI:
@@ -26,14 +140,57 @@ class IncomeAPI:
 
     Provides async methods for:
     - Creating income receipts (single or multiple items)
+    - Creating receipts from pre-validated items (fast path)
     - Cancelling income receipts
+    - Listing registered incomes page by page
 
     Maps to PHP Api\\Income functionality.
     """
 
-    def __init__(self, http_client: AsyncHTTPClient):
+    DEFAULT_SORT = "operation_time:desc"
+
+    def __init__(
+        self,
+        http_client: AsyncHTTPClient,
+        listeners: list[IncomeListener] | None = None,
+        limit_guard: "IncomeLimitGuard | None" = None,
+        account: str = "",
+    ):
         self.http = http_client
+        self.listeners = listeners if listeners is not None else []
+        self.limit_guard = limit_guard
+        self.account = account
 
+    async def _guard_account(self) -> str:
+        """
+        Get account INN the limit guard keeps totals for.
+
+        Falls back to the profile stored with the token (e.g. a token loaded
+        from storage without Client.authenticate()).
+
+        Raises:
+            ValueError: If the account INN is unknown
+        """
+        if not self.account:
+            token = await self.http.auth_provider.get_token()
+            profile = token.get("profile") if isinstance(token, dict) else None
+            if isinstance(profile, dict) and profile.get("inn"):
+                self.account = str(profile["inn"])
+        if not self.account:
+            raise ValueError("User profile not available. Please authenticate first.")
+        return self.account
+
+    async def _notify(
+        self, hook: str, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Deliver create/cancel result to registered listeners."""
+        for listener in self.listeners:
+            try:
+                await getattr(listener, hook)(request, response)
+            except Exception:
+                logger.exception("Income listener %r failed in %s", listener, hook)
+
+    @traced("IncomeAPI.create")
     async def create(
         self,
         name: str,
@@ -62,14 +219,16 @@ class IncomeAPI:
             DomainException: For other API errors
         """
         # Convert to IncomeServiceItem
-        service_item = IncomeServiceItem(
-            name=name,
-            amount=Decimal(str(amount)),
-            quantity=Decimal(str(quantity)),
-        )
+        with self.http.tracer.span("validation"):
+            service_item = IncomeServiceItem(
+                name=name,
+                amount=Decimal(str(amount)),
+                quantity=Decimal(str(quantity)),
+            )
 
         return await self.create_multiple_items([service_item], operation_time, client)
 
+    @traced("IncomeAPI.create_multiple_items")
     async def create_multiple_items(
         self,
         services: list[IncomeServiceItem],
@@ -82,7 +241,7 @@ class IncomeAPI:
         Maps to PHP Income::createMultipleItems() method.
 
         Args:
-            services: List of service items
+            services: List of service items (amounts are rounded to kopecks)
             operation_time: Operation datetime (default: now)
             client: Client information (default: individual client)
 
@@ -91,40 +250,105 @@ class IncomeAPI:
 
         Raises:
             ValidationException: For validation errors (empty items, invalid amounts, etc.)
+            IncomeLimitExceededException: If limit guard rejects the receipt
             DomainException: For other API errors
         """
         if not services:
             raise ValueError("Services cannot be empty")
 
-        # Validate client for legal entity (mirrors PHP validation)
-        if client and client.income_type == IncomeType.FROM_LEGAL_ENTITY:
-            if not client.inn:
-                raise ValueError("Client INN cannot be empty for legal entity")
-            if not client.display_name:
-                raise ValueError("Client DisplayName cannot be empty for legal entity")
+        tracer = self.http.tracer
+        with tracer.span("validation"):
+            # Validate client for legal entity (mirrors PHP validation)
+            if client and client.income_type == IncomeType.FROM_LEGAL_ENTITY:
+                if not client.inn:
+                    raise ValueError("Client INN cannot be empty for legal entity")
+                if not client.display_name:
+                    raise ValueError(
+                        "Client DisplayName cannot be empty for legal entity"
+                    )
+
+            # Calculate total amount in integer kopecks
+            total_amount = services_total(services)
+
+            # Create request object
+            request_time = utc_now()
+            request = IncomeRequest(
+                operation_time=operation_time or request_time,
+                request_time=request_time,
+                services=services,
+                total_amount=str(total_amount),
+                client=client or IncomeClient(),
+                payment_type=PaymentType.CASH,
+                ignore_max_total_income_restriction=False,
+            )
+
+        with tracer.span("model_dump"):
+            request_data = request.model_dump()
+
+        return await self._submit_income(
+            request_data,
+            atom_value(request.operation_time),
+            total_amount.to_decimal(),
+        )
 
-        # Calculate total amount (mirrors PHP BigDecimal logic)
-        total_amount = sum(item.get_total_amount() for item in services)
+    @traced("IncomeAPI.create_trusted_items")
+    async def create_trusted_items(
+        self,
+        services: list[FastServiceItem],
+        operation_time: datetime | None = None,
+        client: FastClient | None = None,
+    ) -> dict[str, Any]:
+        """
+        Create income receipt from pre-validated items without pydantic models.
 
-        # Create request object
-        request = IncomeRequest(
-            operation_time=(
-                AtomDateTime.from_datetime(operation_time)
-                if operation_time
-                else AtomDateTime.now()
-            ),
-            request_time=AtomDateTime.now(),
-            services=services,
-            total_amount=str(total_amount),
-            client=client or IncomeClient(),
-            payment_type=PaymentType.CASH,
-            ignore_max_total_income_restriction=False,
-        )
+        Fast path for bulk creation: sends the same request body as
+        create_multiple_items() but skips model construction and validation.
+        Input must be validated beforehand (see nalogo.validation).
 
-        # Make API request
-        response = await self.http.post("/income", json_data=request.model_dump())
-        return response.json()  # type: ignore[no-any-return]
+        Args:
+            services: Non-empty list of service items
+            operation_time: Operation datetime (default: now)
+            client: Client information (default: individual client)
 
+        Returns:
+            Dictionary with response data including approvedReceiptUuid
+
+        Raises:
+            ValueError: If services list is empty
+            IncomeLimitExceededException: If limit guard rejects the receipt
+            DomainException: For API errors
+        """
+        if not services:
+            raise ValueError("Services cannot be empty")
+
+        request = FastIncomeRequest.build(services, operation_time, client)
+        with self.http.tracer.span("model_dump"):
+            request_data = request.to_json()
+        return await self._submit_income(
+            request_data, request.operation_time, Decimal(request.total_amount)
+        )
+
+    async def _submit_income(
+        self,
+        request_data: dict[str, Any],
+        operation_time: datetime,
+        total_amount: Decimal,
+    ) -> dict[str, Any]:
+        """Send /income request through limit guard and notify listeners."""
+        if self.limit_guard is None:
+            response = await self.http.post("/income", json_data=request_data)
+        else:
+            # Checked and reserved locally before the request is sent
+            async with self.limit_guard.reserve(
+                await self._guard_account(), operation_time, total_amount
+            ):
+                response = await self.http.post("/income", json_data=request_data)
+        result: dict[str, Any] = self.http.json(response)
+
+        await self._notify("income_created", request_data, result)
+        return result
+
+    @traced("IncomeAPI.cancel")
     async def cancel(
         self,
         receipt_uuid: str,
@@ -174,22 +398,171 @@ class IncomeAPI:
             comment = comment_enum
 
         # Create request object
-        request = CancelRequest(
-            operation_time=(
-                AtomDateTime.from_datetime(operation_time)
-                if operation_time
-                else AtomDateTime.now()
-            ),
-            request_time=(
-                AtomDateTime.from_datetime(request_time)
-                if request_time
-                else AtomDateTime.now()
-            ),
-            comment=comment,
-            receipt_uuid=receipt_uuid.strip(),
-            partner_code=partner_code,
-        )
+        tracer = self.http.tracer
+        now = utc_now()
+        with tracer.span("validation"):
+            request = CancelRequest(
+                operation_time=operation_time or now,
+                request_time=request_time or now,
+                comment=comment,
+                receipt_uuid=receipt_uuid.strip(),
+                partner_code=partner_code,
+            )
 
         # Make API request
-        response = await self.http.post("/cancel", json_data=request.model_dump())
-        return response.json()  # type: ignore[no-any-return]
+        with tracer.span("model_dump"):
+            request_data = request.model_dump()
+        # Resolved before sending, so a cancelled receipt is never missed
+        account = await self._guard_account() if self.limit_guard else ""
+        response = await self.http.post("/cancel", json_data=request_data)
+        result: dict[str, Any] = self.http.json(response)
+
+        if self.limit_guard is not None:
+            self.limit_guard.receipt_cancelled(account, result)
+        await self._notify("income_cancelled", request_data, result)
+        return result
+
+    @traced("IncomeAPI.list_incomes")
+    async def list_incomes(
+        self,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        offset: int = 0,
+        limit: int = 50,
+        sort_by: str = DEFAULT_SORT,
+    ) -> dict[str, Any]:
+        """
+        Get single page of registered incomes.
+
+        Args:
+            from_: Start of operation time range (inclusive)
+            to: End of operation time range (inclusive)
+            offset: Number of records to skip
+            limit: Page size
+            sort_by: Sort order, e.g. "operation_time:desc" or "operation_time:asc"
+
+        Returns:
+            Dictionary with "content" (income records), "hasMore",
+            "currentOffset" and "currentLimit"
+
+        Raises:
+            ValueError: For negative offset or non-positive limit
+            DomainException: For API errors
+        """
+        if offset < 0:
+            raise ValueError("Offset cannot be negative")
+        if limit <= 0:
+            raise ValueError("Limit must be greater than 0")
+
+        params: dict[str, Any] = {
+            "offset": offset,
+            "limit": limit,
+            "sortBy": sort_by,
+        }
+        if from_ is not None:
+            params["from"] = _format_listing_time(from_)
+        if to is not None:
+            params["to"] = _format_listing_time(to)
+
+        response = await self.http.get("/incomes", params=params)
+        return self.http.json(response)  # type: ignore[no-any-return]
+
+    async def iter_income_pages(
+        self,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        page_size: int = 50,
+        offset: int = 0,
+        sort_by: str = DEFAULT_SORT,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Iterate over income listing pages.
+
+        Page N+1 is requested while the caller processes page N, and at most
+        two pages are held in memory at any time. To resume an interrupted
+        iteration pass offset = page["currentOffset"] + len(page["content"])
+        of the last processed page.
+
+        Closing the iterator cancels the prefetch request. A consumer that
+        may stop early should wrap it in contextlib.aclosing(); otherwise
+        the prefetch runs until the abandoned iterator is finalized.
+
+        Args:
+            from_: Start of operation time range (inclusive)
+            to: End of operation time range (inclusive)
+            page_size: Records per request
+            offset: Offset to start (or resume) from
+            sort_by: Sort order passed to the listing endpoint
+
+        Yields:
+            Listing page dictionaries as returned by list_incomes()
+
+        Raises:
+            DomainException: For API errors
+        """
+
+        def fetch(page_offset: int) -> "asyncio.Task[dict[str, Any]]":
+            return asyncio.ensure_future(
+                self.list_incomes(from_, to, page_offset, page_size, sort_by)
+            )
+
+        next_page: asyncio.Task[dict[str, Any]] | None = fetch(offset)
+        try:
+            while next_page is not None:
+                page = await next_page
+                content = page.get("content") or []
+                page.setdefault("currentOffset", offset)
+                offset += len(content)
+
+                has_more = page.get("hasMore", len(content) >= page_size)
+                next_page = fetch(offset) if has_more and content else None
+                yield page
+        finally:
+            if next_page is not None and not next_page.done():
+                next_page.cancel()
+                # Wait for the cancellation without raising the page result
+                await asyncio.wait([next_page])
+
+    async def iter_incomes(
+        self,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        page_size: int = 50,
+        offset: int = 0,
+        sort_by: str = DEFAULT_SORT,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        """
+        Iterate over registered incomes record by record.
+
+        Pages are fetched with prefetch via iter_income_pages(), so memory
+        does not grow with history size. Resume with offset equal to the
+        number of records already consumed (plus the initial offset).
+        Wrap in contextlib.aclosing() when stopping early, as with
+        iter_income_pages().
+
+        Args:
+            from_: Start of operation time range (inclusive)
+            to: End of operation time range (inclusive)
+            page_size: Records per request
+            offset: Offset to start (or resume) from
+            sort_by: Sort order passed to the listing endpoint
+
+        Yields:
+            Income record dictionaries
+
+        Raises:
+            DomainException: For API errors
+        """
+        pages = self.iter_income_pages(from_, to, page_size, offset, sort_by)
+        # Closing this iterator closes pages and cancels its prefetch
+        async with contextlib.aclosing(pages):
+            async for page in pages:
+                for record in page.get("content") or []:
+                    yield record
+
+
+def _format_listing_time(dt: datetime) -> str:
+    """Format datetime for income listing filters (naive values are UTC)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.isoformat(timespec="milliseconds")
@@ -0,0 +1,287 @@
+"""
+Annual income limit guard.
+Keeps running year-to-date income per account and checks receipts against
+the self-employed annual income cap before they are sent to /income.
+"""
+
+import logging
+import threading
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from .analytics import TAX_TIMEZONE, tax_period_id
+from .exceptions import IncomeLimitExceededException
+from .income import (
+    STATUS_REGISTERED,
+    IncomeAPI,
+    income_status,
+    parse_operation_time,
+)
+
+if TYPE_CHECKING:
+    from .mirror import IncomeMirror
+
+logger = logging.getLogger(__name__)
+
+# Self-employed (NPD) annual income cap, rubles
+ANNUAL_INCOME_LIMIT = Decimal("2400000")
+
+MODE_REJECT = "reject"
+MODE_FLAG = "flag"
+
+# Smallest datetime step; year ends one step before next Jan 1
+_RESOLUTION = timedelta(microseconds=1)
+
+
+def income_year(operation_time: datetime) -> int:
+    """Tax year of operation time (Moscow time)."""
+    return tax_period_id(operation_time) // 100
+
+
+def _year_bounds(year: int) -> tuple[datetime, datetime]:
+    """First and last instant of tax year (Moscow time, inclusive)."""
+    start = datetime(year, 1, 1, tzinfo=TAX_TIMEZONE)
+    end = datetime(year + 1, 1, 1, tzinfo=TAX_TIMEZONE) - _RESOLUTION
+    return start, end
+
+
+@dataclass(frozen=True)
+class LimitCheck:
+    """Result of checking a receipt amount against the annual limit."""
+
+    account: str
+    year: int
+    amount: Decimal
+    total: Decimal
+    limit: Decimal
+
+    @property
+    def exceeded(self) -> bool:
+        """True if receipt would bring year total over the limit."""
+        return self.total + self.amount > self.limit
+
+    @property
+    def remaining(self) -> Decimal:
+        """Income left before the limit (before this receipt)."""
+        return max(self.limit - self.total, Decimal(0))
+
+
+class IncomeLimitGuard:
+    """
+    Pre-submission guard for the annual income limit.
+
+    Year totals are kept per (account, year). IncomeAPI reserves receipt
+    amount before the /income call and commits it on success or releases
+    it on failure, so concurrent creates are checked against committed
+    plus in-flight amounts. Reservation check and update happen under a
+    lock, which makes the guard safe to share between clients and threads.
+
+    In "reject" mode over-limit receipts raise IncomeLimitExceededException
+    before any network call. In "flag" mode they are sent anyway, logged
+    and recorded in flagged (the latest flagged_size checks). Receipts cancelled through IncomeAPI return
+    their amount to the year budget.
+
+    Example:
+        >>> guard = IncomeLimitGuard()
+        >>> await guard.seed_from_incomes("500100732259", client.income(), 2024)
+        >>> client = Client(income_limit_guard=guard)
+    """
+
+    def __init__(
+        self,
+        limit: Decimal = ANNUAL_INCOME_LIMIT,
+        mode: str = MODE_REJECT,
+        *,
+        flagged_size: int = 1000,
+    ):
+        """
+        Initialize guard.
+
+        Args:
+            limit: Annual income limit in rubles
+            mode: "reject" to raise before sending, "flag" to log and send
+            flagged_size: Over-limit checks kept in flagged (oldest dropped)
+
+        Raises:
+            ValueError: For unknown mode or non-positive flagged_size
+        """
+        if mode not in (MODE_REJECT, MODE_FLAG):
+            raise ValueError(f"Mode must be '{MODE_REJECT}' or '{MODE_FLAG}'")
+        if flagged_size < 1:
+            raise ValueError("flagged_size must be positive")
+        self.limit = Decimal(limit)
+        self.mode = mode
+        self.flagged: deque[LimitCheck] = deque(maxlen=flagged_size)
+        self._committed: dict[tuple[str, int], Decimal] = {}
+        self._pending: dict[tuple[str, int], Decimal] = {}
+        self._lock = threading.Lock()
+
+    def seed(self, account: str, year: int, total: Decimal) -> None:
+        """
+        Set committed year-to-date income of account.
+
+        Args:
+            account: Account INN
+            year: Tax year
+            total: Income already registered in the year, rubles
+        """
+        with self._lock:
+            self._committed[(account, year)] = Decimal(total)
+
+    async def seed_from_incomes(
+        self, account: str, income_api: IncomeAPI, year: int
+    ) -> Decimal:
+        """
+        Seed year total from the income listing (cancelled receipts excluded).
+
+        Args:
+            account: Account INN
+            income_api: IncomeAPI of the account
+            year: Tax year
+
+        Returns:
+            Seeded total in rubles
+        """
+        start, end = _year_bounds(year)
+        total = Decimal(0)
+        async for record in income_api.iter_incomes(from_=start, to=end, page_size=100):
+            if income_status(record) == STATUS_REGISTERED:
+                total += Decimal(str(record.get("totalAmount", 0)))
+        self.seed(account, year, total)
+        return total
+
+    def seed_from_mirror(
+        self, account: str, mirror: "IncomeMirror", year: int
+    ) -> Decimal:
+        """
+        Seed year total from IncomeMirror without network calls.
+
+        Args:
+            account: Account INN
+            mirror: IncomeMirror of the account
+            year: Tax year
+
+        Returns:
+            Seeded total in rubles
+        """
+        start, end = _year_bounds(year)
+        total = mirror.total_amount(from_=start, to=end)
+        self.seed(account, year, total)
+        return total
+
+    def total(self, account: str, year: int) -> Decimal:
+        """Committed plus in-flight income of account in year."""
+        key = (account, year)
+        with self._lock:
+            return self._committed.get(key, Decimal(0)) + self._pending.get(
+                key, Decimal(0)
+            )
+
+    def check(self, account: str, year: int, amount: Decimal) -> LimitCheck:
+        """
+        Check amount against limit without reserving it.
+
+        Args:
+            account: Account INN
+            year: Tax year
+            amount: Receipt total, rubles
+
+        Returns:
+            LimitCheck result
+        """
+        return LimitCheck(account, year, amount, self.total(account, year), self.limit)
+
+    def _reserve(self, account: str, year: int, amount: Decimal) -> LimitCheck:
+        key = (account, year)
+        with self._lock:
+            pending = self._pending.get(key, Decimal(0))
+            check = LimitCheck(
+                account,
+                year,
+                amount,
+                self._committed.get(key, Decimal(0)) + pending,
+                self.limit,
+            )
+            if check.exceeded and self.mode == MODE_REJECT:
+                raise IncomeLimitExceededException(
+                    f"Receipt amount {amount} exceeds annual income limit {self.limit}: "
+                    f"{check.remaining} left for {year}",
+                    check,
+                )
+            self._pending[key] = pending + amount
+
+        if check.exceeded:
+            logger.warning(
+                "Receipt amount %s exceeds annual income limit %s for %s",
+                amount,
+                self.limit,
+                year,
+            )
+            self.flagged.append(check)
+        return check
+
+    def _settle(self, check: LimitCheck, success: bool) -> None:
+        key = (check.account, check.year)
+        with self._lock:
+            self._pending[key] -= check.amount
+            if not self._pending[key]:
+                del self._pending[key]
+            if success:
+                self._committed[key] = (
+                    self._committed.get(key, Decimal(0)) + check.amount
+                )
+
+    @asynccontextmanager
+    async def reserve(
+        self, account: str, operation_time: datetime, amount: Decimal
+    ) -> AsyncIterator[LimitCheck]:
+        """
+        Reserve receipt amount for the duration of the /income call.
+
+        Amount is committed if the block completes and released if it
+        raises.
+
+        Args:
+            account: Account INN
+            operation_time: Receipt operation time (defines tax year)
+            amount: Receipt total, rubles
+
+        Yields:
+            LimitCheck result
+
+        Raises:
+            IncomeLimitExceededException: In reject mode, if over the limit
+        """
+        check = self._reserve(account, income_year(operation_time), amount)
+        try:
+            yield check
+        except BaseException:
+            self._settle(check, success=False)
+            raise
+        self._settle(check, success=True)
+
+    def receipt_cancelled(self, account: str, response: dict[str, Any]) -> None:
+        """
+        Return cancelled receipt amount to the year budget.
+
+        Args:
+            account: Account INN
+            response: /cancel response with incomeInfo
+        """
+        income_info = response.get("incomeInfo")
+        if not isinstance(income_info, dict) or "totalAmount" not in income_info:
+            return
+
+        key = (
+            account,
+            income_year(parse_operation_time(income_info.get("operationTime"))),
+        )
+        amount = Decimal(str(income_info["totalAmount"]))
+        with self._lock:
+            if key in self._committed:
+                self._committed[key] = max(self._committed[key] - amount, Decimal(0))
@@ -0,0 +1,482 @@
+"""
+In-process metrics for HTTP requests.
+
+MetricsRegistry holds labelled counters and histograms and renders them
+in Prometheus text exposition format. HTTPMetrics defines the request
+metrics recorded by AsyncHTTPClient when enabled with
+Client(metrics=HTTPMetrics()); without it no metrics code runs.
+
+Example:
+    >>> metrics = HTTPMetrics()
+    >>> client = Client(metrics=metrics)
+    >>> ...
+    >>> metrics.registry.write_prometheus("/var/lib/node_exporter/nalogo.prom")
+"""
+
+import math
+import os
+import re
+import tempfile
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NAME_RE = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+_LABEL_RE = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+# Whole floats below this are exact integers, printed without ".0"
+_INT_FORMAT_LIMIT = 1e15
+
+
+def _escape(value: str) -> str:
+    """Escape label value for text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value) and abs(value) < _INT_FORMAT_LIMIT:
+        return str(int(value))
+    return repr(value)
+
+
+class Metric:
+    """Base of labelled metric."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        """
+        Initialize metric.
+
+        Args:
+            name: Metric name (Prometheus naming rules)
+            help_text: HELP line text
+            labelnames: Label names, values are passed positionally
+
+        Raises:
+            ValueError: For invalid metric or label names
+        """
+        if not _NAME_RE.fullmatch(name):
+            raise ValueError(f"Invalid metric name: {name}")
+        for label in labelnames:
+            if not _LABEL_RE.fullmatch(label) or label == "le":
+                raise ValueError(f"Invalid label name: {label}")
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+
+    def _check(self, labels: tuple[str, ...]) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"{self.name} expects labels {self.labelnames}, got {labels}"
+            )
+
+    def _label_text(self, labels: tuple[str, ...], extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(value)}"'
+            for name, value in zip(self.labelnames, labels, strict=True)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> Iterable[str]:
+        """Yield exposition lines of samples."""
+        return ()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Get samples as list of {labels, ...values} dictionaries."""
+        return []
+
+
+class Counter(Metric):
+    """Monotonically increasing counter per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        """
+        Increase counter.
+
+        Args:
+            labels: Label values in labelnames order
+            amount: Non-negative increment
+
+        Raises:
+            ValueError: For negative amount or wrong label count
+        """
+        if amount < 0:
+            raise ValueError("Counter can only increase")
+        if labels not in self.values:
+            self._check(labels)
+            self.values[labels] = 0.0
+        self.values[labels] += amount
+
+    def get(self, labels: tuple[str, ...] = ()) -> float:
+        """Get counter value (0 if never increased)."""
+        return self.values.get(labels, 0.0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self.values.items():
+            yield f"{self.name}{self._label_text(labels)} {_format_value(value)}"
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [
+            {"labels": dict(zip(self.labelnames, labels, strict=True)), "value": value}
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down per label set."""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def set(self, labels: tuple[str, ...], value: float) -> None:
+        """
+        Set gauge value.
+
+        Args:
+            labels: Label values in labelnames order
+            value: New value
+        """
+        if labels not in self.values:
+            self._check(labels)
+        self.values[labels] = value
+
+    def get(self, labels: tuple[str, ...] = ()) -> float | None:
+        """Get gauge value (None if never set)."""
+        return self.values.get(labels)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self.values.items():
+            yield f"{self.name}{self._label_text(labels)} {_format_value(value)}"
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        return [
+            {"labels": dict(zip(self.labelnames, labels, strict=True)), "value": value}
+            for labels, value in self.values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Cumulative-bucket histogram per label set."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize histogram.
+
+        Args:
+            name: Metric name
+            help_text: HELP line text
+            labelnames: Label names
+            buckets: Increasing bucket upper bounds (+Inf is added)
+
+        Raises:
+            ValueError: For invalid names or unsorted buckets
+        """
+        super().__init__(name, help_text, labelnames)
+        bounds = [float(b) for b in buckets if b != math.inf]
+        if not bounds or bounds != sorted(set(bounds)):
+            raise ValueError("Buckets must be non-empty and strictly increasing")
+        self.buckets = (*bounds, math.inf)
+        # labels -> [per-bucket counts..., sum]
+        self.values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        """
+        Record observation.
+
+        Args:
+            labels: Label values in labelnames order
+            value: Observed value (e.g. seconds)
+        """
+        state = self.values.get(labels)
+        if state is None:
+            self._check(labels)
+            state = self.values[labels] = [0.0] * (len(self.buckets) + 1)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                state[index] += 1
+                break
+        state[-1] += value
+
+    def count(self, labels: tuple[str, ...] = ()) -> int:
+        """Get number of observations."""
+        state = self.values.get(labels)
+        return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> Iterable[str]:
+        for labels, state in self.values.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, state, strict=False):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield (
+                    f"{self.name}_bucket{self._label_text(labels, le)} "
+                    f"{_format_value(cumulative)}"
+                )
+            label_text = self._label_text(labels)
+            yield f"{self.name}_sum{label_text} {_format_value(state[-1])}"
+            yield f"{self.name}_count{label_text} {_format_value(cumulative)}"
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        result = []
+        for labels, state in self.values.items():
+            cumulative = 0.0
+            buckets = {}
+            for bound, count in zip(self.buckets, state, strict=False):
+                cumulative += count
+                buckets[_format_value(bound)] = int(cumulative)
+            result.append(
+                {
+                    "labels": dict(zip(self.labelnames, labels, strict=True)),
+                    "buckets": buckets,
+                    "count": int(cumulative),
+                    "sum": state[-1],
+                }
+            )
+        return result
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add metric to registry.
+
+        Raises:
+            ValueError: If metric with same name is registered
+        """
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, help_text: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Create and register counter."""
+        metric = Counter(name, help_text, labelnames)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        """Create and register gauge."""
+        metric = Gauge(name, help_text, labelnames)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register histogram."""
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Get current values of all metrics.
+
+        Returns:
+            Metric name -> {"type", "help", "samples"}
+        """
+        return {
+            name: {
+                "type": metric.type_name,
+                "help": metric.help_text,
+                "samples": metric.snapshot(),
+            }
+            for name, metric in self.metrics.items()
+        }
+
+    def render_prometheus(self) -> str:
+        """Render all metrics in Prometheus text exposition format (0.0.4)."""
+        lines: list[str] = []
+        for metric in self.metrics.values():
+            help_text = metric.help_text.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {metric.name} {help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def write_prometheus(self, path: str | Path) -> None:
+        """
+        Write exposition text to file atomically (for textfile collectors).
+
+        Args:
+            path: Target file path
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render_prometheus())
+            Path(tmp_path).replace(target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+@lru_cache(maxsize=1024)
+def endpoint_template(path: str) -> str:
+    """
+    Get low-cardinality endpoint label for request path.
+
+    Query string is dropped and path segments containing digits (INNs,
+    receipt UUIDs, ids) are replaced with "{id}", e.g.
+    "/receipt/500100732259/20abc/json" -> "/receipt/{id}/{id}/json".
+    """
+    path = path.split("?", 1)[0]
+    return "/".join(
+        "{id}" if any(c.isdigit() for c in segment) else segment
+        for segment in path.split("/")
+    )
+
+
+class HTTPMetrics:
+    """
+    Request metrics recorded by AsyncHTTPClient.
+
+    Metrics (labels):
+    - nalogo_http_requests_total (method, endpoint, status)
+    - nalogo_http_request_duration_seconds (method, endpoint)
+    - nalogo_http_errors_total (method, endpoint, exception)
+    - nalogo_http_token_refresh_total (result)
+    - nalogo_http_adaptive_timeout_seconds (method, endpoint), only with
+      adaptive timeouts enabled
+    - nalogo_http_hedges_total (method, endpoint, result), only with
+      hedging enabled; result is sent, won, denied (budget exhausted) or
+      busy (no free scheduler slot)
+    - nalogo_http_queue_wait_seconds (priority), only with a scheduler
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry | None = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Initialize HTTP metrics.
+
+        Args:
+            registry: Registry to add metrics to (default: new registry)
+            buckets: Latency histogram buckets in seconds
+        """
+        self.registry = registry or MetricsRegistry()
+        self.requests = self.registry.counter(
+            "nalogo_http_requests_total",
+            "HTTP requests by response status",
+            ("method", "endpoint", "status"),
+        )
+        self.duration = self.registry.histogram(
+            "nalogo_http_request_duration_seconds",
+            "HTTP request duration including auth refresh retry",
+            ("method", "endpoint"),
+            buckets,
+        )
+        self.errors = self.registry.counter(
+            "nalogo_http_errors_total",
+            "Failed HTTP requests by exception class",
+            ("method", "endpoint", "exception"),
+        )
+        self.token_refreshes = self.registry.counter(
+            "nalogo_http_token_refresh_total",
+            "Access token refreshes after 401 responses",
+            ("result",),
+        )
+        self.adaptive_timeout = self.registry.gauge(
+            "nalogo_http_adaptive_timeout_seconds",
+            "Current adaptive request timeout",
+            ("method", "endpoint"),
+        )
+        self.hedges = self.registry.counter(
+            "nalogo_http_hedges_total",
+            "Hedged request attempts by result",
+            ("method", "endpoint", "result"),
+        )
+        self.queue_wait = self.registry.histogram(
+            "nalogo_http_queue_wait_seconds",
+            "Time requests waited for a scheduler slot",
+            ("priority",),
+            buckets,
+        )
+
+    def request_finished(
+        self,
+        method: str,
+        path: str,
+        status: int | None,
+        seconds: float,
+        error: BaseException | None = None,
+    ) -> None:
+        """
+        Record finished request.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to API base URL
+            status: Final response status (None if no response)
+            seconds: Duration
+            error: Exception raised to caller, if any
+        """
+        endpoint = endpoint_template(path)
+        self.duration.observe((method, endpoint), seconds)
+        if status is not None:
+            self.requests.inc((method, endpoint, str(status)))
+        if error is not None:
+            self.errors.inc((method, endpoint, type(error).__name__))
+
+    def token_refreshed(self, success: bool) -> None:
+        """Record token refresh attempt."""
+        self.token_refreshes.inc(("success" if success else "failure",))
+
+    def adaptive_timeout_set(self, method: str, endpoint: str, seconds: float) -> None:
+        """Record timeout chosen by AdaptiveTimeouts for endpoint template."""
+        self.adaptive_timeout.set((method, endpoint), seconds)
+
+    def hedge(self, method: str, path: str, result: str) -> None:
+        """Record hedging event (sent, won, denied or busy)."""
+        self.hedges.inc((method, endpoint_template(path), result))
+
+    def queue_waited(self, priority: str, seconds: float) -> None:
+        """Record time request waited in scheduler queue."""
+        self.queue_wait.observe((priority,), seconds)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Get current values of all metrics."""
+        return self.registry.snapshot()
+
+    def render_prometheus(self) -> str:
+        """Render metrics in Prometheus text exposition format."""
+        return self.registry.render_prometheus()
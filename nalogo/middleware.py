@@ -0,0 +1,465 @@
+"""
+Middleware chain of AsyncHTTPClient.
+
+Each request passes through an ordered list of middlewares (outermost
+first) before reaching the transport. A middleware gets the request
+context and a call_next coroutine; the default Middleware.handle() maps
+this onto three optional hooks:
+
+- before_request(ctx): adjust ctx.request, or return a response to
+  short-circuit (inner middlewares and the network are skipped)
+- after_response(ctx, response): inspect or replace the response
+- on_error(ctx, error): return a response to recover, or None to re-raise
+
+Override handle() directly for control flow such as retries.
+
+Default chain (outermost first): TracingMiddleware and MetricsMiddleware
+when enabled, DeadlineMiddleware, SchedulerMiddleware when a scheduler is
+set, user middlewares, ErrorStatusMiddleware,
+TokenRefreshMiddleware, AuthMiddleware, then HedgingMiddleware and
+AdaptiveTimeoutMiddleware when hedging and adaptive timeouts are enabled.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from .exceptions import DeadlineExceededException, raise_for_status
+from .hedging import HedgePolicy
+from .metrics import HTTPMetrics, endpoint_template
+from .scheduler import RequestScheduler, current_priority
+from .timeouts import AdaptiveTimeouts, current_deadline, deadline, remaining
+from .tracing import HTTPPhaseTrace, Tracer
+
+if TYPE_CHECKING:
+    from ._http import AsyncHTTPClient, AuthProvider
+
+# Seconds of budget left below which a timeout counts as the deadline
+_DEADLINE_SLACK = 0.001
+
+
+@dataclass(slots=True)
+class RequestContext:
+    """State of one request passing through the middleware chain."""
+
+    method: str
+    path: str
+    request: httpx.Request
+    client: "AsyncHTTPClient"
+    # Free-form storage for middlewares
+    state: dict[str, Any] = field(default_factory=dict)
+
+
+Handler = Callable[[RequestContext], Awaitable[httpx.Response]]
+
+
+class Middleware:
+    """Base middleware with no-op hooks."""
+
+    async def before_request(self, ctx: RequestContext) -> httpx.Response | None:
+        """Run before inner chain; return response to short-circuit."""
+
+    async def after_response(
+        self, ctx: RequestContext, response: httpx.Response  # noqa: ARG002
+    ) -> httpx.Response:
+        """Run after inner chain returned response; return final response."""
+        return response
+
+    async def on_error(
+        self, ctx: RequestContext, error: Exception
+    ) -> httpx.Response | None:
+        """Run if inner chain raised; return response to recover."""
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        """
+        Process request.
+
+        Args:
+            ctx: Request context
+            call_next: Rest of the chain
+
+        Returns:
+            Response
+        """
+        response = await self.before_request(ctx)
+        if response is not None:
+            return response
+        try:
+            response = await call_next(ctx)
+        except Exception as e:
+            recovered = await self.on_error(ctx, e)
+            if recovered is None:
+                raise
+            return recovered
+        return await self.after_response(ctx, response)
+
+
+def build_chain(middlewares: list[Middleware], endpoint: Handler) -> Handler:
+    """
+    Compose middlewares (outermost first) around endpoint.
+
+    Args:
+        middlewares: Ordered middlewares
+        endpoint: Innermost handler sending the request
+
+    Returns:
+        Handler running the whole chain
+    """
+    handler = endpoint
+    for middleware in reversed(middlewares):
+
+        def bind(middleware: Middleware, call_next: Handler) -> Handler:
+            async def run(ctx: RequestContext) -> httpx.Response:
+                return await middleware.handle(ctx, call_next)
+
+            return run
+
+        handler = bind(middleware, handler)
+    return handler
+
+
+class AuthMiddleware(Middleware):
+    """
+    Add Bearer authorization header from current token.
+
+    An Authorization header passed by the caller to request() is kept, as
+    caller headers always took precedence; TokenRefreshMiddleware drops
+    that precedence when it retries with a refreshed token.
+    """
+
+    def __init__(self, auth_provider: "AuthProvider"):
+        self.auth_provider = auth_provider
+
+    async def before_request(self, ctx: RequestContext) -> httpx.Response | None:
+        if ctx.state.get("caller_authorization"):
+            return None
+        token_data = await self.auth_provider.get_token()
+        if token_data and "token" in token_data:
+            ctx.request.headers["Authorization"] = f"Bearer {token_data['token']}"
+        return None
+
+
+class TokenRefreshMiddleware(Middleware):
+    """
+    Refresh token on 401 response and retry request once.
+
+    Based on PHP's AuthenticationPlugin behavior. Uses asyncio.Lock to
+    prevent concurrent refresh attempts. Must be outside AuthMiddleware,
+    which sets the new token on retry.
+    """
+
+    def __init__(
+        self,
+        auth_provider: "AuthProvider",
+        metrics: HTTPMetrics | None = None,
+        tracer: Tracer | None = None,
+    ):
+        self.auth_provider = auth_provider
+        self.metrics = metrics
+        self.tracer = tracer
+        self.lock = asyncio.Lock()
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        response = await call_next(ctx)
+        if response.status_code != httpx.codes.UNAUTHORIZED:
+            return response
+        if not await self._refresh():
+            return response
+        # Retry request with new token, also replacing a caller's header
+        ctx.state.pop("caller_authorization", None)
+        return await call_next(ctx)
+
+    async def _refresh(self) -> bool:
+        async with self.lock:
+            token_data = await self.auth_provider.get_token()
+            if not token_data or "refreshToken" not in token_data:
+                return False
+
+            if self.tracer is not None and self.tracer.enabled:
+                with self.tracer.span("auth.refresh"):
+                    new_token_data = await self.auth_provider.refresh(
+                        token_data["refreshToken"]
+                    )
+            else:
+                new_token_data = await self.auth_provider.refresh(
+                    token_data["refreshToken"]
+                )
+            refreshed = new_token_data is not None and "token" in new_token_data
+            if self.metrics is not None:
+                self.metrics.token_refreshed(refreshed)
+            return refreshed
+
+
+class ErrorStatusMiddleware(Middleware):
+    """Raise domain exceptions for error responses (raise_for_status)."""
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        response = await call_next(ctx)
+        raise_for_status(response)
+        return response
+
+
+class DeadlineMiddleware(Middleware):
+    """
+    Enforce call deadline over the rest of the chain.
+
+    The whole inner chain (request, token refresh, retry) runs under one
+    asyncio timeout for the remaining budget of nalogo.timeouts.deadline();
+    default_budget applies only to requests made without a deadline, so an
+    explicit deadline may be longer than the default.
+    """
+
+    def __init__(self, default_budget: float | None = None):
+        self.default_budget = default_budget
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        default = self.default_budget if current_deadline() is None else None
+        with deadline(default):
+            budget = remaining()
+            if budget is None:
+                return await call_next(ctx)
+            if budget <= 0:
+                raise DeadlineExceededException(
+                    f"Deadline exceeded before {ctx.method} {ctx.path}", budget
+                )
+            try:
+                async with asyncio.timeout(budget) as timeout:
+                    return await call_next(ctx)
+            except TimeoutError as e:
+                if isinstance(e, DeadlineExceededException) or not timeout.expired():
+                    raise
+                raise DeadlineExceededException(
+                    f"Deadline exceeded during {ctx.method} {ctx.path}", budget
+                ) from e
+            except httpx.TimeoutException as e:
+                # Phase timeouts are clamped to the budget, so running out of
+                # budget usually surfaces as an httpx timeout first
+                left = remaining()
+                if left is None or left > _DEADLINE_SLACK:
+                    raise
+                raise DeadlineExceededException(
+                    f"Deadline exceeded during {ctx.method} {ctx.path}", budget
+                ) from e
+
+
+class SchedulerMiddleware(Middleware):
+    """
+    Hold a RequestScheduler slot for the rest of the chain.
+
+    The slot covers token refresh and retry; waiting for it counts against
+    the call deadline and is recorded as a "queue" span when the client
+    has a tracer.
+    """
+
+    def __init__(self, scheduler: RequestScheduler):
+        self.scheduler = scheduler
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        tracer = ctx.client.tracer
+        if tracer.enabled:
+            name = current_priority() or self.scheduler.default
+            with tracer.span("queue", {"priority": name}):
+                await self.scheduler.acquire()
+        else:
+            await self.scheduler.acquire()
+        try:
+            return await call_next(ctx)
+        finally:
+            self.scheduler.release()
+
+
+class HedgingMiddleware(Middleware):
+    """
+    Send a second identical request when the first one is slow.
+
+    The hedge goes out after the endpoint's latency percentile (see
+    HedgePolicy); the first successful response wins and the other
+    attempt is cancelled. Must be inside AuthMiddleware so both attempts
+    carry the same token.
+
+    With a RequestScheduler the hedge holds a slot of its own, taken only
+    if one is free at once: a hedge never waits in the queue and never
+    exceeds the scheduler concurrency.
+    """
+
+    def __init__(self, policy: HedgePolicy, metrics: HTTPMetrics | None = None):
+        self.policy = policy
+        self.metrics = metrics
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        policy = self.policy
+        if not policy.eligible(ctx.method, ctx.path):
+            return await call_next(ctx)
+        delay = policy.delay_for(ctx.method, ctx.path)
+        if delay is None:
+            return await self._attempt(ctx, call_next)
+
+        primary = asyncio.create_task(self._attempt(ctx, call_next))
+        attempts = [primary]
+        try:
+            done, _ = await asyncio.wait(attempts, timeout=delay)
+            if done:
+                return await primary
+            scheduler = ctx.client.scheduler
+            if not self._reserve(ctx, scheduler):
+                return await primary
+            hedge = asyncio.create_task(self._hedge(ctx, call_next, scheduler))
+            attempts.append(hedge)
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for attempt in done:
+                    if attempt.exception() is None:
+                        if attempt is hedge:
+                            policy.hedge_wins += 1
+                            self._record(ctx, "won")
+                        return attempt.result()
+            # Both attempts failed
+            return primary.result()
+        finally:
+            losers = [attempt for attempt in attempts if not attempt.done()]
+            for attempt in losers:
+                attempt.cancel()
+            if losers:
+                await asyncio.gather(*losers, return_exceptions=True)
+
+    def _reserve(self, ctx: RequestContext, scheduler: RequestScheduler | None) -> bool:
+        """Take scheduler slot and budget token for a hedge, if both are free."""
+        if scheduler is not None and not scheduler.try_acquire():
+            self.policy.busy += 1
+            self._record(ctx, "busy")
+            return False
+        if not self.policy.acquire():
+            if scheduler is not None:
+                scheduler.release()
+            self._record(ctx, "denied")
+            return False
+        self._record(ctx, "sent")
+        return True
+
+    async def _hedge(
+        self,
+        ctx: RequestContext,
+        call_next: Handler,
+        scheduler: RequestScheduler | None,
+    ) -> httpx.Response:
+        """Send hedge attempt, releasing its scheduler slot when done."""
+        try:
+            return await self._attempt(self._clone(ctx), call_next)
+        finally:
+            if scheduler is not None:
+                scheduler.release()
+
+    async def _attempt(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        started = time.perf_counter()
+        response = await call_next(ctx)
+        self.policy.latencies.observe(
+            ctx.method, ctx.path, time.perf_counter() - started
+        )
+        return response
+
+    def _clone(self, ctx: RequestContext) -> RequestContext:
+        request = ctx.request
+        extensions = dict(request.extensions)
+        if "trace" in extensions:
+            # Phase spans of concurrent attempts must not share state
+            extensions["trace"] = HTTPPhaseTrace(ctx.client.tracer)
+        clone = httpx.Request(
+            request.method,
+            request.url,
+            headers=request.headers,
+            content=request.content,
+            extensions=extensions,
+        )
+        return RequestContext(ctx.method, ctx.path, clone, ctx.client, dict(ctx.state))
+
+    def _record(self, ctx: RequestContext, result: str) -> None:
+        if self.metrics is not None:
+            self.metrics.hedge(ctx.method, ctx.path, result)
+
+
+class AdaptiveTimeoutMiddleware(Middleware):
+    """
+    Set request timeout from AdaptiveTimeouts and record latency.
+
+    Innermost middleware: every attempt (including the retry after token
+    refresh) gets its own timeout and latency sample.
+    """
+
+    def __init__(self, timeouts: AdaptiveTimeouts, metrics: HTTPMetrics | None = None):
+        self.timeouts = timeouts
+        self.metrics = metrics
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        seconds = self.timeouts.seconds_for(ctx.method, ctx.path)
+        ctx.request.extensions["timeout"] = self.timeouts.timeout_for(
+            ctx.method, ctx.path
+        ).as_dict()
+        if self.metrics is not None:
+            self.metrics.adaptive_timeout_set(
+                ctx.method, endpoint_template(ctx.path), seconds
+            )
+        started = time.perf_counter()
+        try:
+            response = await call_next(ctx)
+        except httpx.TimeoutException:
+            self.timeouts.observe(ctx.method, ctx.path, seconds)
+            raise
+        self.timeouts.observe(ctx.method, ctx.path, time.perf_counter() - started)
+        return response
+
+
+class MetricsMiddleware(Middleware):
+    """Record request metrics into HTTPMetrics."""
+
+    def __init__(self, metrics: HTTPMetrics):
+        self.metrics = metrics
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        started = time.perf_counter()
+        try:
+            response = await call_next(ctx)
+        except Exception as e:
+            failed = getattr(e, "response", None)
+            self.metrics.request_finished(
+                ctx.method,
+                ctx.path,
+                failed.status_code if isinstance(failed, httpx.Response) else None,
+                time.perf_counter() - started,
+                e,
+            )
+            raise
+        self.metrics.request_finished(
+            ctx.method, ctx.path, response.status_code, time.perf_counter() - started
+        )
+        return response
+
+
+class TracingMiddleware(Middleware):
+    """Wrap request in http.request span with httpx phase child spans."""
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+
+    async def handle(self, ctx: RequestContext, call_next: Handler) -> httpx.Response:
+        ctx.request.extensions["trace"] = HTTPPhaseTrace(self.tracer)
+        with self.tracer.span(
+            "http.request",
+            {"http.method": ctx.method, "http.route": endpoint_template(ctx.path)},
+        ) as span:
+            try:
+                response = await call_next(ctx)
+            except Exception as e:
+                failed = getattr(e, "response", None)
+                if isinstance(failed, httpx.Response):
+                    span.set_attribute("http.status_code", failed.status_code)
+                raise
+            span.set_attribute("http.status_code", response.status_code)
+            return response
@@ -0,0 +1,388 @@
+"""
+Local SQLite mirror of registered incomes.
+Keeps a copy of an account's receipts synced incrementally from
+IncomeAPI listing, so read queries don't touch the API.
+
+Receipt totals are stored as integer kopecks via money.to_kopecks(),
+rounding sub-kopeck amounts half up.
+"""
+
+import json
+import sqlite3
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+from .income import (
+    STATUS_CANCELLED,
+    STATUS_REGISTERED,
+    IncomeAPI,
+    IncomeListener,
+    income_record_from_cancel,
+    income_record_from_request,
+    income_status,
+    parse_operation_time,
+)
+from .money import kopecks_to_decimal, to_kopecks
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS incomes (
+    uuid TEXT PRIMARY KEY,
+    operation_ts REAL NOT NULL,
+    client_inn TEXT,
+    status TEXT NOT NULL,
+    income_type TEXT,
+    total_kopecks INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_incomes_operation_ts ON incomes (operation_ts);
+CREATE INDEX IF NOT EXISTS idx_incomes_client_inn ON incomes (client_inn);
+CREATE INDEX IF NOT EXISTS idx_incomes_status ON incomes (status, operation_ts);
+CREATE TABLE IF NOT EXISTS mirror_state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class MirrorSyncResult:
+    """Outcome of IncomeMirror.sync()."""
+
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    cancelled: int = 0
+    watermark: datetime | None = None
+
+
+class IncomeMirror(IncomeListener):
+    """
+    Local SQLite copy of an account's receipts.
+
+    Receipts are indexed by operation time, UUID, client INN and status.
+    sync() pulls listing records from the stored watermark minus
+    cancellation_lookback, so cancellations of recent receipts made since
+    the last sync are applied too. Registered as income listener on a
+    Client, it also records create/cancel results immediately; results
+    arriving while sync() runs are applied after its transaction ends, so
+    they neither commit nor get rolled back with a partial sync.
+
+    Example:
+        >>> mirror = IncomeMirror("incomes.sqlite3")
+        >>> client.add_income_listener(mirror)
+        >>> await mirror.sync(client.income())
+        >>> mirror.query(status="REGISTERED", client_inn="7707083893")
+    """
+
+    def __init__(
+        self,
+        path: str | Path = ":memory:",
+        cancellation_lookback: timedelta = timedelta(days=31),
+        page_size: int = 100,
+    ):
+        """
+        Open (or create) mirror database.
+
+        Args:
+            path: SQLite database path (default: in-memory database)
+            cancellation_lookback: How far behind the watermark sync re-reads
+                receipts to pick up cancellations
+            page_size: Listing page size used by sync()
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.cancellation_lookback = cancellation_lookback
+        self.page_size = page_size
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+        self._syncing = False
+        # Listener writes deferred while sync() holds its transaction open
+        self._pending: list[Callable[[], None]] = []
+
+    def close(self) -> None:
+        """Close database connection."""
+        self._db.close()
+
+    def __enter__(self) -> "IncomeMirror":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def watermark(self) -> datetime | None:
+        """Latest operation time received from the service listing."""
+        row = self._db.execute(
+            "SELECT value FROM mirror_state WHERE key = 'watermark'"
+        ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def _set_watermark(self, value: datetime) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO mirror_state (key, value) VALUES ('watermark', ?)",
+            (value.astimezone(UTC).isoformat(),),
+        )
+
+    def upsert(self, record: dict[str, Any]) -> tuple[bool, str | None]:
+        """
+        Insert or replace income record.
+
+        Args:
+            record: Income record in listing format (approvedReceiptUuid, ...)
+
+        Returns:
+            Tuple of (inserted, previous status)
+
+        Raises:
+            ValueError: If record has no approvedReceiptUuid
+        """
+        uuid = record.get("approvedReceiptUuid")
+        if not uuid:
+            raise ValueError("Income record has no approvedReceiptUuid")
+
+        previous = self._db.execute(
+            "SELECT status FROM incomes WHERE uuid = ?", (uuid,)
+        ).fetchone()
+        self._db.execute(
+            "INSERT OR REPLACE INTO incomes "
+            "(uuid, operation_ts, client_inn, status, income_type, total_kopecks, payload) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                uuid,
+                parse_operation_time(record.get("operationTime")).timestamp(),
+                record.get("clientInn"),
+                income_status(record),
+                record.get("incomeType"),
+                to_kopecks(record.get("totalAmount", 0)),
+                json.dumps(record, ensure_ascii=False),
+            ),
+        )
+        return previous is None, previous[0] if previous else None
+
+    async def sync(
+        self, income_api: IncomeAPI, now: datetime | None = None
+    ) -> MirrorSyncResult:
+        """
+        Incrementally sync mirror from the income listing.
+
+        First sync downloads whole history; subsequent syncs start from
+        watermark - cancellation_lookback. Changes are committed in one
+        transaction after the listing is fully read.
+
+        Args:
+            income_api: IncomeAPI used for listing
+            now: Upper bound of operation time (default: current UTC time)
+
+        Returns:
+            MirrorSyncResult with counters and new watermark
+
+        Raises:
+            DomainException: For API errors (mirror is left unchanged)
+        """
+        result = MirrorSyncResult(watermark=self.watermark)
+        from_ = (
+            result.watermark - self.cancellation_lookback if result.watermark else None
+        )
+
+        self._syncing = True
+        try:
+            async for record in income_api.iter_incomes(
+                from_=from_,
+                to=now or datetime.now(UTC),
+                page_size=self.page_size,
+                sort_by="operation_time:asc",
+            ):
+                result.fetched += 1
+                inserted, previous = self.upsert(record)
+                status = income_status(record)
+                if inserted:
+                    result.inserted += 1
+                elif previous != status:
+                    result.updated += 1
+                if status == STATUS_CANCELLED and previous == STATUS_REGISTERED:
+                    result.cancelled += 1
+
+                operation_time = parse_operation_time(record.get("operationTime"))
+                if result.watermark is None or operation_time > result.watermark:
+                    result.watermark = operation_time
+
+            if result.watermark is not None:
+                self._set_watermark(result.watermark)
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        finally:
+            self._syncing = False
+            self._apply_pending()
+
+        return result
+
+    def _apply_pending(self) -> None:
+        """Apply listener writes deferred during sync() in one transaction."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        for apply in pending:
+            apply()
+        self._db.commit()
+
+    def _write(self, apply: Callable[[], None]) -> None:
+        """Run listener write now, or after the running sync() ends."""
+        if self._syncing:
+            self._pending.append(apply)
+            return
+        apply()
+        self._db.commit()
+
+    async def income_created(
+        self, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Record receipt created through IncomeAPI."""
+        record = income_record_from_request(request, response)
+        if record is None:
+            return
+        self._write(lambda: self._record_created(record))
+
+    def _record_created(self, record: dict[str, Any]) -> None:
+        self.upsert(record)
+
+    async def income_cancelled(
+        self, request: dict[str, Any], response: dict[str, Any]
+    ) -> None:
+        """Apply cancellation made through IncomeAPI."""
+        record = income_record_from_cancel(request, response)
+        self._write(lambda: self._record_cancelled(record))
+
+    def _record_cancelled(self, record: dict[str, Any]) -> None:
+        if "operationTime" not in record:
+            # Minimal record: merge with mirrored copy
+            existing = self.get(record["approvedReceiptUuid"] or "")
+            if existing is None:
+                return
+            record = {**existing, "cancellationInfo": record["cancellationInfo"]}
+        self.upsert(record)
+
+    def get(self, receipt_uuid: str) -> dict[str, Any] | None:
+        """
+        Get mirrored income record by receipt UUID.
+
+        Args:
+            receipt_uuid: Receipt UUID
+
+        Returns:
+            Income record or None if not mirrored
+        """
+        row = self._db.execute(
+            "SELECT payload FROM incomes WHERE uuid = ?", (receipt_uuid,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _where(
+        self,
+        from_: datetime | None,
+        to: datetime | None,
+        client_inn: str | None,
+        status: str | None,
+    ) -> tuple[str, list[Any]]:
+        clauses: list[str] = []
+        params: list[Any] = []
+        if from_ is not None:
+            clauses.append("operation_ts >= ?")
+            params.append(_timestamp(from_))
+        if to is not None:
+            clauses.append("operation_ts <= ?")
+            params.append(_timestamp(to))
+        if client_inn is not None:
+            clauses.append("client_inn = ?")
+            params.append(client_inn)
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        client_inn: str | None = None,
+        status: str | None = None,
+        limit: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Query mirrored income records ordered by operation time.
+
+        Args:
+            from_: Start of operation time range (inclusive)
+            to: End of operation time range (inclusive)
+            client_inn: Filter by client INN
+            status: Filter by status ("REGISTERED" or "CANCELLED")
+            limit: Max number of records
+
+        Returns:
+            List of income records
+        """
+        where, params = self._where(from_, to, client_inn, status)
+        sql = f"SELECT payload FROM incomes{where} ORDER BY operation_ts"  # nosec B608
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [json.loads(row[0]) for row in self._db.execute(sql, params)]
+
+    def rows(
+        self,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        client_inn: str | None = None,
+        status: str | None = None,
+    ) -> Iterator[tuple[float, str | None, str, str | None, int]]:
+        """
+        Iterate indexed columns without decoding JSON payloads.
+
+        Yields:
+            Tuples of (operation timestamp, client INN, status, income type,
+            total kopecks) ordered by operation time
+        """
+        where, params = self._where(from_, to, client_inn, status)
+        yield from self._db.execute(
+            "SELECT operation_ts, client_inn, status, income_type, total_kopecks "
+            f"FROM incomes{where} ORDER BY operation_ts",  # nosec B608
+            params,
+        )
+
+    def total_amount(
+        self,
+        from_: datetime | None = None,
+        to: datetime | None = None,
+        client_inn: str | None = None,
+        status: str | None = STATUS_REGISTERED,
+    ) -> Decimal:
+        """
+        Sum of receipt totals matching filters (registered only by default).
+
+        Returns:
+            Total amount in rubles
+        """
+        where, params = self._where(from_, to, client_inn, status)
+        row = self._db.execute(
+            f"SELECT COALESCE(SUM(total_kopecks), 0) FROM incomes{where}",  # nosec B608
+            params,
+        ).fetchone()
+        return kopecks_to_decimal(row[0])
+
+    def __len__(self) -> int:
+        row = self._db.execute("SELECT COUNT(*) FROM incomes").fetchone()
+        return int(row[0])
+
+
+def _timestamp(dt: datetime) -> float:
+    """Get POSIX timestamp (naive values are UTC)."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.timestamp()
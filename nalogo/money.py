@@ -0,0 +1,229 @@
+"""
+Fixed-point money amounts in integer kopecks.
+
+Receipt totals are summed as integers and formatted canonically for the
+wire as "N.KK" (e.g. "100.00", "-0.50"), never in exponent notation.
+Conversion from Decimal/str/float rounds half up to whole kopecks.
+"""
+
+from collections.abc import Iterable
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+_KOPECK_DIGITS = 2
+# int(Decimal) builds the full integer, so huge exponents take the slow path
+_EXACT_INT_MAX_DIGITS = 25
+
+
+def _round_div(numerator: int, denominator: int) -> int:
+    """Integer division rounded half away from zero (denominator > 0)."""
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if remainder * 2 >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+class Money:
+    """
+    Exact money amount backed by integer kopecks.
+
+    Supports addition, subtraction, multiplication by quantity (int,
+    Decimal, str or float, rounded half up to kopecks), comparison and
+    builtin sum().
+
+    Example:
+        >>> total = Money.sum(Money.of("100.50") * 2 for _ in range(3))
+        >>> str(total)
+        '603.00'
+    """
+
+    __slots__ = ("kopecks",)
+
+    kopecks: int
+
+    def __init__(self, kopecks: int = 0):
+        """
+        Initialize amount.
+
+        Args:
+            kopecks: Amount in kopecks
+        """
+        self.kopecks = kopecks
+
+    @classmethod
+    def of(cls, value: "Money | Decimal | str | int | float") -> "Money":
+        """
+        Convert rubles to Money.
+
+        Args:
+            value: Amount in rubles (int values are whole rubles)
+
+        Returns:
+            Money rounded half up to kopecks
+
+        Raises:
+            ValueError: For non-numeric or non-finite values
+        """
+        if isinstance(value, Money):
+            return value
+        if isinstance(value, int) and not isinstance(value, bool):
+            return cls(value * 100)
+        if isinstance(value, (str, float)):
+            kopecks = _parse_kopecks(str(value))
+            if kopecks is not None:
+                return cls(kopecks)
+        return cls(_decimal_to_kopecks(_to_decimal(value)))
+
+    @classmethod
+    def sum(cls, amounts: Iterable["Money"]) -> "Money":
+        """Sum amounts as integers."""
+        return cls(sum(amount.kopecks for amount in amounts))
+
+    def to_decimal(self) -> Decimal:
+        """Amount in rubles with two decimal places."""
+        return Decimal(self.kopecks).scaleb(-2)
+
+    def __str__(self) -> str:
+        rubles, kopecks = divmod(abs(self.kopecks), 100)
+        sign = "-" if self.kopecks < 0 else ""
+        return f"{sign}{rubles}.{kopecks:02d}"
+
+    def __repr__(self) -> str:
+        return f"Money('{self}')"
+
+    def __add__(self, other: Any) -> "Money":
+        if isinstance(other, Money):
+            return Money(self.kopecks + other.kopecks)
+        return NotImplemented
+
+    def __radd__(self, other: Any) -> "Money":
+        # Allows builtin sum() with its int 0 start value
+        if other == 0 and not isinstance(other, Money):
+            return self
+        return self.__add__(other)
+
+    def __sub__(self, other: Any) -> "Money":
+        if isinstance(other, Money):
+            return Money(self.kopecks - other.kopecks)
+        return NotImplemented
+
+    def __neg__(self) -> "Money":
+        return Money(-self.kopecks)
+
+    def __mul__(self, quantity: Any) -> "Money":
+        if isinstance(quantity, int) and not isinstance(quantity, bool):
+            return Money(self.kopecks * quantity)
+        if isinstance(quantity, Money):
+            return NotImplemented
+        if isinstance(quantity, Decimal) and quantity.is_finite():
+            integer = _exact_int(quantity)
+            if integer is not None:
+                return Money(self.kopecks * integer)
+        try:
+            coefficient, exponent = _split(_to_decimal(quantity))
+        except ValueError:
+            return NotImplemented
+        return Money(_shift(self.kopecks * coefficient, exponent))
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Money):
+            return self.kopecks == other.kopecks
+        return NotImplemented
+
+    def __lt__(self, other: "Money") -> bool:
+        return self.kopecks < other.kopecks
+
+    def __le__(self, other: "Money") -> bool:
+        return self.kopecks <= other.kopecks
+
+    def __gt__(self, other: "Money") -> bool:
+        return self.kopecks > other.kopecks
+
+    def __ge__(self, other: "Money") -> bool:
+        return self.kopecks >= other.kopecks
+
+    def __hash__(self) -> int:
+        return hash(self.kopecks)
+
+    def __bool__(self) -> bool:
+        return self.kopecks != 0
+
+
+def _parse_kopecks(text: str) -> int | None:
+    """Parse plain "N", "N.K" or "N.KK" amount without Decimal (None otherwise)."""
+    whole, _, fraction = text.strip().partition(".")
+    digits = whole[1:] if whole[:1] == "-" else whole
+    if (
+        len(fraction) > _KOPECK_DIGITS
+        or not digits.isascii()
+        or not digits.isdigit()
+        or (fraction and not (fraction.isascii() and fraction.isdigit()))
+    ):
+        return None
+    kopecks = int(digits) * 100 + int(fraction.ljust(_KOPECK_DIGITS, "0") or 0)
+    return -kopecks if whole[:1] == "-" else kopecks
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """Convert Decimal/str/int/float to finite Decimal."""
+    try:
+        # str() of float gives shortest repr, so 0.1 becomes Decimal("0.1")
+        result = value if isinstance(value, Decimal) else Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid money amount: {value!r}") from None
+    if not result.is_finite():
+        raise ValueError(f"Invalid money amount: {value!r}")
+    return result
+
+
+def _split(value: Decimal) -> tuple[int, int]:
+    """Split finite Decimal into integer coefficient and exponent."""
+    sign, digits, exponent = value.as_tuple()
+    coefficient = int("".join(map(str, digits)))
+    return (-coefficient if sign else coefficient), int(exponent)
+
+
+def _shift(value: int, exponent: int) -> int:
+    """value * 10**exponent rounded half up to integer (exact, no precision limit)."""
+    factor: int = 10 ** abs(exponent)
+    if exponent >= 0:
+        return value * factor
+    return _round_div(value, factor)
+
+
+def _exact_int(value: Decimal) -> int | None:
+    """Integer value of Decimal if it has no fractional part (None otherwise)."""
+    if value.adjusted() < _EXACT_INT_MAX_DIGITS:
+        integer = int(value)
+        if integer == value:
+            return integer
+    return None
+
+
+def _decimal_to_kopecks(value: Decimal) -> int:
+    # Fast path for amounts with at most two decimal places
+    kopecks = _exact_int(value.scaleb(2))
+    if kopecks is not None:
+        return kopecks
+    coefficient, exponent = _split(value)
+    return _shift(coefficient, exponent + 2)
+
+
+def to_kopecks(value: Any) -> int:
+    """Convert JSON amount (number or numeric string) to integer kopecks (0 if invalid)."""
+    try:
+        return Money.of(value).kopecks
+    except (ValueError, TypeError):
+        return 0
+
+
+def kopecks_to_decimal(kopecks: int) -> Decimal:
+    """Convert integer kopecks to rubles with two decimal places."""
+    return Decimal(kopecks).scaleb(-2)
+
+
+def format_decimal(value: Decimal) -> str:
+    """Format Decimal in plain notation without exponent ("1E+2" -> "100")."""
+    return format(value, "f")
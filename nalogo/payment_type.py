@@ -3,9 +3,115 @@ PaymentType API implementation.
 Based on PHP library's Api\\PaymentType class.
 """
 
+import time
+from collections.abc import Callable
 from typing import Any
 
 from ._http import AsyncHTTPClient
+from .dto.lazy import LazyList
+from .dto.payment_type import (
+    PaymentType,
+    PaymentTypeCollection,
+    index_payment_types,
+)
+
+
+class PaymentTypeTable:
+    """
+    Cached /payment-type/table with hash indexes.
+
+    Shared between PaymentTypeAPI instances of one Client. Entries are
+    indexed by id, bank BIK and favorite flag for constant-time lookups.
+    Lookups return copies, so callers cannot change the cached table.
+    A refetch that returns identical content keeps the existing indexes
+    and typed collection; they are rebuilt only when the table changes.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize table cache.
+
+        Args:
+            ttl: Seconds a fetched table is served without refetching
+            clock: Monotonic clock (replaceable in tests)
+
+        Raises:
+            ValueError: For negative ttl
+        """
+        if ttl < 0:
+            raise ValueError("Cache ttl cannot be negative")
+        self.ttl = ttl
+        self.clock = clock
+        self.items: list[dict[str, Any]] = []
+        self.fetched_at: float | None = None
+        self.version = 0
+        self._by_id: dict[Any, dict[str, Any]] = {}
+        self._by_bik: dict[Any, list[dict[str, Any]]] = {}
+        self._favorite: dict[str, Any] | None = None
+        self._collection: PaymentTypeCollection | None = None
+
+    def is_fresh(self) -> bool:
+        """True if table was fetched less than ttl seconds ago."""
+        return self.fetched_at is not None and self.clock() - self.fetched_at < self.ttl
+
+    def update(self, items: list[dict[str, Any]]) -> bool:
+        """
+        Store freshly fetched table.
+
+        Args:
+            items: Payment type dictionaries from API
+
+        Returns:
+            True if content changed and indexes were rebuilt
+        """
+        self.fetched_at = self.clock()
+        if self.version and items == self.items:
+            return False
+
+        self.items = items
+        self._by_id, self._by_bik, self._favorite = index_payment_types(
+            items,
+            lambda item: item.get("id"),
+            lambda item: item.get("bankBik"),
+            lambda item: bool(item.get("favorite", False)),
+        )
+        self._collection = None
+        self.version += 1
+        return True
+
+    def invalidate(self) -> None:
+        """Force refetch on next access (indexes stay until content changes)."""
+        self.fetched_at = None
+
+    def table(self) -> list[dict[str, Any]]:
+        """Get copy of all entries."""
+        return [dict(item) for item in self.items]
+
+    def get(self, payment_type_id: int) -> dict[str, Any] | None:
+        """Get payment type by id."""
+        item = self._by_id.get(payment_type_id)
+        return dict(item) if item is not None else None
+
+    def by_bik(self, bank_bik: str) -> list[dict[str, Any]]:
+        """Get payment types of bank by BIK."""
+        return [dict(item) for item in self._by_bik.get(bank_bik, ())]
+
+    def favorite(self) -> dict[str, Any] | None:
+        """Get first payment type marked as favorite."""
+        return dict(self._favorite) if self._favorite is not None else None
+
+    def collection(self) -> PaymentTypeCollection:
+        """
+        Get table as validated PaymentTypeCollection (built once per version).
+
+        Raises:
+            pydantic.ValidationError: If an entry does not match PaymentType
+        """
+        if self._collection is None:
+            self._collection = PaymentTypeCollection(
+                payment_types=[PaymentType.model_validate(item) for item in self.items]
+            )
+        return self._collection
 
 
 class PaymentTypeAPI:
@@ -13,29 +119,104 @@ class PaymentTypeAPI:
     PaymentType API for managing payment methods.
 
     Provides async methods for:
-    - Getting payment types table
+    - Getting payment types table (raw, indexed or lazily typed)
     - Finding favorite payment type
+    - Looking up payment types by id and bank BIK
+
+    With a shared PaymentTypeTable (Client(payment_type_cache_ttl=...)) the
+    table is fetched at most once per ttl; otherwise every call fetches.
 
     Maps to PHP Api\\PaymentType functionality.
     """
 
-    def __init__(self, http_client: AsyncHTTPClient):
+    def __init__(
+        self, http_client: AsyncHTTPClient, cache: PaymentTypeTable | None = None
+    ):
         self.http = http_client
+        self.cache = cache
 
-    async def table(self) -> list[dict[str, Any]]:
+    async def _table(self, refresh: bool = False) -> PaymentTypeTable:
+        """Get indexed table, fetching it if not cached or stale."""
+        table = self.cache if self.cache is not None else PaymentTypeTable(ttl=0)
+        if refresh or not table.is_fresh():
+            response = await self.http.get("/payment-type/table")
+            table.update(self.http.json(response))
+        return table
+
+    async def table(self, refresh: bool = False) -> list[dict[str, Any]]:
         """
         Get all available payment types.
 
         Maps to PHP PaymentType::table().
 
+        Args:
+            refresh: Bypass cache and fetch from API
+
         Returns:
             List of payment type dictionaries with bank information
 
         Raises:
             DomainException: For API errors
         """
-        response = await self.http.get("/payment-type/table")
-        return response.json()  # type: ignore[no-any-return]
+        return (await self._table(refresh)).table()
+
+    async def collection(self, refresh: bool = False) -> PaymentTypeCollection:
+        """
+        Get payment types as indexed PaymentTypeCollection.
+
+        Args:
+            refresh: Bypass cache and fetch from API
+
+        Returns:
+            PaymentTypeCollection with id/BIK/favorite lookups
+
+        Raises:
+            DomainException: For API errors
+            pydantic.ValidationError: If an entry does not match PaymentType
+        """
+        return (await self._table(refresh)).collection()
+
+    async def table_typed(self) -> LazyList[PaymentType]:
+        """
+        Get all available payment types as lazily validated models.
+
+        Returns:
+            LazyList of PaymentType views
+
+        Raises:
+            DomainException: For API errors
+        """
+        return LazyList(PaymentType, await self.table())
+
+    async def get(self, payment_type_id: int) -> dict[str, Any] | None:
+        """
+        Get payment type by id.
+
+        Args:
+            payment_type_id: Payment type ID
+
+        Returns:
+            Payment type dictionary or None if not found
+
+        Raises:
+            DomainException: For API errors
+        """
+        return (await self._table()).get(payment_type_id)
+
+    async def by_bik(self, bank_bik: str) -> list[dict[str, Any]]:
+        """
+        Get payment types of bank by BIK.
+
+        Args:
+            bank_bik: Bank BIK
+
+        Returns:
+            List of payment type dictionaries (empty if none)
+
+        Raises:
+            DomainException: For API errors
+        """
+        return (await self._table()).by_bik(bank_bik)
 
     async def favorite(self) -> dict[str, Any] | None:
         """
@@ -50,11 +231,4 @@ class PaymentTypeAPI:
         Raises:
             DomainException: For API errors
         """
-        payment_types = await self.table()
-
-        # Find first payment type with favorite=True
-        for payment_type in payment_types:
-            if payment_type.get("favorite", False):
-                return payment_type
-
-        return None
+        return (await self._table()).favorite()
@@ -3,9 +3,66 @@ Receipt API implementation.
 Based on PHP library's Api\\Receipt class.
 """
 
+import copy
+from collections import OrderedDict
 from typing import Any
 
 from ._http import AsyncHTTPClient
+from .income import IncomeListener
+from .receipt_render import render_receipt
+from .tracing import traced
+
+
+class ReceiptCache(IncomeListener):
+    """
+    In-memory LRU cache of receipt JSON payloads keyed by receipt UUID.
+
+    Shared between ReceiptAPI instances of one Client, so repeat views
+    and local rendering don't hit the API again. Registered as income
+    listener, so receipts cancelled through the Client are invalidated.
+    Payloads are copied in and out, so callers may modify what they get.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        if max_size <= 0:
+            raise ValueError("Cache max_size must be greater than 0")
+        self.max_size = max_size
+        self._items: OrderedDict[str, dict[str, Any]] = OrderedDict()
+
+    def get(self, receipt_uuid: str) -> dict[str, Any] | None:
+        """Get copy of cached payload and mark it as recently used."""
+        data = self._items.get(receipt_uuid)
+        if data is None:
+            return None
+        self._items.move_to_end(receipt_uuid)
+        return copy.deepcopy(data)
+
+    def put(self, receipt_uuid: str, data: dict[str, Any]) -> None:
+        """Store copy of payload, evicting least recently used entries."""
+        self._items[receipt_uuid] = copy.deepcopy(data)
+        self._items.move_to_end(receipt_uuid)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate(self, receipt_uuid: str) -> None:
+        """Drop cached payload (e.g. after cancellation)."""
+        self._items.pop(receipt_uuid, None)
+
+    async def income_cancelled(
+        self, request: dict[str, Any], _response: dict[str, Any]
+    ) -> None:
+        """Invalidate cancelled receipt."""
+        self.invalidate(request.get("receiptUuid", ""))
+
+    def clear(self) -> None:
+        """Drop all cached payloads."""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, receipt_uuid: object) -> bool:
+        return receipt_uuid in self._items
 
 
 class ReceiptAPI:
@@ -15,14 +72,24 @@ class ReceiptAPI:
     Provides async methods for:
     - Getting receipt print URL
     - Getting receipt JSON data
+    - Rendering receipt locally from (cached) JSON data
 
     Maps to PHP Api\\Receipt functionality.
     """
 
-    def __init__(self, http_client: AsyncHTTPClient, base_endpoint: str, user_inn: str):
+    def __init__(
+        self,
+        http_client: AsyncHTTPClient,
+        base_endpoint: str,
+        user_inn: str,
+        cache: ReceiptCache | None = None,
+        user_display_name: str | None = None,
+    ):
         self.http = http_client
         self.base_endpoint = base_endpoint
         self.user_inn = user_inn
+        self.cache = cache
+        self.user_display_name = user_display_name
 
     def print_url(self, receipt_uuid: str) -> str:
         """
@@ -47,14 +114,17 @@ class ReceiptAPI:
         path = f"/receipt/{self.user_inn}/{receipt_uuid.strip()}/print"
         return f"{self.base_endpoint}{path}"
 
-    async def json(self, receipt_uuid: str) -> dict[str, Any]:
+    @traced("ReceiptAPI.json")
+    async def json(self, receipt_uuid: str, refresh: bool = False) -> dict[str, Any]:
         """
         Get receipt data in JSON format.
 
         Maps to PHP Receipt::json() method.
+        If receipt cache is enabled, payload is served from cache when present.
 
         Args:
             receipt_uuid: Receipt UUID
+            refresh: Bypass cache and fetch payload again
 
         Returns:
             Dictionary with receipt JSON data
@@ -66,8 +136,47 @@ class ReceiptAPI:
         if not receipt_uuid.strip():
             raise ValueError("Receipt UUID cannot be empty")
 
+        receipt_uuid = receipt_uuid.strip()
+        if self.cache is not None and not refresh:
+            cached = self.cache.get(receipt_uuid)
+            if cached is not None:
+                return cached
+
         # Make GET request like PHP: sprintf('/receipt/%s/%s/json', $this->profile->getInn(), $receiptUuid)
-        path = f"/receipt/{self.user_inn}/{receipt_uuid.strip()}/json"
+        path = f"/receipt/{self.user_inn}/{receipt_uuid}/json"
         response = await self.http.get(path)
+        data: dict[str, Any] = self.http.json(response)
+
+        if self.cache is not None:
+            self.cache.put(receipt_uuid, data)
+        return data
+
+    @traced("ReceiptAPI.render")
+    async def render(
+        self, receipt_uuid: str, fmt: str = "html", refresh: bool = False
+    ) -> str:
+        """
+        Render receipt locally instead of fetching print view.
 
-        return response.json()  # type: ignore[no-any-return]
+        Uses json() payload, so with receipt cache enabled repeat views
+        need no network at all.
+
+        Args:
+            receipt_uuid: Receipt UUID
+            fmt: Output format: "html" or "text"
+            refresh: Bypass cache and fetch payload again
+
+        Returns:
+            Rendered receipt
+
+        Raises:
+            ValueError: If receipt_uuid is empty or format is unknown
+            DomainException: For API errors
+        """
+        data = await self.json(receipt_uuid, refresh=refresh)
+        return render_receipt(
+            data,
+            fmt=fmt,
+            seller_name=self.user_display_name,
+            seller_inn=self.user_inn,
+        )
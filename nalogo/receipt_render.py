@@ -0,0 +1,302 @@
+"""
+Local receipt rendering.
+Produces HTML or plain-text receipts from ReceiptAPI.json() payload
+with the same fields as the official print view (/receipt/.../print).
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from html import escape
+from typing import Any
+
+INCOME_TYPE_TITLES = {
+    "FROM_INDIVIDUAL": "Физическое лицо",
+    "FROM_LEGAL_ENTITY": "Юридическое лицо / ИП",
+    "FROM_FOREIGN_AGENCY": "Иностранная организация",
+}
+
+TAX_REGIME_TITLE = "НПД"
+
+
+def _to_decimal(value: Any) -> Decimal:
+    """Convert JSON number or numeric string to Decimal."""
+    if isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return Decimal(0)
+
+
+def _format_amount(value: Decimal) -> str:
+    """Format amount like print view: two decimals and ruble sign."""
+    return f"{value.quantize(Decimal('0.01')):.2f} ₽"
+
+
+def _format_quantity(value: Decimal) -> str:
+    """Format quantity without trailing zeros (1, 2.5)."""
+    text = f"{value:f}"
+    if "." in text:
+        text = text.rstrip("0").rstrip(".")
+    return text
+
+
+def _format_datetime(value: str | None) -> str:
+    """Format ATOM datetime as dd.mm.yy HH:MM(+HH:MM) like print view."""
+    if not value:
+        return ""
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return value
+    offset = dt.strftime("%z")
+    if offset:
+        offset = f"({offset[:3]}:{offset[3:]})"
+    return dt.strftime("%d.%m.%y %H:%M") + offset
+
+
+@dataclass(frozen=True)
+class ReceiptServiceLine:
+    """Single service line of a rendered receipt."""
+
+    number: int
+    name: str
+    quantity: Decimal
+    amount: Decimal
+
+    @property
+    def total(self) -> Decimal:
+        """Line total (amount * quantity)."""
+        return self.amount * self.quantity
+
+
+@dataclass(frozen=True)
+class ReceiptView:
+    """
+    Normalized receipt fields shown by the official print view.
+
+    Accepts both flat (clientInn, clientDisplayName) and nested
+    (client.inn, client.displayName) payload shapes.
+    """
+
+    receipt_id: str
+    operation_time: str
+    seller_name: str
+    seller_inn: str
+    services: list[ReceiptServiceLine] = field(default_factory=list)
+    total_amount: Decimal = Decimal(0)
+    income_type: str = "FROM_INDIVIDUAL"
+    client_inn: str | None = None
+    client_display_name: str | None = None
+    cancelled: bool = False
+    cancellation_comment: str | None = None
+
+    @classmethod
+    def from_json(
+        cls,
+        data: dict[str, Any],
+        seller_name: str | None = None,
+        seller_inn: str | None = None,
+    ) -> "ReceiptView":
+        """
+        Build view from ReceiptAPI.json() payload.
+
+        Args:
+            data: Receipt JSON payload
+            seller_name: Seller display name (payload usually lacks it)
+            seller_inn: Seller INN fallback if payload has no "inn"
+
+        Returns:
+            ReceiptView instance
+        """
+        services = [
+            ReceiptServiceLine(
+                number=index + 1,
+                name=str(item.get("name", "")),
+                quantity=_to_decimal(item.get("quantity", 1)),
+                amount=_to_decimal(item.get("amount", 0)),
+            )
+            for index, item in enumerate(data.get("services") or [])
+        ]
+
+        client = data.get("client") or {}
+        cancellation = data.get("cancellationInfo")
+
+        if "totalAmount" in data:
+            total = _to_decimal(data["totalAmount"])
+        else:
+            total = sum((line.total for line in services), Decimal(0))
+
+        return cls(
+            receipt_id=str(
+                data.get("receiptId")
+                or data.get("approvedReceiptUuid")
+                or data.get("id")
+                or ""
+            ),
+            operation_time=_format_datetime(data.get("operationTime")),
+            seller_name=seller_name or data.get("displayName") or "",
+            seller_inn=str(data.get("inn") or seller_inn or ""),
+            services=services,
+            total_amount=total,
+            income_type=str(
+                data.get("incomeType") or client.get("incomeType") or "FROM_INDIVIDUAL"
+            ),
+            client_inn=data.get("clientInn") or client.get("inn"),
+            client_display_name=(
+                data.get("clientDisplayName") or client.get("displayName")
+            ),
+            cancelled=bool(cancellation),
+            cancellation_comment=(
+                cancellation.get("comment") if isinstance(cancellation, dict) else None
+            ),
+        )
+
+
+def render_receipt_text(view: ReceiptView, width: int = 40) -> str:
+    """
+    Render receipt as plain text.
+
+    Args:
+        view: Normalized receipt view
+        width: Line width in characters
+
+    Returns:
+        Multi-line receipt text
+    """
+
+    def row(left: str, right: str) -> str:
+        gap = max(width - len(left) - len(right), 1)
+        return f"{left}{' ' * gap}{right}"
+
+    rule = "-" * width
+    lines = [
+        f"Чек №{view.receipt_id}".center(width).rstrip(),
+        view.operation_time.center(width).rstrip(),
+    ]
+    if view.seller_name:
+        lines.append(view.seller_name)
+    lines.extend([rule, row("Наименование", "Сумма")])
+
+    for line in view.services:
+        lines.append(f"{line.number}. {line.name}")
+        lines.append(
+            row(
+                f"   {_format_quantity(line.quantity)} x {_format_amount(line.amount)}",
+                _format_amount(line.total),
+            )
+        )
+
+    lines.extend(
+        [
+            rule,
+            row("Итого:", _format_amount(view.total_amount)),
+            row("Режим НО:", TAX_REGIME_TITLE),
+            row("ИНН:", view.seller_inn),
+        ]
+    )
+
+    buyer = view.client_display_name or INCOME_TYPE_TITLES.get(
+        view.income_type, view.income_type
+    )
+    lines.append(row("Покупатель:", buyer))
+    if view.client_inn:
+        lines.append(row("ИНН покупателя:", view.client_inn))
+
+    lines.extend([rule, row("Чек сформировал:", "Мой налог")])
+    if view.cancelled:
+        comment = view.cancellation_comment
+        lines.append(f"АННУЛИРОВАН: {comment}" if comment else "АННУЛИРОВАН")
+
+    return "\n".join(lines) + "\n"
+
+
+def render_receipt_html(view: ReceiptView) -> str:
+    """
+    Render receipt as standalone HTML fragment.
+
+    All payload values are HTML-escaped.
+
+    Args:
+        view: Normalized receipt view
+
+    Returns:
+        HTML string
+    """
+    service_rows = "".join(
+        "<tr>"
+        f"<td>{line.number}. {escape(line.name)}</td>"
+        f"<td>{_format_quantity(line.quantity)} x {_format_amount(line.amount)}</td>"
+        f"<td>{_format_amount(line.total)}</td>"
+        "</tr>"
+        for line in view.services
+    )
+
+    buyer = view.client_display_name or INCOME_TYPE_TITLES.get(
+        view.income_type, view.income_type
+    )
+    client_inn = (
+        f'<tr><td>ИНН покупателя:</td><td colspan="2">{escape(view.client_inn)}</td></tr>'
+        if view.client_inn
+        else ""
+    )
+    cancelled = (
+        '<p class="receipt-cancelled">Аннулирован'
+        + (
+            f": {escape(view.cancellation_comment)}"
+            if view.cancellation_comment
+            else ""
+        )
+        + "</p>"
+        if view.cancelled
+        else ""
+    )
+
+    return (
+        '<div class="receipt">'
+        f"<h1>Чек №{escape(view.receipt_id)}</h1>"
+        f'<p class="receipt-time">{escape(view.operation_time)}</p>'
+        f'<p class="receipt-seller">{escape(view.seller_name)}</p>'
+        "<table>"
+        "<tr><th>Наименование</th><th></th><th>Сумма</th></tr>"
+        f"{service_rows}"
+        f'<tr><td>Итого:</td><td colspan="2">{_format_amount(view.total_amount)}</td></tr>'
+        f'<tr><td>Режим НО:</td><td colspan="2">{TAX_REGIME_TITLE}</td></tr>'
+        f'<tr><td>ИНН:</td><td colspan="2">{escape(view.seller_inn)}</td></tr>'
+        f'<tr><td>Покупатель:</td><td colspan="2">{escape(buyer)}</td></tr>'
+        f"{client_inn}"
+        '<tr><td>Чек сформировал:</td><td colspan="2">Мой налог</td></tr>'
+        "</table>"
+        f"{cancelled}"
+        "</div>"
+    )
+
+
+def render_receipt(
+    data: dict[str, Any],
+    fmt: str = "html",
+    seller_name: str | None = None,
+    seller_inn: str | None = None,
+) -> str:
+    """
+    Render ReceiptAPI.json() payload in given format.
+
+    Args:
+        data: Receipt JSON payload
+        fmt: Output format: "html" or "text"
+        seller_name: Seller display name
+        seller_inn: Seller INN fallback
+
+    Returns:
+        Rendered receipt
+
+    Raises:
+        ValueError: For unknown format
+    """
+    view = ReceiptView.from_json(data, seller_name=seller_name, seller_inn=seller_inn)
+    if fmt == "html":
+        return render_receipt_html(view)
+    if fmt == "text":
+        return render_receipt_text(view)
+    raise ValueError(f"Unknown receipt format: {fmt}. Must be 'html' or 'text'")
@@ -0,0 +1,244 @@
+"""
+Priority scheduling of requests sharing one AsyncHTTPClient.
+
+RequestScheduler limits concurrent requests and, when they queue, grants
+slots by weighted fair queueing between priority classes: each waiting
+request gets a virtual finish tag max(virtual time, previous tag of its
+class) + 1 / weight, and the smallest tag goes first. With the default
+weights interactive requests get 4 of every 5 slots while both classes
+are backlogged, and bulk requests still progress, so they never starve.
+
+The class of a request comes from the priority() context (default:
+scheduler's default class); tasks started inside inherit it.
+
+Example:
+    >>> client = Client(scheduler=RequestScheduler(concurrency=8))
+    >>> with priority(BULK):
+    ...     await client.tax().history_many(oktmos)
+    >>> client.http_client.scheduler.stats()["bulk"]["wait_p99"]
+"""
+
+import asyncio
+import contextlib
+import math
+import time
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .metrics import HTTPMetrics
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+DEFAULT_WEIGHTS = {INTERACTIVE: 4.0, BULK: 1.0}
+
+_priority: ContextVar[str | None] = ContextVar("nalogo_priority", default=None)
+
+
+def current_priority() -> str | None:
+    """Get priority class set for current context."""
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def priority(name: str) -> Iterator[str]:
+    """
+    Run enclosed requests in priority class name.
+
+    Args:
+        name: Priority class (e.g. INTERACTIVE or BULK)
+
+    Yields:
+        Priority class
+    """
+    token = _priority.set(name)
+    try:
+        yield name
+    finally:
+        _priority.reset(token)
+
+
+class _ClassState:
+    """Queue and counters of one priority class."""
+
+    def __init__(self, weight: float, samples: int):
+        self.weight = weight
+        self.queue: deque[tuple[float, asyncio.Future[None]]] = deque()
+        self.last_finish = 0.0
+        self.served = 0
+        self.waits: deque[float] = deque(maxlen=samples)
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class RequestScheduler:
+    """Concurrency limit with weighted fair queueing between classes."""
+
+    def __init__(
+        self,
+        concurrency: int = 8,
+        weights: Mapping[str, float] | None = None,
+        default: str = INTERACTIVE,
+        samples: int = 1000,
+        metrics: "HTTPMetrics | None" = None,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            concurrency: Max requests in flight
+            weights: Priority class -> share weight (default: interactive 4,
+                bulk 1)
+            default: Class of requests made outside priority()
+            samples: Queue waits kept per class for percentiles
+            metrics: Optional HTTPMetrics to record queue waits to (set by
+                AsyncHTTPClient when it has metrics)
+
+        Raises:
+            ValueError: For non-positive concurrency or weights, or unknown
+                default class
+        """
+        weights = dict(weights or DEFAULT_WEIGHTS)
+        if concurrency < 1:
+            raise ValueError("Concurrency must be positive")
+        if not weights or any(w <= 0 for w in weights.values()):
+            raise ValueError("Weights must be positive")
+        if default not in weights:
+            raise ValueError(f"Unknown default priority class: {default}")
+        self.concurrency = concurrency
+        self.default = default
+        self.metrics = metrics
+        self.active = 0
+        self._virtual = 0.0
+        self._classes = {
+            name: _ClassState(weight, samples) for name, weight in weights.items()
+        }
+
+    def _state(self, name: str | None) -> tuple[str, _ClassState]:
+        name = name or self.default
+        state = self._classes.get(name)
+        if state is None:
+            raise ValueError(f"Unknown priority class: {name}")
+        return name, state
+
+    def queued(self) -> int:
+        """Get number of waiting requests."""
+        return sum(len(state.queue) for state in self._classes.values())
+
+    async def acquire(self, name: str | None = None) -> float:
+        """
+        Wait for a request slot.
+
+        Args:
+            name: Priority class (default: current priority() or default)
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            ValueError: For unknown priority class
+        """
+        name, state = self._state(name or _priority.get())
+        if self.try_acquire(name):
+            return 0.0
+
+        started = time.perf_counter()
+        tag = max(self._virtual, state.last_finish) + 1 / state.weight
+        state.last_finish = tag
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        entry = (tag, future)
+        state.queue.append(entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Slot was handed over just before cancellation
+                self.release()
+            else:
+                state.queue.remove(entry)
+            raise
+        waited = time.perf_counter() - started
+        self._record(name, state, waited)
+        return waited
+
+    def try_acquire(self, name: str | None = None) -> bool:
+        """
+        Take a request slot only if one is free without queueing.
+
+        Args:
+            name: Priority class (default: current priority() or default)
+
+        Returns:
+            True if the slot was taken (caller must release() it)
+
+        Raises:
+            ValueError: For unknown priority class
+        """
+        name, state = self._state(name or _priority.get())
+        if self.active >= self.concurrency or self.queued():
+            return False
+        self.active += 1
+        self._record(name, state, 0.0)
+        return True
+
+    def release(self) -> None:
+        """Free a slot, handing it to the waiter with the smallest tag."""
+        best: _ClassState | None = None
+        for state in self._classes.values():
+            if state.queue and (best is None or state.queue[0][0] < best.queue[0][0]):
+                best = state
+        if best is None:
+            self.active -= 1
+            return
+        tag, future = best.queue.popleft()
+        self._virtual = tag
+        future.set_result(None)
+
+    @contextlib.asynccontextmanager
+    async def slot(self, name: str | None = None) -> Any:
+        """Hold a request slot for the enclosed code."""
+        await self.acquire(name)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _record(self, name: str, state: _ClassState, waited: float) -> None:
+        state.served += 1
+        state.waits.append(waited)
+        state.wait_total += waited
+        state.wait_max = max(state.wait_max, waited)
+        if self.metrics is not None:
+            self.metrics.queue_waited(name, waited)
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """
+        Get queue statistics per priority class.
+
+        Returns:
+            Class -> {"weight", "queued", "served", "wait_mean", "wait_p50",
+            "wait_p99", "wait_max"}; waits in seconds, percentiles over
+            the last samples waits
+        """
+        result = {}
+        for name, state in self._classes.items():
+            ordered = sorted(state.waits)
+            result[name] = {
+                "weight": state.weight,
+                "queued": len(state.queue),
+                "served": state.served,
+                "wait_mean": state.wait_total / state.served if state.served else 0.0,
+                "wait_p50": _percentile(ordered, 50),
+                "wait_p99": _percentile(ordered, 99),
+                "wait_max": state.wait_max,
+            }
+        return result
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values (0 if empty)."""
+    if not ordered:
+        return 0.0
+    return ordered[max(math.ceil(q / 100 * len(ordered)), 1) - 1]
@@ -3,9 +3,92 @@ Tax API implementation.
 Based on PHP library's Api\\Tax class.
 """
 
+import asyncio
+import copy
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 from ._http import AsyncHTTPClient
+from .dto.lazy import LazyList
+from .dto.tax import History, Payment
+from .tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+class TaxRecordCache:
+    """
+    TTL cache of tax history/payment records per OKTMO code.
+
+    Shared between TaxAPI instances of one Client
+    (Client(tax_cache_ttl=...)) and used by the multi-OKTMO methods.
+    """
+
+    def __init__(self, ttl: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize cache.
+
+        Args:
+            ttl: Seconds records are served without refetching
+            clock: Monotonic clock (replaceable in tests)
+
+        Raises:
+            ValueError: For non-positive ttl
+        """
+        if ttl <= 0:
+            raise ValueError("Cache ttl must be greater than 0")
+        self.ttl = ttl
+        self.clock = clock
+        self._items: dict[tuple[Any, ...], tuple[float, list[dict[str, Any]]]] = {}
+
+    def get(self, key: tuple[Any, ...]) -> list[dict[str, Any]] | None:
+        """Get copy of cached records if not expired."""
+        entry = self._items.get(key)
+        if entry is None:
+            return None
+        if self.clock() - entry[0] >= self.ttl:
+            del self._items[key]
+            return None
+        return copy.deepcopy(entry[1])
+
+    def put(self, key: tuple[Any, ...], records: list[dict[str, Any]]) -> None:
+        """Store copy of records."""
+        self._items[key] = (self.clock(), copy.deepcopy(records))
+
+    def clear(self) -> None:
+        """Drop all cached records."""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+@dataclass
+class OktmoRecords:
+    """
+    Result of fetching records for several OKTMO codes.
+
+    Codes that failed are reported in errors and do not affect the others.
+    """
+
+    oktmos: list[str]
+    by_oktmo: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+    @property
+    def records(self) -> list[dict[str, Any]]:
+        """Records of all successful codes, in requested OKTMO order."""
+        return [
+            record for oktmo in self.oktmos for record in self.by_oktmo.get(oktmo, ())
+        ]
+
+    @property
+    def ok(self) -> bool:
+        """True if every code was fetched."""
+        return not self.errors
 
 
 class TaxAPI:
@@ -16,13 +99,19 @@ class TaxAPI:
     - Getting current tax information
     - Getting tax history by OKTMO
     - Getting payment records
+    - Lazily typed history and payment records
+    - Concurrent history and payments for several OKTMO codes
 
     Maps to PHP Api\\Tax functionality.
     """
 
-    def __init__(self, http_client: AsyncHTTPClient):
+    def __init__(
+        self, http_client: AsyncHTTPClient, cache: TaxRecordCache | None = None
+    ):
         self.http = http_client
+        self.cache = cache
 
+    @traced("TaxAPI.get")
     async def get(self) -> dict[str, Any]:
         """
         Get current tax information.
@@ -36,8 +125,9 @@ class TaxAPI:
             DomainException: For API errors
         """
         response = await self.http.get("/taxes")
-        return response.json()  # type: ignore[no-any-return]
+        return self.http.json(response)  # type: ignore[no-any-return]
 
+    @traced("TaxAPI.history")
     async def history(self, oktmo: str | None = None) -> dict[str, Any]:
         """
         Get tax history.
@@ -55,8 +145,9 @@ class TaxAPI:
         """
         request_data = {"oktmo": oktmo}
         response = await self.http.post("/taxes/history", json_data=request_data)
-        return response.json()  # type: ignore[no-any-return]
+        return self.http.json(response)  # type: ignore[no-any-return]
 
+    @traced("TaxAPI.payments")
     async def payments(
         self, oktmo: str | None = None, only_paid: bool = False
     ) -> dict[str, Any]:
@@ -80,4 +171,148 @@ class TaxAPI:
             "onlyPaid": only_paid,
         }
         response = await self.http.post("/taxes/payments", json_data=request_data)
-        return response.json()  # type: ignore[no-any-return]
+        return self.http.json(response)  # type: ignore[no-any-return]
+
+    async def history_typed(self, oktmo: str | None = None) -> LazyList[History]:
+        """
+        Get tax history records as lazily validated History models.
+
+        Args:
+            oktmo: Optional OKTMO code for filtering
+
+        Returns:
+            LazyList of History views (fields validated on first access)
+
+        Raises:
+            DomainException: For API errors
+        """
+        response = await self.history(oktmo)
+        return LazyList(History, response.get("records") or [])
+
+    async def payments_typed(
+        self, oktmo: str | None = None, only_paid: bool = False
+    ) -> LazyList[Payment]:
+        """
+        Get tax payment records as lazily validated Payment models.
+
+        Args:
+            oktmo: Optional OKTMO code for filtering
+            only_paid: If True, return only paid records
+
+        Returns:
+            LazyList of Payment views (fields validated on first access)
+
+        Raises:
+            DomainException: For API errors
+        """
+        response = await self.payments(oktmo, only_paid)
+        return LazyList(Payment, response.get("records") or [])
+
+    @traced("TaxAPI.history_many")
+    async def history_many(
+        self,
+        oktmos: Sequence[str],
+        concurrency: int = 4,
+        refresh: bool = False,
+    ) -> OktmoRecords:
+        """
+        Get tax history for several OKTMO codes concurrently.
+
+        Args:
+            oktmos: OKTMO codes (duplicates are fetched once)
+            concurrency: Max requests in flight
+            refresh: Bypass cache and fetch from API
+
+        Returns:
+            OktmoRecords with records per code and per-code errors
+
+        Raises:
+            ValueError: For non-positive concurrency
+        """
+
+        async def fetch(oktmo: str) -> list[dict[str, Any]]:
+            response = await self.history(oktmo)
+            return response.get("records") or []
+
+        return await self._fan_out(
+            "history", oktmos, (), fetch, concurrency=concurrency, refresh=refresh
+        )
+
+    @traced("TaxAPI.payments_many")
+    async def payments_many(
+        self,
+        oktmos: Sequence[str],
+        only_paid: bool = False,
+        concurrency: int = 4,
+        refresh: bool = False,
+    ) -> OktmoRecords:
+        """
+        Get tax payment records for several OKTMO codes concurrently.
+
+        Args:
+            oktmos: OKTMO codes (duplicates are fetched once)
+            only_paid: If True, return only paid records
+            concurrency: Max requests in flight
+            refresh: Bypass cache and fetch from API
+
+        Returns:
+            OktmoRecords with records per code and per-code errors
+
+        Raises:
+            ValueError: For non-positive concurrency
+        """
+
+        async def fetch(oktmo: str) -> list[dict[str, Any]]:
+            response = await self.payments(oktmo, only_paid)
+            return response.get("records") or []
+
+        return await self._fan_out(
+            "payments",
+            oktmos,
+            (only_paid,),
+            fetch,
+            concurrency=concurrency,
+            refresh=refresh,
+        )
+
+    async def _fan_out(
+        self,
+        kind: str,
+        oktmos: Sequence[str],
+        options: tuple[Any, ...],
+        fetch: Callable[[str], Any],
+        *,
+        concurrency: int,
+        refresh: bool,
+    ) -> OktmoRecords:
+        """Fetch records per OKTMO under semaphore, using and filling cache."""
+        if concurrency <= 0:
+            raise ValueError("Concurrency must be greater than 0")
+
+        result = OktmoRecords(oktmos=list(dict.fromkeys(oktmos)))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(oktmo: str) -> None:
+            key = (kind, oktmo, *options)
+            if self.cache is not None and not refresh:
+                cached = self.cache.get(key)
+                if cached is not None:
+                    result.by_oktmo[oktmo] = cached
+                    return
+            try:
+                with self.http.tracer.span("queue", {"oktmo": oktmo}):
+                    await semaphore.acquire()
+                try:
+                    records = await fetch(oktmo)
+                finally:
+                    semaphore.release()
+            except Exception as e:
+                logger.warning("Tax %s request for OKTMO %s failed: %s", kind, oktmo, e)
+                result.errors[oktmo] = e
+                return
+            if self.cache is not None:
+                self.cache.put(key, records)
+            result.by_oktmo[oktmo] = records
+
+        await asyncio.gather(*(run(oktmo) for oktmo in result.oktmos))
+        return result
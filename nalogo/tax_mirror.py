@@ -0,0 +1,292 @@
+"""
+Local SQLite mirror of tax history and payment records.
+Keeps a copy of TaxAPI history/payments and applies only records whose
+content changed since the previous sync.
+"""
+
+import hashlib
+import json
+import sqlite3
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .tax import TaxAPI
+
+KIND_HISTORY = "history"
+KIND_PAYMENTS = "payments"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tax_records (
+    kind TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    oktmo TEXT,
+    content_hash TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (kind, scope, record_key)
+);
+CREATE INDEX IF NOT EXISTS idx_tax_records_oktmo ON tax_records (kind, oktmo);
+"""
+
+
+def record_key(kind: str, record: dict[str, Any]) -> str:
+    """
+    Get stable identity of tax record.
+
+    History entries are identified by krsbTaxChargeId (or tax period and
+    OKTMO), payments by source type and id (or document index). Records
+    without identity fields are identified by their content hash.
+
+    Args:
+        kind: "history" or "payments"
+        record: Record from TaxAPI response
+
+    Returns:
+        Record key string
+    """
+    if kind == KIND_HISTORY:
+        if record.get("krsbTaxChargeId") is not None:
+            return f"charge:{record['krsbTaxChargeId']}"
+        if record.get("taxPeriodId") is not None:
+            return f"period:{record['taxPeriodId']}:{record.get('oktmo') or ''}"
+    else:
+        if record.get("sourceId") is not None:
+            return f"source:{record.get('sourceType') or ''}:{record['sourceId']}"
+        if record.get("documentIndex"):
+            return f"document:{record['documentIndex']}"
+    return f"hash:{content_hash(record)}"
+
+
+def content_hash(record: dict[str, Any]) -> str:
+    """Get SHA-256 of record in canonical JSON form (sorted keys)."""
+    canonical = json.dumps(
+        record, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+@dataclass
+class TaxSyncResult:
+    """Outcome of TaxMirror.sync_history()/sync_payments()."""
+
+    fetched: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    errors: dict[str, Exception] = field(default_factory=dict)
+
+
+class TaxMirror:
+    """
+    Local SQLite copy of tax history and payment records.
+
+    The tax endpoints have no "changed since" filter, so each sync still
+    reads the full response, but only new or changed records (compared by
+    content hash) are written. Records are stored per sync scope: the
+    requested OKTMO code, or "" for the unfiltered request.
+
+    Example:
+        >>> mirror = TaxMirror("tax.sqlite3")
+        >>> await mirror.sync_history(client.tax(), ["45000000", "46000000"])
+        >>> mirror.history(oktmo="45000000")
+    """
+
+    def __init__(self, path: str | Path = ":memory:", concurrency: int = 4):
+        """
+        Open (or create) mirror database.
+
+        Args:
+            path: SQLite database path (default: in-memory database)
+            concurrency: Max requests in flight when syncing several OKTMO codes
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = str(path)
+        self.concurrency = concurrency
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close database connection."""
+        self._db.close()
+
+    def __enter__(self) -> "TaxMirror":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    async def sync_history(
+        self,
+        tax_api: TaxAPI,
+        oktmos: Sequence[str] | None = None,
+        prune: bool = False,
+    ) -> TaxSyncResult:
+        """
+        Sync tax history records.
+
+        Args:
+            tax_api: TaxAPI used for requests
+            oktmos: OKTMO codes to sync (None: single unfiltered request)
+            prune: Delete stored records missing from the response
+
+        Returns:
+            TaxSyncResult with counters and per-OKTMO errors
+
+        Raises:
+            DomainException: For API errors of the unfiltered request
+        """
+        if oktmos is None:
+            response = await tax_api.history()
+            return self.apply(KIND_HISTORY, {"": response.get("records") or []}, prune)
+
+        fetched = await tax_api.history_many(
+            oktmos, concurrency=self.concurrency, refresh=True
+        )
+        result = self.apply(KIND_HISTORY, fetched.by_oktmo, prune)
+        result.errors.update(fetched.errors)
+        return result
+
+    async def sync_payments(
+        self,
+        tax_api: TaxAPI,
+        oktmos: Sequence[str] | None = None,
+        prune: bool = False,
+    ) -> TaxSyncResult:
+        """
+        Sync tax payment records (paid and unpaid).
+
+        Args:
+            tax_api: TaxAPI used for requests
+            oktmos: OKTMO codes to sync (None: single unfiltered request)
+            prune: Delete stored records missing from the response
+
+        Returns:
+            TaxSyncResult with counters and per-OKTMO errors
+
+        Raises:
+            DomainException: For API errors of the unfiltered request
+        """
+        if oktmos is None:
+            response = await tax_api.payments()
+            return self.apply(KIND_PAYMENTS, {"": response.get("records") or []}, prune)
+
+        fetched = await tax_api.payments_many(
+            oktmos, concurrency=self.concurrency, refresh=True
+        )
+        result = self.apply(KIND_PAYMENTS, fetched.by_oktmo, prune)
+        result.errors.update(fetched.errors)
+        return result
+
+    def apply(
+        self,
+        kind: str,
+        records_by_scope: dict[str, list[dict[str, Any]]],
+        prune: bool = False,
+    ) -> TaxSyncResult:
+        """
+        Upsert fetched records, skipping those with unchanged content hash.
+
+        All scopes are applied in one transaction.
+
+        Args:
+            kind: "history" or "payments"
+            records_by_scope: Records per sync scope (OKTMO code or "")
+            prune: Delete stored records of these scopes missing from input
+
+        Returns:
+            TaxSyncResult with counters
+        """
+        result = TaxSyncResult()
+        try:
+            for scope, records in records_by_scope.items():
+                stored = dict(
+                    self._db.execute(
+                        "SELECT record_key, content_hash FROM tax_records "
+                        "WHERE kind = ? AND scope = ?",
+                        (kind, scope),
+                    )
+                )
+                changed: list[tuple[Any, ...]] = []
+                seen: set[str] = set()
+                for record in records:
+                    result.fetched += 1
+                    key = record_key(kind, record)
+                    digest = content_hash(record)
+                    seen.add(key)
+                    previous = stored.get(key)
+                    if previous == digest:
+                        result.unchanged += 1
+                        continue
+                    if previous is None:
+                        result.inserted += 1
+                    else:
+                        result.updated += 1
+                    stored[key] = digest
+                    changed.append(
+                        (
+                            kind,
+                            scope,
+                            key,
+                            record.get("oktmo"),
+                            digest,
+                            json.dumps(record, ensure_ascii=False, default=str),
+                        )
+                    )
+
+                self._db.executemany(
+                    "INSERT INTO tax_records "
+                    "(kind, scope, record_key, oktmo, content_hash, payload) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (kind, scope, record_key) DO UPDATE SET "
+                    "oktmo = excluded.oktmo, content_hash = excluded.content_hash, "
+                    "payload = excluded.payload",
+                    changed,
+                )
+                if prune:
+                    missing = [(kind, scope, key) for key in stored if key not in seen]
+                    self._db.executemany(
+                        "DELETE FROM tax_records "
+                        "WHERE kind = ? AND scope = ? AND record_key = ?",
+                        missing,
+                    )
+                    result.removed += len(missing)
+            self._db.commit()
+        except BaseException:
+            self._db.rollback()
+            raise
+        return result
+
+    def records(self, kind: str, oktmo: str | None = None) -> list[dict[str, Any]]:
+        """
+        Get stored records in order of first sync.
+
+        Args:
+            kind: "history" or "payments"
+            oktmo: Filter by record OKTMO code
+
+        Returns:
+            List of records as returned by the API
+        """
+        sql = "SELECT payload FROM tax_records WHERE kind = ?"
+        params: list[Any] = [kind]
+        if oktmo is not None:
+            sql += " AND oktmo = ?"
+            params.append(oktmo)
+        sql += " ORDER BY rowid"
+        return [json.loads(row[0]) for row in self._db.execute(sql, params)]
+
+    def history(self, oktmo: str | None = None) -> list[dict[str, Any]]:
+        """Get stored tax history records."""
+        return self.records(KIND_HISTORY, oktmo)
+
+    def payments(self, oktmo: str | None = None) -> list[dict[str, Any]]:
+        """Get stored tax payment records."""
+        return self.records(KIND_PAYMENTS, oktmo)
+
+    def __len__(self) -> int:
+        row = self._db.execute("SELECT COUNT(*) FROM tax_records").fetchone()
+        return int(row[0])
@@ -0,0 +1,476 @@
+"""
+In-process Moy Nalog service emulator for tests and load experiments.
+
+FakeNalogService keeps real state (accounts, tokens, receipts, tax
+records) and serves the endpoints used by this library through an httpx
+transport, so a Client can run full flows offline:
+
+    >>> service = FakeNalogService(latency=0.02, error_rate=0.01)
+    >>> client = Client(transport=service.transport())
+    >>> await client.authenticate(
+    ...     await client.create_new_access_token(service.inn, service.password)
+    ... )
+    >>> await client.income().create("Service", 100, 1)
+"""
+
+import asyncio
+import random
+import re
+import time
+import uuid
+from collections import Counter
+from collections.abc import Callable
+from datetime import UTC, datetime
+from typing import Any
+
+import httpx
+
+from .codec import JSONCodec, default_codec
+from .income import (
+    STATUS_REGISTERED,
+    income_record_from_request,
+    income_status,
+    parse_operation_time,
+)
+from .money import to_kopecks
+
+Handler = Callable[[httpx.Request, re.Match[str]], httpx.Response]
+
+
+class FakeNalogService:
+    """
+    Stateful emulator of lknpd.nalog.ru API.
+
+    Implemented endpoints: /auth/lkfl, /auth/token, SMS challenge
+    start/verify, /income, /cancel, /incomes, /receipt/{inn}/{uuid}/json
+    and /print, /taxes, /taxes/history, /taxes/payments, /user and
+    /payment-type/table. Access tokens expire after token_ttl seconds and
+    refresh tokens are rotated: each can be used once.
+
+    Faults are applied before routing, in order: latency (latency plus
+    uniform jitter), 429 throttling when more than rate_limit requests
+    arrive within one second, then random error_status responses with
+    probability error_rate. Counters of requests and response statuses
+    are kept in requests (by endpoint handler name) and statuses.
+    """
+
+    def __init__(
+        self,
+        *,
+        inn: str = "500100732259",
+        password: str = "password",
+        phone: str = "79000000000",
+        sms_code: str = "123456",
+        display_name: str = "Иванов Иван Иванович",
+        token_ttl: float = 3600.0,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        rate_limit: int | None = None,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.time,
+        codec: JSONCodec | None = None,
+    ):
+        """
+        Initialize emulator.
+
+        Args:
+            inn: Account INN (login for /auth/lkfl)
+            password: Account password
+            phone: Account phone for SMS authentication
+            sms_code: Code accepted by SMS verification
+            display_name: Account display name
+            token_ttl: Access token lifetime in seconds
+            latency: Base delay of every response in seconds
+            jitter: Max extra random delay in seconds
+            error_rate: Probability of injected error response (0..1)
+            error_status: Status code of injected errors
+            rate_limit: Max requests per second before 429 (None disables)
+            seed: Random seed for jitter and injected errors
+            clock: Wall clock for token expiry (replaceable in tests)
+            codec: JSON codec for bodies
+
+        Raises:
+            ValueError: For invalid fault settings
+        """
+        if latency < 0 or jitter < 0:
+            raise ValueError("Latency cannot be negative")
+        if not 0 <= error_rate <= 1:
+            raise ValueError("Error rate must be between 0 and 1")
+        if rate_limit is not None and rate_limit <= 0:
+            raise ValueError("Rate limit must be greater than 0")
+
+        self.inn = inn
+        self.password = password
+        self.phone = phone
+        self.sms_code = sms_code
+        self.token_ttl = token_ttl
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit = rate_limit
+        self.clock = clock
+        self.codec = codec or default_codec()
+        self._random = random.Random(seed)  # nosec B311 - not for security
+
+        self.profile: dict[str, Any] = {
+            "id": 1,
+            "inn": inn,
+            "displayName": display_name,
+            "phone": phone,
+            "email": None,
+            "avatarExists": False,
+            "status": "ACTIVE",
+            "restrictedMode": False,
+            "hideCancelledReceipt": False,
+        }
+        # Access token -> expiry timestamp; unused refresh tokens
+        self.access_tokens: dict[str, float] = {}
+        self.refresh_tokens: set[str] = set()
+        self.challenges: dict[str, str] = {}
+        self.receipts: dict[str, dict[str, Any]] = {}
+        self.tax_history: list[dict[str, Any]] = []
+        self.tax_payments: list[dict[str, Any]] = []
+        self.payment_types: list[dict[str, Any]] = []
+
+        self.requests: Counter[str] = Counter()
+        self.statuses: Counter[int] = Counter()
+        self._window_start = 0.0
+        self._window_count = 0
+
+        self._routes: list[tuple[str, re.Pattern[str], Handler]] = [
+            ("POST", re.compile(r"/v1/auth/lkfl"), self._auth_lkfl),
+            ("POST", re.compile(r"/v1/auth/token"), self._auth_token),
+            ("POST", re.compile(r"/v2/auth/challenge/sms/start"), self._sms_start),
+            ("POST", re.compile(r"/v1/auth/challenge/sms/verify"), self._sms_verify),
+            ("POST", re.compile(r"/v1/income"), self._income),
+            ("POST", re.compile(r"/v1/cancel"), self._cancel),
+            ("GET", re.compile(r"/v1/incomes"), self._incomes),
+            (
+                "GET",
+                re.compile(r"/v1/receipt/(?P<inn>[^/]+)/(?P<uuid>[^/]+)/json"),
+                self._receipt_json,
+            ),
+            (
+                "GET",
+                re.compile(r"/v1/receipt/(?P<inn>[^/]+)/(?P<uuid>[^/]+)/print"),
+                self._receipt_print,
+            ),
+            ("GET", re.compile(r"/v1/taxes"), self._taxes),
+            ("POST", re.compile(r"/v1/taxes/history"), self._tax_history),
+            ("POST", re.compile(r"/v1/taxes/payments"), self._tax_payments),
+            ("GET", re.compile(r"/v1/user"), self._user),
+            ("GET", re.compile(r"/v1/payment-type/table"), self._payment_type_table),
+        ]
+
+    def transport(self) -> "FakeTransport":
+        """Create httpx transport serving requests from this emulator."""
+        return FakeTransport(self)
+
+    def issue_token(self) -> dict[str, Any]:
+        """
+        Issue new access/refresh token pair.
+
+        Returns:
+            Token data in /auth/lkfl response format
+        """
+        token = uuid.uuid4().hex
+        refresh_token = uuid.uuid4().hex
+        expires_at = self.clock() + self.token_ttl
+        self.access_tokens[token] = expires_at
+        self.refresh_tokens.add(refresh_token)
+        return {
+            "token": token,
+            "refreshToken": refresh_token,
+            "tokenExpireIn": datetime.fromtimestamp(expires_at, UTC)
+            .isoformat(timespec="milliseconds")
+            .replace("+00:00", "Z"),
+            "refreshTokenExpiresIn": None,
+            "profile": self.profile,
+        }
+
+    def expire_tokens(self) -> None:
+        """Expire all issued access tokens (refresh tokens stay valid)."""
+        for token in self.access_tokens:
+            self.access_tokens[token] = 0.0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        """
+        Serve request with configured faults.
+
+        Args:
+            request: httpx request to any base URL ending in /v1 or /v2
+
+        Returns:
+            httpx.Response
+        """
+        delay = self.latency + (
+            self._random.uniform(0, self.jitter) if self.jitter else 0
+        )
+        if delay:
+            await asyncio.sleep(delay)
+
+        response = self._fault() or self._route(request)
+        self.statuses[response.status_code] += 1
+        return response
+
+    def _fault(self) -> httpx.Response | None:
+        """Get throttling or injected error response, if any."""
+        if self.rate_limit is not None:
+            now = time.monotonic()
+            if now - self._window_start >= 1.0:
+                self._window_start = now
+                self._window_count = 0
+            self._window_count += 1
+            if self._window_count > self.rate_limit:
+                return self._error(429, "Too many requests", {"Retry-After": "1"})
+        if self.error_rate and self._random.random() < self.error_rate:
+            return self._error(self.error_status, "Injected error")
+        return None
+
+    def _route(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        match_start = path.find("/v1/")
+        if match_start < 0:
+            match_start = path.find("/v2/")
+        path = path[match_start:] if match_start >= 0 else path
+
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if method != request.method:
+                return self._error(405, "Method not allowed")
+            self.requests[handler.__name__.lstrip("_")] += 1
+            if "/auth/" not in path and not self._authorized(request):
+                return self._error(401, "Unauthorized")
+            return handler(request, match)
+        return self._error(404, f"Not found: {path}")
+
+    def _authorized(self, request: httpx.Request) -> bool:
+        header = request.headers.get("Authorization", "")
+        if not header.startswith("Bearer "):
+            return False
+        expires_at = self.access_tokens.get(header.removeprefix("Bearer "))
+        return expires_at is not None and self.clock() < expires_at
+
+    def _json(self, data: Any, status_code: int = 200) -> httpx.Response:
+        return httpx.Response(
+            status_code,
+            content=self.codec.dumps(data),
+            headers={"Content-Type": "application/json"},
+        )
+
+    def _error(
+        self, status_code: int, message: str, headers: dict[str, str] | None = None
+    ) -> httpx.Response:
+        response = self._json({"code": status_code, "message": message}, status_code)
+        response.headers.update(headers or {})
+        return response
+
+    def _body(self, request: httpx.Request) -> dict[str, Any]:
+        try:
+            body = self.codec.loads(request.content) if request.content else {}
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    # Authentication
+
+    def _auth_lkfl(
+        self, request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        body = self._body(request)
+        if body.get("username") != self.inn or body.get("password") != self.password:
+            return self._error(401, "Неверный ИНН или пароль")
+        return self._json(self.issue_token())
+
+    def _auth_token(
+        self, request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        refresh_token = self._body(request).get("refreshToken")
+        if refresh_token not in self.refresh_tokens:
+            return self._error(401, "Invalid refresh token")
+        # Rotation: refresh token is single-use
+        self.refresh_tokens.discard(refresh_token)
+        return self._json(self.issue_token())
+
+    def _sms_start(
+        self, request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        phone = self._body(request).get("phone")
+        if phone != self.phone:
+            return self._error(422, "Телефон не найден")
+        challenge_token = uuid.uuid4().hex
+        self.challenges[challenge_token] = phone
+        expire = datetime.fromtimestamp(self.clock() + 120, UTC)
+        return self._json(
+            {
+                "challengeToken": challenge_token,
+                "expireDate": expire.isoformat().replace("+00:00", "Z"),
+                "expireIn": 120,
+            }
+        )
+
+    def _sms_verify(
+        self, request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        body = self._body(request)
+        phone = self.challenges.get(body.get("challengeToken", ""))
+        if phone is None or phone != body.get("phone"):
+            return self._error(422, "Неверный токен подтверждения")
+        if body.get("code") != self.sms_code:
+            return self._error(422, "Неверный код подтверждения")
+        del self.challenges[body["challengeToken"]]
+        return self._json(self.issue_token())
+
+    # Incomes and receipts
+
+    def _income(self, request: httpx.Request, _match: re.Match[str]) -> httpx.Response:
+        body = self._body(request)
+        if not body.get("services") or not body.get("operationTime"):
+            return self._error(400, "Неверные параметры чека")
+        receipt_uuid = uuid.uuid4().hex[:10]
+        record = income_record_from_request(body, {"approvedReceiptUuid": receipt_uuid})
+        if record is not None:
+            self.receipts[receipt_uuid] = record
+        return self._json({"approvedReceiptUuid": receipt_uuid})
+
+    def _cancel(self, request: httpx.Request, _match: re.Match[str]) -> httpx.Response:
+        body = self._body(request)
+        record = self.receipts.get(body.get("receiptUuid", ""))
+        if record is None:
+            return self._error(404, "Чек не найден")
+        if record.get("cancellationInfo"):
+            return self._error(400, "Чек уже аннулирован")
+        record["cancellationInfo"] = {
+            "operationTime": body.get("operationTime"),
+            "registerTime": body.get("requestTime"),
+            "taxPeriodId": None,
+            "comment": body.get("comment"),
+        }
+        return self._json({"incomeInfo": record})
+
+    def _incomes(self, request: httpx.Request, _match: re.Match[str]) -> httpx.Response:
+        params = request.url.params
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 50))
+        records = list(self.receipts.values())
+        if "from" in params:
+            from_ = parse_operation_time(params["from"])
+            records = [
+                r for r in records if parse_operation_time(r["operationTime"]) >= from_
+            ]
+        if "to" in params:
+            to = parse_operation_time(params["to"])
+            records = [
+                r for r in records if parse_operation_time(r["operationTime"]) <= to
+            ]
+        records.sort(
+            key=lambda r: parse_operation_time(r["operationTime"]),
+            reverse=params.get("sortBy", "operation_time:desc").endswith(":desc"),
+        )
+        return self._json(
+            {
+                "content": records[offset : offset + limit],
+                "hasMore": offset + limit < len(records),
+                "currentOffset": offset,
+                "currentLimit": limit,
+            }
+        )
+
+    def _receipt(self, match: re.Match[str]) -> dict[str, Any] | None:
+        if match["inn"] != self.inn:
+            return None
+        return self.receipts.get(match["uuid"])
+
+    def _receipt_json(
+        self, _request: httpx.Request, match: re.Match[str]
+    ) -> httpx.Response:
+        record = self._receipt(match)
+        if record is None:
+            return self._error(404, "Чек не найден")
+        return self._json(
+            {
+                **record,
+                "receiptId": record["approvedReceiptUuid"],
+                "inn": self.inn,
+                "displayName": self.profile["displayName"],
+            }
+        )
+
+    def _receipt_print(
+        self, _request: httpx.Request, match: re.Match[str]
+    ) -> httpx.Response:
+        record = self._receipt(match)
+        if record is None:
+            return self._error(404, "Чек не найден")
+        return httpx.Response(
+            200,
+            text=f"<html><body>Чек №{record['approvedReceiptUuid']}</body></html>",
+            headers={"Content-Type": "text/html; charset=utf-8"},
+        )
+
+    # Taxes, user and payment types
+
+    def _taxes(self, _request: httpx.Request, _match: re.Match[str]) -> httpx.Response:
+        registered = [
+            r for r in self.receipts.values() if income_status(r) == STATUS_REGISTERED
+        ]
+        return self._json(
+            {
+                "totalForPayment": sum(
+                    to_kopecks(r.get("taxAmount")) for r in self.tax_history
+                )
+                / 100,
+                "receiptsCount": len(registered),
+                "regions": [],
+            }
+        )
+
+    def _filter_oktmo(
+        self, records: list[dict[str, Any]], oktmo: str | None
+    ) -> list[dict[str, Any]]:
+        if oktmo is None:
+            return list(records)
+        return [r for r in records if r.get("oktmo") == oktmo]
+
+    def _tax_history(
+        self, request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        oktmo = self._body(request).get("oktmo")
+        return self._json({"records": self._filter_oktmo(self.tax_history, oktmo)})
+
+    def _tax_payments(
+        self, request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        body = self._body(request)
+        records = self._filter_oktmo(self.tax_payments, body.get("oktmo"))
+        if body.get("onlyPaid"):
+            records = [r for r in records if r.get("status") == "Paid"]
+        return self._json({"records": records})
+
+    def _user(self, _request: httpx.Request, _match: re.Match[str]) -> httpx.Response:
+        return self._json(self.profile)
+
+    def _payment_type_table(
+        self, _request: httpx.Request, _match: re.Match[str]
+    ) -> httpx.Response:
+        return self._json(self.payment_types)
+
+
+class FakeTransport(httpx.AsyncBaseTransport):
+    """httpx transport routing requests to FakeNalogService."""
+
+    def __init__(self, service: FakeNalogService):
+        self.service = service
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return await self.service.handle(request)
+
+    async def aclose(self) -> None:
+        # Service outlives clients that close their transport
+        return None
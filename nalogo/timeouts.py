@@ -0,0 +1,313 @@
+"""
+Structured timeouts and call deadlines.
+
+EndpointTimeouts selects an httpx.Timeout (connect, read, write, pool)
+by request path prefix, so e.g. receipt printing can wait longer than
+token endpoints.
+
+A deadline is an absolute point in time (time.monotonic()) kept in a
+contextvar. Every request made while it is set shares the remaining
+budget: the first attempt, the token refresh after a 401 and the retry.
+Per-phase httpx timeouts are clamped to the budget left, and the call
+fails with DeadlineExceededException when it runs out.
+
+AdaptiveTimeouts (opt-in) derives timeouts from a rolling window of
+observed latencies per endpoint instead of fixed values.
+
+Example:
+    >>> client = Client(
+    ...     timeout=EndpointTimeouts(
+    ...         httpx.Timeout(10.0, connect=3.0),
+    ...         {"/receipt": httpx.Timeout(30.0, connect=3.0)},
+    ...     )
+    ... )
+    >>> with deadline(5.0):
+    ...     await client.income().create("Service", 100, 1)
+"""
+
+import contextlib
+import math
+import time
+from collections import deque
+from collections.abc import Iterator, Mapping
+from contextvars import ContextVar
+
+import httpx
+
+from .metrics import endpoint_template
+
+MAX_PERCENTILE = 100.0
+
+_deadline: ContextVar[float | None] = ContextVar("nalogo_deadline", default=None)
+
+
+def current_deadline() -> float | None:
+    """Get deadline of current context as time.monotonic() value."""
+    return _deadline.get()
+
+
+def remaining() -> float | None:
+    """Get seconds left until current deadline (None if no deadline)."""
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+@contextlib.contextmanager
+def deadline(seconds: float | None) -> Iterator[float | None]:
+    """
+    Limit enclosed calls to seconds from now.
+
+    Nested deadlines never extend an outer one: the earlier one wins.
+
+    Args:
+        seconds: Budget in seconds (None keeps current deadline)
+
+    Yields:
+        Deadline in effect as time.monotonic() value
+
+    Raises:
+        ValueError: If seconds is negative
+    """
+    if seconds is None:
+        yield _deadline.get()
+        return
+    if seconds < 0:
+        raise ValueError("Deadline cannot be negative")
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None and current < at:
+        at = current
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def clamp(
+    timeout: httpx.Timeout | Mapping[str, float | None], budget: float
+) -> dict[str, float | None]:
+    """
+    Limit every timeout phase to budget.
+
+    Args:
+        timeout: Configured timeouts or httpx "timeout" request extension
+        budget: Seconds left
+
+    Returns:
+        Value for the httpx "timeout" request extension
+    """
+    budget = max(budget, 0.0)
+    values = timeout.as_dict() if isinstance(timeout, httpx.Timeout) else timeout
+    return {
+        phase: budget if value is None else min(value, budget)
+        for phase, value in values.items()
+    }
+
+
+class EndpointTimeouts:
+    """httpx.Timeout per endpoint class, selected by longest path prefix."""
+
+    def __init__(
+        self,
+        default: float | httpx.Timeout = 10.0,
+        endpoints: Mapping[str, float | httpx.Timeout] | None = None,
+    ):
+        """
+        Initialize endpoint timeouts.
+
+        Args:
+            default: Timeout for paths matching no prefix
+            endpoints: Path prefix (relative to API base URL, e.g. "/receipt")
+                -> timeout
+
+        Raises:
+            ValueError: If prefix does not start with "/"
+        """
+        self.default = httpx.Timeout(default)
+        self.endpoints: dict[str, httpx.Timeout] = {}
+        for prefix, value in (endpoints or {}).items():
+            if not prefix.startswith("/"):
+                raise ValueError(f"Endpoint prefix must start with '/': {prefix}")
+            self.endpoints[prefix] = httpx.Timeout(value)
+        # Longest prefix first
+        self._ordered = sorted(self.endpoints.items(), key=lambda i: -len(i[0]))
+
+    def for_path(self, path: str) -> httpx.Timeout:
+        """
+        Get timeout for request path.
+
+        Args:
+            path: Path relative to API base URL
+
+        Returns:
+            Matching timeout
+        """
+        for prefix, timeout in self._ordered:
+            if path.startswith(prefix):
+                return timeout
+        return self.default
+
+
+class LatencyWindow:
+    """Rolling latency samples per method and endpoint template."""
+
+    def __init__(self, size: int = 500):
+        """
+        Initialize latency window.
+
+        Args:
+            size: Latencies kept per endpoint
+
+        Raises:
+            ValueError: If size is not positive
+        """
+        if size < 1:
+            raise ValueError("Window size must be positive")
+        self.size = size
+        self._samples: dict[tuple[str, str], deque[float]] = {}
+        # Sorted copy of samples, dropped when samples change
+        self._sorted: dict[tuple[str, str], list[float]] = {}
+
+    def observe(self, method: str, path: str, seconds: float) -> None:
+        """
+        Record request latency.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to API base URL
+            seconds: Latency
+        """
+        key = (method, endpoint_template(path))
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.size)
+        samples.append(seconds)
+        self._sorted.pop(key, None)
+
+    def count(self, method: str, path: str) -> int:
+        """Get number of samples kept for request endpoint."""
+        samples = self._samples.get((method, endpoint_template(path)))
+        return len(samples) if samples else 0
+
+    def percentile(self, method: str, path: str, q: float) -> float | None:
+        """
+        Get nearest-rank latency percentile.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to API base URL
+            q: Percentile in (0, 100]
+
+        Returns:
+            Latency in seconds, None without samples
+        """
+        key = (method, endpoint_template(path))
+        ordered = self._sorted.get(key)
+        if ordered is None:
+            samples = self._samples.get(key)
+            if not samples:
+                return None
+            ordered = self._sorted[key] = sorted(samples)
+        rank = max(math.ceil(q / 100 * len(ordered)), 1)
+        return ordered[rank - 1]
+
+    def endpoints(self) -> list[tuple[str, str]]:
+        """Get (method, endpoint template) pairs with samples."""
+        return list(self._samples)
+
+
+class AdaptiveTimeouts:
+    """
+    Timeouts derived from rolling latency percentiles per endpoint.
+
+    For each method and endpoint template the last window latencies are
+    kept; the timeout is the given percentile of them times factor,
+    bounded by minimum and maximum. Until min_samples latencies are seen
+    the maximum is used. A timed out request is recorded with the timeout
+    it had, so the window grows when the service slows down.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 99.0,
+        factor: float = 2.0,
+        *,
+        minimum: float = 0.5,
+        maximum: float = 10.0,
+        window: int = 500,
+        min_samples: int = 20,
+        connect: float | None = None,
+    ):
+        """
+        Initialize adaptive timeouts.
+
+        Args:
+            percentile: Latency percentile (0..100] the timeout is based on
+            factor: Safety factor applied to the percentile
+            minimum: Lower bound of timeout in seconds
+            maximum: Upper bound in seconds, used until min_samples are seen
+            window: Latencies kept per endpoint
+            min_samples: Latencies needed before adapting
+            connect: Fixed connect timeout (default: adaptive value)
+
+        Raises:
+            ValueError: For out of range parameters
+        """
+        if not 0 < percentile <= MAX_PERCENTILE:
+            raise ValueError("Percentile must be in (0, 100]")
+        if factor <= 0:
+            raise ValueError("Factor must be positive")
+        if not 0 < minimum <= maximum:
+            raise ValueError("Bounds must satisfy 0 < minimum <= maximum")
+        if not 1 <= min_samples <= window:
+            raise ValueError("min_samples must be between 1 and window")
+        self.percentile = percentile
+        self.factor = factor
+        self.minimum = minimum
+        self.maximum = maximum
+        self.min_samples = min_samples
+        self.connect = connect
+        self.latencies = LatencyWindow(window)
+
+    def observe(self, method: str, path: str, seconds: float) -> None:
+        """
+        Record request latency.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to API base URL
+            seconds: Latency (or timeout used, for timed out requests)
+        """
+        self.latencies.observe(method, path, seconds)
+
+    def seconds_for(self, method: str, path: str) -> float:
+        """
+        Get current timeout in seconds for request.
+
+        Args:
+            method: HTTP method
+            path: Request path relative to API base URL
+
+        Returns:
+            Timeout within [minimum, maximum]
+        """
+        if self.latencies.count(method, path) < self.min_samples:
+            return self.maximum
+        value = self.latencies.percentile(method, path, self.percentile)
+        if value is None:
+            return self.maximum
+        return min(max(value * self.factor, self.minimum), self.maximum)
+
+    def timeout_for(self, method: str, path: str) -> httpx.Timeout:
+        """Get httpx.Timeout for request (see seconds_for())."""
+        seconds = self.seconds_for(method, path)
+        connect = seconds if self.connect is None else self.connect
+        return httpx.Timeout(seconds, connect=connect)
+
+    def values(self) -> dict[tuple[str, str], float]:
+        """Get current timeout per (method, endpoint template)."""
+        return {
+            (method, endpoint): self.seconds_for(method, endpoint)
+            for method, endpoint in self.latencies.endpoints()
+        }
@@ -0,0 +1,315 @@
+"""
+Tracing hooks for API calls.
+
+Every IncomeAPI/ReceiptAPI/TaxAPI call runs in a span with child spans
+for its phases: request validation, model_dump, queueing behind
+concurrency limits, token refresh, and the HTTP exchange split into
+connect, TLS, send, server wait and receive (from httpx trace events),
+plus JSON parsing. The default Tracer records nothing; use
+OpenTelemetryTracer to export through OpenTelemetry, or RecordingTracer
+to inspect spans in-process.
+
+A correlation ID is kept in a contextvar for the duration of each API
+call (or set explicitly with correlation_scope()) and attached to spans
+and, through CorrelationIdFilter, to log records.
+
+Example:
+    >>> from opentelemetry import trace
+    >>> client = Client(tracer=OpenTelemetryTracer(trace.get_tracer("nalogo")))
+"""
+
+import contextlib
+import functools
+import logging
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, ParamSpec, Protocol, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+CORRELATION_ATTRIBUTE = "nalogo.correlation_id"
+
+correlation_id: ContextVar[str | None] = ContextVar(
+    "nalogo_correlation_id", default=None
+)
+
+
+def current_correlation_id() -> str | None:
+    """Get correlation ID of current context."""
+    return correlation_id.get()
+
+
+@contextlib.contextmanager
+def correlation_scope(value: str | None = None) -> Iterator[str]:
+    """
+    Set correlation ID for the enclosed code.
+
+    Args:
+        value: Correlation ID (default: keep current one, or generate new)
+
+    Yields:
+        Correlation ID in effect
+    """
+    current = correlation_id.get()
+    if value is None and current is not None:
+        yield current
+        return
+    token = correlation_id.set(value or uuid.uuid4().hex)
+    try:
+        yield correlation_id.get() or ""
+    finally:
+        correlation_id.reset(token)
+
+
+class CorrelationIdFilter(logging.Filter):
+    """Logging filter adding correlation_id attribute to records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get() or "-"
+        return True
+
+
+class Span(Protocol):
+    """Span interface (subset of OpenTelemetry Span)."""
+
+    def set_attribute(self, key: str, value: Any) -> None: ...
+
+    def record_exception(self, exception: BaseException) -> None: ...
+
+    def end(self, end_time: int | None = None) -> None: ...
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore attribute."""
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Ignore exception."""
+
+    def end(self, end_time: int | None = None) -> None:
+        """Ignore end."""
+
+
+NOOP_SPAN: Span = _NoopSpan()
+_NOOP_CONTEXT = contextlib.nullcontext(NOOP_SPAN)
+
+
+class Tracer:
+    """
+    Tracer interface; this base implementation records nothing.
+
+    Subclasses set enabled = True and implement span() and start_span().
+    Times are nanoseconds since the epoch, as in OpenTelemetry.
+    """
+
+    enabled = False
+
+    def span(
+        self, name: str, attributes: dict[str, Any] | None = None  # noqa: ARG002
+    ) -> contextlib.AbstractContextManager[Span]:
+        """
+        Open span as current span for the enclosed code.
+
+        Exceptions raised inside are recorded on the span and re-raised.
+        """
+        return _NOOP_CONTEXT
+
+    def start_span(
+        self,
+        name: str,  # noqa: ARG002
+        attributes: dict[str, Any] | None = None,  # noqa: ARG002
+        start_time: int | None = None,  # noqa: ARG002
+    ) -> Span:
+        """Start child span of current span; caller must call end()."""
+        return NOOP_SPAN
+
+
+NOOP_TRACER = Tracer()
+
+
+@dataclass
+class RecordedSpan:
+    """Finished span kept by RecordingTracer."""
+
+    name: str
+    span_id: int
+    parent_id: int | None
+    start_time: int
+    end_time: int | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    exception: BaseException | None = None
+
+    @property
+    def duration(self) -> float:
+        """Duration in seconds (0 if not ended)."""
+        return (self.end_time - self.start_time) / 1e9 if self.end_time else 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.exception = exception
+
+    def end(self, end_time: int | None = None) -> None:
+        if self.end_time is None:
+            self.end_time = end_time or time.time_ns()
+
+
+class RecordingTracer(Tracer):
+    """
+    Tracer keeping spans in memory (for tests and debugging).
+
+    Spans are appended to spans when started; parent links follow the
+    current span of the calling context.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.spans: list[RecordedSpan] = []
+        self._current: ContextVar[RecordedSpan | None] = ContextVar(
+            f"nalogo_recording_span_{id(self)}", default=None
+        )
+
+    def start_span(
+        self,
+        name: str,
+        attributes: dict[str, Any] | None = None,
+        start_time: int | None = None,
+    ) -> RecordedSpan:
+        parent = self._current.get()
+        span = RecordedSpan(
+            name=name,
+            span_id=len(self.spans) + 1,
+            parent_id=parent.span_id if parent else None,
+            start_time=start_time or time.time_ns(),
+            attributes=dict(attributes or {}),
+        )
+        self.spans.append(span)
+        return span
+
+    @contextlib.contextmanager
+    def span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> Iterator[RecordedSpan]:
+        span = self.start_span(name, attributes)
+        token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            self._current.reset(token)
+            span.end()
+
+    def find(self, name: str) -> list[RecordedSpan]:
+        """Get spans with given name."""
+        return [span for span in self.spans if span.name == name]
+
+    def children(self, parent: RecordedSpan) -> list[RecordedSpan]:
+        """Get direct child spans."""
+        return [span for span in self.spans if span.parent_id == parent.span_id]
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    Adapter for an OpenTelemetry tracer (opentelemetry.trace.Tracer).
+
+    opentelemetry is not imported; any object with start_as_current_span()
+    and start_span() of the OpenTelemetry API works.
+    """
+
+    enabled = True
+
+    def __init__(self, tracer: Any):
+        self.tracer = tracer
+
+    def span(
+        self, name: str, attributes: dict[str, Any] | None = None
+    ) -> contextlib.AbstractContextManager[Span]:
+        return self.tracer.start_as_current_span(  # type: ignore[no-any-return]
+            name, attributes=attributes, record_exception=True
+        )
+
+    def start_span(
+        self,
+        name: str,
+        attributes: dict[str, Any] | None = None,
+        start_time: int | None = None,
+    ) -> Span:
+        return self.tracer.start_span(  # type: ignore[no-any-return]
+            name, attributes=attributes, start_time=start_time
+        )
+
+
+def traced(
+    name: str,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Wrap async API method in span named name.
+
+    The method's object must have http (AsyncHTTPClient) with tracer. The
+    span carries the correlation ID, which is generated if none is set.
+    """
+
+    def decorate(method: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(method)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            tracer: Tracer = args[0].http.tracer  # type: ignore[attr-defined]
+            if not tracer.enabled:
+                return await method(*args, **kwargs)
+            with (
+                correlation_scope() as cid,
+                tracer.span(name, {CORRELATION_ATTRIBUTE: cid}),
+            ):
+                return await method(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+# httpx/httpcore trace event -> phase span name
+_HTTP_PHASES = {
+    "connect_tcp": "http.connect",
+    "connect_unix_socket": "http.connect",
+    "start_tls": "http.tls",
+    "send_request_headers": "http.send",
+    "send_request_body": "http.send_body",
+    "receive_response_headers": "http.server_wait",
+    "receive_response_body": "http.receive",
+}
+
+
+class HTTPPhaseTrace:
+    """
+    Callback for httpx "trace" request extension creating phase spans.
+
+    httpcore reports "<scope>.<phase>.started/complete/failed" events; each
+    started/complete pair becomes a child span of the current span.
+    """
+
+    def __init__(self, tracer: Tracer):
+        self.tracer = tracer
+        self._open: dict[str, Span] = {}
+
+    async def __call__(self, event_name: str, info: dict[str, Any]) -> None:
+        _, _, event = event_name.partition(".")
+        phase, _, state = event.rpartition(".")
+        span_name = _HTTP_PHASES.get(phase)
+        if span_name is None:
+            return
+        if state == "started":
+            self._open[phase] = self.tracer.start_span(span_name)
+            return
+        span = self._open.pop(phase, None)
+        if span is None:
+            return
+        if state == "failed" and isinstance(info.get("exception"), BaseException):
+            span.record_exception(info["exception"])
+        span.end()
@@ -6,6 +6,8 @@ Based on PHP library's Api\\User class.
 from typing import Any
 
 from ._http import AsyncHTTPClient
+from .dto.lazy import LazyModel
+from .dto.user import UserType
 
 
 class UserAPI:
@@ -13,7 +15,7 @@ class UserAPI:
     User API for user information.
 
     Provides async methods for:
-    - Getting current user information
+    - Getting current user information (raw or lazily typed)
 
     Maps to PHP Api\\User functionality.
     """
@@ -37,4 +39,19 @@ class UserAPI:
             DomainException: For API errors
         """
         response = await self.http.get("/user")
-        return response.json()  # type: ignore[no-any-return]
+        return self.http.json(response)  # type: ignore[no-any-return]
+
+    async def get_typed(self) -> LazyModel[UserType]:
+        """
+        Get current user information as lazily validated UserType.
+
+        Fields are validated on first access; use to_model() for full
+        validation.
+
+        Returns:
+            LazyModel view of UserType
+
+        Raises:
+            DomainException: For API errors
+        """
+        return LazyModel(UserType, await self.get())
@@ -0,0 +1,125 @@
+"""
+Client data validation.
+INN control-digit checks and batch pre-validation of income clients,
+so bulk imports reject bad rows before any network I/O.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from ._inn import inn_error
+from .dto.income import DISPLAY_NAME_MAX_LENGTH, IncomeClient, IncomeType
+
+_INCOME_TYPES = frozenset(income_type.value for income_type in IncomeType)
+
+__all__ = [
+    "DISPLAY_NAME_MAX_LENGTH",
+    "RowError",
+    "inn_error",
+    "is_valid_inn",
+    "validate_client",
+    "validate_clients",
+]
+
+
+def is_valid_inn(inn: str) -> bool:
+    """Check INN format and control digits."""
+    return inn_error(inn) is None
+
+
+@dataclass(frozen=True)
+class RowError:
+    """Validation error of one input row."""
+
+    row: int
+    field: str
+    message: str
+
+
+def _get(record: Any, snake: str, camel: str) -> Any:
+    if isinstance(record, Mapping):
+        return record.get(snake, record.get(camel))
+    return getattr(record, snake, None)
+
+
+def validate_client(
+    record: IncomeClient | Mapping[str, Any], row: int = 0
+) -> list[RowError]:
+    """
+    Validate single client record.
+
+    Args:
+        record: IncomeClient or mapping with snake_case or camelCase keys
+            (inn, display_name/displayName, income_type/incomeType)
+        row: Row number reported in errors
+
+    Returns:
+        List of errors (empty if record is valid)
+    """
+    errors: list[RowError] = []
+
+    income_type = (
+        _get(record, "income_type", "incomeType") or IncomeType.FROM_INDIVIDUAL
+    )
+    if isinstance(income_type, IncomeType):
+        income_type = income_type.value
+    if income_type not in _INCOME_TYPES:
+        errors.append(
+            RowError(row, "income_type", f"Unknown income type: {income_type}")
+        )
+
+    inn = _get(record, "inn", "inn")
+    inn = inn.strip() if isinstance(inn, str) else inn
+    if inn:
+        message = inn_error(str(inn))
+        if message:
+            errors.append(RowError(row, "inn", message))
+
+    display_name = _get(record, "display_name", "displayName")
+    display_name = display_name if isinstance(display_name, str) else None
+    # Same limit as IncomeClient.display_name, checked before stripping
+    if display_name and len(display_name) > DISPLAY_NAME_MAX_LENGTH:
+        errors.append(
+            RowError(
+                row,
+                "display_name",
+                f"Client DisplayName must be at most {DISPLAY_NAME_MAX_LENGTH} characters",
+            )
+        )
+    display_name = display_name.strip() if display_name else None
+
+    # Mirrors IncomeAPI.create_multiple_items() legal entity validation
+    if income_type == IncomeType.FROM_LEGAL_ENTITY.value:
+        if not inn:
+            errors.append(
+                RowError(row, "inn", "Client INN cannot be empty for legal entity")
+            )
+        if not display_name:
+            errors.append(
+                RowError(
+                    row,
+                    "display_name",
+                    "Client DisplayName cannot be empty for legal entity",
+                )
+            )
+
+    return errors
+
+
+def validate_clients(
+    records: Iterable[IncomeClient | Mapping[str, Any]],
+) -> list[RowError]:
+    """
+    Validate batch of client records without building pydantic models.
+
+    Args:
+        records: IncomeClient instances or raw mappings (e.g. CSV rows)
+
+    Returns:
+        Errors of all rows in row order (empty if every row is valid)
+    """
+    errors: list[RowError] = []
+    for row, record in enumerate(records):
+        errors.extend(validate_client(record, row))
+    return errors
@@ -0,0 +1,26 @@
+"""
+Shared fixtures.
+"""
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from nalogo.client import Client
+from nalogo.testing import FakeNalogService
+
+
+@pytest.fixture
+def login() -> Callable[..., Awaitable[Client]]:
+    """Factory of clients authenticated against FakeNalogService."""
+
+    async def login(service: FakeNalogService, **options: Any) -> Client:
+        """Client with options authenticated by emulator INN and password."""
+        client = Client(transport=service.transport(), **options)
+        await client.authenticate(
+            await client.create_new_access_token(service.inn, service.password)
+        )
+        return client
+
+    return login
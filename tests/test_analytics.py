@@ -0,0 +1,234 @@
+"""
+Tests for local income and tax analytics.
+"""
+
+from datetime import UTC, datetime
+
+import httpx
+import pytest
+import respx
+
+from nalogo.analytics import (
+    IncomeAnalytics,
+    IncomeColumns,
+    np,
+    percent_of,
+    tax_period_id,
+)
+from nalogo.client import Client
+from nalogo.dto.income import IncomeType
+from nalogo.mirror import IncomeMirror
+from nalogo.money import kopecks_to_decimal, to_kopecks
+
+BACKENDS = [
+    False,
+    pytest.param(
+        True, marks=pytest.mark.skipif(np is None, reason="NumPy not installed")
+    ),
+]
+
+
+def _income(uuid, when, amount, income_type, client_inn=None, *, cancelled=False):
+    """Build income record in listing format."""
+    return {
+        "approvedReceiptUuid": uuid,
+        "operationTime": when,
+        "totalAmount": amount,
+        "incomeType": income_type,
+        "clientInn": client_inn,
+        "cancellationInfo": {"comment": "Возврат средств"} if cancelled else None,
+    }
+
+
+@pytest.fixture
+def columns():
+    """Two accounts with January and February receipts."""
+    first = IncomeColumns.from_records(
+        [
+            _income("a", "2024-01-05T10:00:00+03:00", "1000.50", "FROM_INDIVIDUAL"),
+            _income(
+                "b", "2024-01-10T10:00:00Z", 2000, "FROM_LEGAL_ENTITY", "7707083893"
+            ),
+            _income(
+                "c", "2024-01-11T10:00:00Z", 500, "FROM_LEGAL_ENTITY", "7707083893"
+            ),
+            _income(
+                "d",
+                "2024-01-12T10:00:00Z",
+                999,
+                "FROM_INDIVIDUAL",
+                None,
+                cancelled=True,
+            ),
+            # 2024-01-31T22:00Z is already February in Moscow time
+            _income("e", "2024-01-31T22:00:00Z", 300, "FROM_INDIVIDUAL"),
+        ],
+        account="500100732259",
+    )
+    second = IncomeColumns.from_records(
+        [_income("f", "2024-01-20T10:00:00Z", 100, "FROM_FOREIGN_AGENCY")],
+        account="773400211252",
+    )
+    return IncomeColumns.concat([first, second])
+
+
+class TestIncomeAnalytics:
+    """Test grouped aggregations on both backends."""
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_income_totals(self, columns, use_numpy):
+        """Test per-account totals exclude cancelled receipts."""
+        analytics = IncomeAnalytics(columns, use_numpy=use_numpy)
+
+        assert analytics.income_totals(period=202401) == {
+            "500100732259": 350050,
+            "773400211252": 10000,
+        }
+        assert analytics.income_totals(period=202402) == {"500100732259": 30000}
+        assert analytics.income_totals(period=202312) == {}
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_client_totals(self, columns, use_numpy):
+        """Test per-client totals."""
+        analytics = IncomeAnalytics(columns, use_numpy=use_numpy)
+
+        assert analytics.client_totals(account="500100732259") == {
+            ("500100732259", None): 130050,
+            ("500100732259", "7707083893"): 250000,
+        }
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_tax_estimates(self, columns, use_numpy):
+        """Test 4%/6% tax estimate with and without deduction."""
+        analytics = IncomeAnalytics(columns, use_numpy=use_numpy)
+
+        estimates = analytics.tax_estimates(
+            202401, deduction_remaining={"500100732259": 1000}
+        )
+        first = estimates["500100732259"]
+
+        assert first.income == {
+            IncomeType.FROM_INDIVIDUAL: 100050,
+            IncomeType.FROM_LEGAL_ENTITY: 250000,
+        }
+        # 1000.50 * 4% = 40.02, 2500 * 6% = 150.00
+        assert first.nominal_tax == 4002 + 15000
+        # Deduction: 1% of 1000.50 = 10.01, then 2% of 2500 capped by rest
+        assert first.deduction_used == 1000
+        assert first.tax == 19002 - 1000
+        assert estimates["773400211252"].nominal_tax == 600
+
+    def test_month_to_date(self, columns):
+        """Test current period detection."""
+        analytics = IncomeAnalytics(columns, use_numpy=False)
+
+        assert analytics.month_to_date(datetime(2024, 2, 15, tzinfo=UTC)) == {
+            "500100732259": 30000
+        }
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_from_mirror(self, use_numpy):
+        """Test loading columns straight from IncomeMirror."""
+        mirror = IncomeMirror()
+        mirror.upsert(
+            _income("a", "2024-03-01T10:00:00Z", "10.10", "FROM_INDIVIDUAL", "1")
+        )
+        mirror.upsert(
+            _income(
+                "b", "2024-03-02T10:00:00Z", 5, "FROM_INDIVIDUAL", "1", cancelled=True
+            )
+        )
+
+        analytics = IncomeAnalytics(
+            IncomeColumns.from_mirror(mirror, account="x"), use_numpy=use_numpy
+        )
+
+        assert analytics.income_totals() == {"x": 1010}
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_columns_grow_after_query(self, columns, use_numpy):
+        """Test columns can be appended to after a query."""
+        analytics = IncomeAnalytics(columns, use_numpy=use_numpy)
+        assert analytics.income_totals(period=202402) == {"500100732259": 30000}
+
+        extra = IncomeColumns.from_records(
+            [_income("g", "2024-02-10T10:00:00Z", 1, "FROM_INDIVIDUAL")],
+            account="500100732259",
+        )
+        for name in ("account", "client", "period", "income_type", "amount"):
+            getattr(columns, name).extend(getattr(extra, name))
+        columns.cancelled.append(0)
+
+        assert analytics.income_totals(period=202402) == {"500100732259": 30100}
+
+    def test_unknown_income_type_skipped(self):
+        """Test receipts without known income type are counted, not taxed."""
+        columns = IncomeColumns.from_records(
+            [
+                _income("a", "2024-01-05T10:00:00Z", 100, "FROM_INDIVIDUAL"),
+                _income("b", "2024-01-05T10:00:00Z", 100, "FROM_MARS"),
+                _income("c", "2024-01-05T10:00:00Z", 100, None),
+            ],
+            account="x",
+        )
+
+        assert len(columns) == 1
+        assert columns.skipped == 2
+        assert IncomeColumns.concat([columns, columns]).skipped == 4
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    async def test_tax_matches_tax_api(self, use_numpy):
+        """Test estimate against TaxAPI.get() data for the same receipts."""
+        records = [
+            _income("a", "2024-01-05T10:00:00+03:00", "1000.50", "FROM_INDIVIDUAL"),
+            _income("b", "2024-01-10T10:00:00Z", "2499.99", "FROM_LEGAL_ENTITY"),
+            _income("c", "2024-01-11T10:00:00Z", "0.07", "FROM_FOREIGN_AGENCY"),
+            _income(
+                "d",
+                "2024-01-12T10:00:00Z",
+                999,
+                "FROM_INDIVIDUAL",
+                None,
+                cancelled=True,
+            ),
+        ]
+        # /taxes response for January 2024 of these receipts
+        taxes = {
+            "taxPeriodId": 202401,
+            "nominalTax": 190.02,
+            "bonusAmount": 60.01,
+            "totalForPayment": 130.01,
+            "regions": [],
+        }
+        client = Client()
+        await client.authenticate('{"token": "t"}')
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/taxes").mock(return_value=httpx.Response(200, json=taxes))
+            data = await client.tax().get()
+
+        analytics = IncomeAnalytics(
+            IncomeColumns.from_records(records, account="x"), use_numpy=use_numpy
+        )
+        estimate = analytics.tax_estimates(
+            data["taxPeriodId"],
+            deduction_remaining={"x": to_kopecks(data["bonusAmount"])},
+        )["x"]
+
+        assert estimate.nominal_tax == to_kopecks(data["nominalTax"])
+        assert estimate.tax == to_kopecks(data["totalForPayment"])
+
+
+class TestHelpers:
+    """Test kopeck helpers."""
+
+    def test_percent_rounding(self):
+        """Test half-up rounding of tax to kopecks."""
+        assert percent_of(12, 4) == 0
+        assert percent_of(13, 4) == 1
+        assert percent_of(100050, 4) == 4002
+
+    def test_conversions(self):
+        """Test kopecks to rubles and tax periods."""
+        assert str(kopecks_to_decimal(350050)) == "3500.50"
+        assert tax_period_id(datetime(2023, 12, 31, 21, 30, tzinfo=UTC)) == 202401
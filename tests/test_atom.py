@@ -0,0 +1,105 @@
+"""
+Tests for cached ATOM timestamp formatting.
+"""
+
+import random
+from datetime import UTC, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from nalogo.dto.atom import AtomFormatter, atom_formatter
+from nalogo.dto.income import (
+    AtomDateTime,
+    CancelCommentType,
+    CancelRequest,
+    IncomeRequest,
+    IncomeServiceItem,
+)
+
+
+def _reference(dt: datetime) -> str:
+    """Original AtomDateTime.serialize_datetime implementation."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    elif dt.tzinfo != UTC:
+        dt = dt.astimezone(UTC)
+    return dt.isoformat().replace("+00:00", "Z")
+
+
+class TestAtomFormatter:
+    """Test formatter output and cache."""
+
+    def test_byte_identical_to_isoformat(self):
+        """Test random datetimes in several zones format identically."""
+        rng = random.Random(42)
+        zones = [
+            None,
+            UTC,
+            timezone(timedelta(hours=3)),
+            timezone(timedelta(hours=-5, minutes=-30)),
+            ZoneInfo("Europe/Moscow"),
+        ]
+        formatter = AtomFormatter()
+        base = datetime(1969, 12, 31, 23, 59, 58)
+
+        for _ in range(5000):
+            naive = base + timedelta(
+                seconds=rng.randrange(0, 2_000_000_000),
+                microseconds=rng.choice([0, rng.randrange(0, 1_000_000)]),
+            )
+            dt = naive.replace(tzinfo=rng.choice(zones))
+            assert formatter.format(dt) == _reference(dt)
+
+    @pytest.mark.parametrize(
+        "dt",
+        [
+            datetime(1970, 1, 1, tzinfo=UTC),
+            datetime(1969, 12, 31, 23, 59, 59, 999999, tzinfo=UTC),
+            datetime(2024, 2, 29, 23, 59, 59, 999999, tzinfo=UTC),
+            datetime(2024, 3, 1, 2, 59, 59, 1, tzinfo=timezone(timedelta(hours=3))),
+        ],
+    )
+    def test_boundaries(self, dt):
+        """Test second and day boundaries around cached prefix."""
+        formatter = AtomFormatter()
+        formatter.format(dt + timedelta(microseconds=1))
+        assert formatter.format(dt) == _reference(dt)
+
+    def test_pluggable_clock(self):
+        """Test clock drives now() and request defaults."""
+        fixed = datetime(2024, 1, 1, 12, 0, 0, 500, tzinfo=UTC)
+        original = atom_formatter.clock
+        atom_formatter.clock = lambda: fixed
+        try:
+            assert atom_formatter.now_text() == "2024-01-01T12:00:00.000500Z"
+            dump = CancelRequest(
+                comment=CancelCommentType.CANCEL, receipt_uuid="a"
+            ).model_dump()
+        finally:
+            atom_formatter.clock = original
+
+        assert dump["operationTime"] == dump["requestTime"]
+        assert dump["requestTime"] == "2024-01-01T12:00:00.000500Z"
+
+
+class TestRawDatetimeRequests:
+    """Test requests built from raw datetimes."""
+
+    def test_raw_and_wrapped_are_identical(self):
+        """Test raw datetime fields serialize like AtomDateTime fields."""
+        when = datetime(2024, 1, 1, 15, 0, tzinfo=timezone(timedelta(hours=3)))
+        services = [IncomeServiceItem(name="A", amount=1, quantity=1)]
+
+        raw = IncomeRequest(
+            operation_time=when, request_time=when, services=services, total_amount="1"
+        )
+        wrapped = IncomeRequest(
+            operation_time=AtomDateTime.from_datetime(when),
+            request_time=AtomDateTime.from_datetime(when),
+            services=services,
+            total_amount="1",
+        )
+
+        assert raw.model_dump() == wrapped.model_dump()
+        assert raw.model_dump()["operationTime"] == "2024-01-01T12:00:00Z"
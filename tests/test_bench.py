@@ -0,0 +1,183 @@
+"""
+Tests for load generator and pooled HTTP client.
+"""
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+import respx
+
+from nalogo.bench import LatencyHistogram, LoadGenerator, main, parse_mix
+from nalogo.client import Client
+from nalogo.testing import FakeNalogService
+
+
+class TestParseMix:
+    """Test operation mix parsing."""
+
+    def test_weights(self):
+        """Test weights, default weight 1 and zero weights dropped."""
+        assert parse_mix("create=3, cancel=1,taxes") == {
+            "create": 3,
+            "cancel": 1,
+            "taxes": 1,
+        }
+        assert parse_mix("create=1,receipt=0") == {"create": 1}
+
+    @pytest.mark.parametrize("text", ["", "create=0", "upload=1", "create=x"])
+    def test_invalid(self, text):
+        """Test empty, all-zero, unknown and non-numeric mixes are rejected."""
+        with pytest.raises(ValueError):
+            parse_mix(text)
+
+
+class TestLatencyHistogram:
+    """Test bucketed percentiles."""
+
+    def test_percentiles_within_precision(self):
+        """Test percentiles stay within bucket precision with few buckets."""
+        histogram = LatencyHistogram(significant_digits=2)
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+
+        assert histogram.count == 1000
+        for q, expected in ((50, 500_000), (99, 990_000), (100, 1_000_000)):
+            assert histogram.percentile(q) == pytest.approx(expected, rel=0.01)
+        assert len(histogram.counts) < 200
+
+    def test_empty(self):
+        """Test empty histogram reports zeros."""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0
+        assert histogram.summary()["count"] == 0
+
+    def test_hdr_text(self):
+        """Test HdrHistogram percentile text output."""
+        histogram = LatencyHistogram()
+        histogram.record(0.002)
+        histogram.record(0.004)
+
+        text = histogram.to_hdr_text()
+        assert "1/(1-Percentile)" in text
+        assert "Total count =            2" in text
+
+
+class TestLoadGenerator:
+    """Test load generation against emulator."""
+
+    @pytest.mark.asyncio
+    async def test_closed_loop(self, login):
+        """Test fixed request count with bounded concurrency on one pooled client."""
+        service = FakeNalogService()
+        async with await login(service) as client:
+            report = await LoadGenerator(client, seed=1).run(
+                concurrency=4, duration=None, requests=40
+            )
+
+        assert report.completed == 40
+        assert sum(h.count for h in report.histograms.values()) == 40
+        assert report.pool["peak_in_flight"] <= 4
+        assert report.pool["clients_created"] == 1
+        assert not report.errors
+
+    @pytest.mark.asyncio
+    async def test_open_loop_counts_errors_by_class(self, login):
+        """Test open loop at fixed rate counts errors by exception class."""
+        service = FakeNalogService()
+        client = await login(service)
+        service.error_rate = 1.0
+
+        report = await LoadGenerator(client, {"taxes": 1}).run(
+            concurrency=4, duration=None, requests=10, rate=500
+        )
+
+        assert report.completed == 10
+        assert report.errors == {"ServerException": 10}
+        assert report.to_dict()["latency"]["taxes"]["count"] == 10
+
+    @pytest.mark.asyncio
+    async def test_invalid_settings(self):
+        """Test run without a stop condition or concurrency is rejected."""
+        client = Client()
+        with pytest.raises(ValueError):
+            await LoadGenerator(client).run(duration=None, requests=None)
+        with pytest.raises(ValueError):
+            await LoadGenerator(client).run(concurrency=0)
+
+    def test_cli(self, tmp_path, capsys):
+        """Test CLI against emulator writes summary and HDR files."""
+        output = tmp_path / "summary.json"
+        hdr = tmp_path / "latency.hdr"
+
+        code = main(
+            [
+                "--fake",
+                "--fake-latency=0",
+                "--requests=20",
+                "--mix=create=1,receipt=1",
+                f"--output={output}",
+                f"--hdr={hdr}",
+            ]
+        )
+
+        assert code == 0
+        assert "throughput" in capsys.readouterr().out
+        assert json.loads(output.read_text())["completed"] == 20
+        assert "Total count" in hdr.read_text()
+
+
+class TestPooledClient:
+    """Test shared HTTP client lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_reused_and_closed(self, login):
+        """Test one client serves requests and is recreated after aclose."""
+        service = FakeNalogService()
+        client = await login(service)
+
+        await client.user().get()
+        await client.tax().get()
+        assert client.http_client.clients_created == 1
+
+        await client.aclose()
+        await client.user().get()
+        assert client.http_client.clients_created == 2
+        await client.aclose()
+
+    def test_loop_switch_closes_old_client(self):
+        """Test client of a loop still running elsewhere is closed there."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        client = Client()
+        try:
+            with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+                respx_mock.get("/user").mock(
+                    return_value=httpx.Response(200, json={"inn": "1"})
+                )
+                asyncio.run_coroutine_threadsafe(
+                    client.authenticate('{"token": "t"}'), loop
+                ).result(5)
+                asyncio.run_coroutine_threadsafe(client.user().get(), loop).result(5)
+                old = client.http_client._client
+                assert old is not None
+
+                asyncio.run(client.user().get())
+                # aclose() was scheduled on the old loop; wait for it there
+                for _ in range(100):
+                    if old.is_closed:
+                        break
+                    asyncio.run_coroutine_threadsafe(asyncio.sleep(0.01), loop).result(
+                        5
+                    )
+
+            assert old.is_closed
+            assert client.http_client._client is not old
+            assert client.http_client.clients_created == 2
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
@@ -0,0 +1,55 @@
+"""
+Tests for benchmark regression checks.
+"""
+
+import pytest
+
+from benchmarks.suite import compare, load, save
+
+
+class TestRegressionCheck:
+    """Test comparison of benchmark results with baseline."""
+
+    def test_direction_per_metric(self):
+        """Test throughput must not drop and latency must not grow."""
+        baseline = {"create_ops_per_sec": 1000.0, "create_p99_ms_c8": 10.0}
+
+        assert compare({"create_ops_per_sec": 950.0}, baseline, 0.1) == []
+        assert compare({"create_p99_ms_c8": 8.0}, baseline, 0.1) == []
+
+        slower = compare({"create_ops_per_sec": 800.0}, baseline, 0.1)
+        assert [r.name for r in slower] == ["create_ops_per_sec"]
+        assert slower[0].change == pytest.approx(-0.2)
+
+        later = compare({"create_p99_ms_c8": 12.0}, baseline, 0.1)
+        assert [r.name for r in later] == ["create_p99_ms_c8"]
+
+    def test_absolute_floor(self):
+        """Test sub-microsecond noise is ignored and zero baseline compared."""
+        baseline = {"status_ok_us": 0.05, "middleware_each_us": 0.0}
+
+        assert compare({"status_ok_us": 0.2}, baseline, 0.1) == []
+        assert compare({"middleware_each_us": 0.2}, baseline, 0.1) == []
+
+        slower = compare(
+            {"status_ok_us": 0.5, "middleware_each_us": 1.0}, baseline, 0.1
+        )
+        assert [r.name for r in slower] == ["status_ok_us", "middleware_each_us"]
+        assert slower[0].change == pytest.approx(9.0)
+        assert slower[1].change == float("inf")
+
+    def test_new_metrics_are_skipped(self):
+        """Test metrics missing from baseline are not regressions."""
+        assert compare({"new_metric_us": 5.0}, {}, 0.1) == []
+
+    def test_invalid_threshold(self):
+        """Test negative threshold is rejected."""
+        with pytest.raises(ValueError):
+            compare({}, {}, -1)
+
+    def test_save_and_load(self, tmp_path):
+        """Test results round-trip through the JSON file."""
+        path = tmp_path / "results.json"
+        save(path, {"status_ok_us": 0.1})
+
+        assert load(path) == {"status_ok_us": 0.1}
@@ -0,0 +1,85 @@
+"""
+Tests for JSON codec backends.
+"""
+
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.codec import JSONCodec, OrjsonCodec, default_codec, orjson
+
+CODECS = [
+    JSONCodec,
+    pytest.param(
+        OrjsonCodec,
+        marks=pytest.mark.skipif(orjson is None, reason="orjson not installed"),
+    ),
+]
+
+
+class TestCodec:
+    """Test codec backends produce the same wire format."""
+
+    @pytest.mark.parametrize("codec_class", CODECS)
+    def test_dumps_matches_httpx(self, codec_class):
+        """Test encoding is identical to httpx json= body."""
+        data = {"name": "Услуга", "amount": "100.50", "items": [1, 2.5, None, True]}
+
+        body = codec_class().dumps(data)
+
+        assert body == httpx.Request("POST", "https://x", json=data).content
+
+    @pytest.mark.parametrize("codec_class", CODECS)
+    def test_decimal_and_loads(self, codec_class):
+        """Test Decimal is serialized as string and bytes are decoded."""
+        codec = codec_class()
+
+        assert codec.dumps({"total": Decimal("0.10")}) == b'{"total":"0.10"}'
+        assert codec.loads('{"a":"ы"}'.encode()) == {"a": "ы"}
+        with pytest.raises(json.JSONDecodeError):
+            codec.loads(b"{")
+        with pytest.raises(TypeError):
+            codec.dumps({"x": object()})
+
+    def test_default_codec(self):
+        """Test orjson backend is preferred when installed."""
+        expected = OrjsonCodec if orjson is not None else JSONCodec
+        assert type(default_codec()) is expected
+
+
+class TestClientCodec:
+    """Test codec wiring in Client."""
+
+    @pytest.mark.asyncio
+    async def test_access_token_not_reserialized(self):
+        """Test get_access_token returns token JSON as authenticated."""
+        client = Client(codec=JSONCodec())
+        token = '{"token": "t", "profile": {"inn": "1", "displayName": "Ы"}}'
+
+        await client.authenticate(token)
+
+        assert await client.get_access_token() == token
+        assert client._user_profile == {"inn": "1", "displayName": "Ы"}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("codec_class", CODECS)
+    async def test_request_and_response(self, codec_class):
+        """Test API bodies are encoded and decoded with client codec."""
+        client = Client(codec=codec_class())
+        await client.authenticate('{"token": "t"}')
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/taxes/history").mock(
+                return_value=httpx.Response(200, content=b'{"records":[]}')
+            )
+
+            result = await client.tax().history(oktmo="45000000")
+
+        request = route.calls[0].request
+        assert request.headers["Content-Type"] == "application/json"
+        assert json.loads(request.content) == {"oktmo": "45000000"}
+        assert result == {"records": []}
@@ -0,0 +1,130 @@
+"""
+Tests for fast-path income request DTOs.
+"""
+
+import json
+from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.dto.fast import FastClient, FastIncomeRequest, FastServiceItem
+from nalogo.dto.income import (
+    AtomDateTime,
+    IncomeClient,
+    IncomeRequest,
+    IncomeServiceItem,
+    IncomeType,
+)
+
+
+def _pydantic_request(operation_time, request_time, client):
+    services = [
+        IncomeServiceItem(name="Consulting", amount=Decimal("1500.50"), quantity=2),
+        IncomeServiceItem(
+            name="Support", amount=Decimal("100"), quantity=Decimal("0.5")
+        ),
+    ]
+    return IncomeRequest(
+        operation_time=AtomDateTime.from_datetime(operation_time),
+        request_time=AtomDateTime.from_datetime(request_time),
+        services=services,
+        total_amount=str(sum(item.get_total_amount() for item in services)),
+        client=client,
+    )
+
+
+class TestFastIncomeRequest:
+    """Test wire compatibility with IncomeRequest.model_dump()."""
+
+    @pytest.mark.parametrize(
+        "client",
+        [
+            IncomeClient(),
+            IncomeClient(
+                income_type=IncomeType.FROM_LEGAL_ENTITY,
+                inn="7707083893",
+                display_name="ООО Ромашка",
+                contact_phone="+79000000000",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize(
+        "operation_time",
+        [
+            datetime(2024, 1, 1, 12, 0, tzinfo=UTC),
+            datetime(2024, 1, 1, 15, 0, 0, 123456, tzinfo=timezone(timedelta(hours=3))),
+            datetime(2024, 1, 1, 12, 0),
+        ],
+    )
+    def test_same_json_as_pydantic(self, client, operation_time):
+        """Test fast request serializes byte-identically."""
+        request_time = datetime(2024, 1, 1, 12, 0, 1, tzinfo=UTC)
+        model = _pydantic_request(operation_time, request_time, client)
+
+        fast = FastIncomeRequest(
+            operation_time=operation_time,
+            request_time=request_time,
+            services=[
+                FastServiceItem("Consulting", Decimal("1500.50"), Decimal(2)),
+                FastServiceItem("Support", Decimal("100"), Decimal("0.5")),
+            ],
+            total_amount=model.total_amount,
+            client=FastClient.from_model(client),
+        )
+
+        assert json.dumps(fast.to_json()) == json.dumps(model.model_dump())
+        assert fast.to_json() == FastIncomeRequest.from_model(model).to_json()
+
+    def test_build_total_and_defaults(self):
+        """Test build() computes total like create_multiple_items()."""
+        request = FastIncomeRequest.build(
+            [FastServiceItem("A", Decimal("10.10"), Decimal(3))]
+        )
+
+        assert request.total_amount == "30.30"
+        assert request.operation_time == request.request_time
+        assert request.to_json()["client"] == IncomeClient().model_dump()
+
+    def test_slots(self):
+        """Test fast DTOs do not carry per-instance dicts."""
+        assert not hasattr(FastServiceItem("A", Decimal(1)), "__dict__")
+
+
+class TestCreateTrustedItems:
+    """Test IncomeAPI fast path."""
+
+    @pytest.mark.asyncio
+    async def test_create_trusted_items(self):
+        """Test fast path sends the same body as create_multiple_items()."""
+        client = Client()
+        await client.authenticate(
+            json.dumps({"token": "test_access_token", "profile": {"inn": "1"}})
+        )
+        when = datetime(2024, 1, 1, 12, 0, tzinfo=UTC)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/income").mock(
+                return_value=httpx.Response(200, json={"approvedReceiptUuid": "a"})
+            )
+
+            await client.income().create("Service", "100.50", 2, operation_time=when)
+            result = await client.income().create_trusted_items(
+                [FastServiceItem("Service", Decimal("100.50"), Decimal(2))],
+                operation_time=when,
+            )
+
+        assert result == {"approvedReceiptUuid": "a"}
+        slow, fast = (json.loads(call.request.content) for call in route.calls)
+        slow.pop("requestTime")
+        fast.pop("requestTime")
+        assert fast == slow
+
+    @pytest.mark.asyncio
+    async def test_empty_services(self):
+        """Test fast path still rejects empty receipts."""
+        with pytest.raises(ValueError, match="Services cannot be empty"):
+            await Client().income().create_trusted_items([])
@@ -0,0 +1,170 @@
+"""
+Tests for receipt change feed.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.dto.income import CancelCommentType
+from nalogo.exceptions import DeadlineExceededException
+from nalogo.feed import ChangeFeed, FeedCheckpoint
+
+
+def _income(uuid: str, day: int, cancelled: bool = False) -> dict:
+    """Build income record in listing format."""
+    return {
+        "approvedReceiptUuid": uuid,
+        "operationTime": f"2024-01-{day:02d}T12:00:00Z",
+        "totalAmount": 100,
+        "cancellationInfo": {"comment": "Возврат средств"} if cancelled else None,
+    }
+
+
+def _listing(records: list[dict]) -> httpx.Response:
+    return httpx.Response(200, json={"content": records, "hasMore": False})
+
+
+@pytest.fixture
+async def client():
+    """Authenticated client."""
+    client = Client()
+    await client.authenticate(
+        json.dumps({"token": "test_access_token", "profile": {"inn": "123456789012"}})
+    )
+    return client
+
+
+class TestChangeFeed:
+    """Test ChangeFeed polling, dedupe and local events."""
+
+    @pytest.mark.asyncio
+    async def test_poll_dedupes_by_uuid_and_status(self, client):
+        """Test poll emits each transition once."""
+        feed = ChangeFeed(client.income(), replay_existing=True)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/incomes")
+            route.return_value = _listing([_income("a", 1), _income("b", 2)])
+            first = await feed.poll()
+            for event in first:
+                feed._commit(event)
+
+            route.return_value = _listing(
+                [_income("a", 1, cancelled=True), _income("b", 2), _income("c", 3)]
+            )
+            second = await feed.poll()
+
+        assert [(e.kind, e.receipt_uuid) for e in first] == [
+            ("created", "a"),
+            ("created", "b"),
+        ]
+        assert [(e.kind, e.receipt_uuid) for e in second] == [
+            ("cancelled", "a"),
+            ("created", "c"),
+        ]
+        assert route.calls[-1].request.url.params["from"].startswith("2023-12-02")
+
+    @pytest.mark.asyncio
+    async def test_fresh_checkpoint_seeds_without_replay(self, client):
+        """Test existing receipts are not emitted by default."""
+        feed = ChangeFeed(client.income())
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/incomes").return_value = _listing([_income("a", 1)])
+            assert await feed.poll() == []
+
+        assert feed.checkpoint.status("a") == "REGISTERED"
+
+    @pytest.mark.asyncio
+    async def test_iteration_with_local_events(self, client, tmp_path):
+        """Test own create/cancel are emitted immediately and persisted."""
+        checkpoint_path = str(tmp_path / "feed.json")
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/incomes").return_value = _listing([])
+            respx_mock.post("/income").return_value = httpx.Response(
+                200, json={"approvedReceiptUuid": "own"}
+            )
+            respx_mock.post("/cancel").return_value = httpx.Response(200, json={})
+
+            async with client.change_feed(
+                checkpoint_path, min_interval=60, max_interval=60
+            ) as feed:
+                events = aiter(feed)
+                await client.income().create("Service", 100)
+                created = await anext(events)
+                await client.income().cancel("own", CancelCommentType.CANCEL)
+                cancelled = await anext(events)
+                await events.aclose()
+
+            assert feed not in client.income_listeners
+
+        assert (created.kind, created.source) == ("created", "local")
+        assert (cancelled.kind, cancelled.receipt_uuid) == ("cancelled", "own")
+
+        # Cancel event was never acknowledged by requesting the next event,
+        # so it will be delivered again after restart (at-least-once)
+        restored = FeedCheckpoint(checkpoint_path)
+        assert restored.status("own") == "REGISTERED"
+        assert restored.watermark is not None
+
+    @pytest.mark.asyncio
+    async def test_aclose_wakes_pending_wait(self, client):
+        """Test aclose() ends iteration without waiting for the next poll."""
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/incomes").return_value = _listing([])
+            feed = client.change_feed(min_interval=60, max_interval=60)
+
+            async def consume() -> list:
+                return [event async for event in feed]
+
+            task = asyncio.create_task(consume())
+            await asyncio.sleep(0.01)
+            await feed.aclose()
+            assert await asyncio.wait_for(task, timeout=1) == []
+
+        assert feed not in client.income_listeners
+
+    @pytest.mark.asyncio
+    async def test_timeouts_are_retried(self, client):
+        """Test deadline and timeout errors back off instead of ending iteration."""
+        feed = ChangeFeed(
+            client.income(), replay_existing=True, min_interval=0.01, max_interval=0.02
+        )
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/incomes").mock(
+                side_effect=[
+                    DeadlineExceededException("Deadline exceeded", 0.1),
+                    TimeoutError(),
+                    _listing([_income("a", 1)]),
+                ]
+            )
+            event = await asyncio.wait_for(anext(aiter(feed)), timeout=1)
+            await feed.aclose()
+
+        assert event.receipt_uuid == "a"
+        assert route.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_adaptive_interval(self, client):
+        """Test interval backs off when idle and resets on events."""
+        feed = ChangeFeed(client.income(), min_interval=1, max_interval=5, backoff=2)
+
+        feed.interval = feed._next_interval(False)
+        feed.interval = feed._next_interval(False)
+        feed.interval = feed._next_interval(False)
+        assert feed.interval == 5
+
+        feed.interval = feed._next_interval(True)
+        assert feed.interval == 1
+
+    def test_invalid_intervals(self, client):
+        """Test validation of poll intervals."""
+        with pytest.raises(ValueError, match="Intervals must satisfy"):
+            ChangeFeed(client.income(), min_interval=10, max_interval=1)
@@ -0,0 +1,232 @@
+"""
+Tests for hedged requests.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from nalogo.client import Client
+from nalogo.hedging import HedgePolicy
+from nalogo.metrics import HTTPMetrics
+from nalogo.scheduler import RequestScheduler
+
+
+class SlowFirstHandler:
+    """Mock transport handler answering the first call after delay."""
+
+    def __init__(self, first_delay: float, first_error: bool = False):
+        self.first_delay = first_delay
+        self.first_error = first_error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        call = self.calls
+        try:
+            if call == 1:
+                await asyncio.sleep(self.first_delay)
+                if self.first_error:
+                    raise httpx.ConnectError("reset", request=request)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return httpx.Response(200, json={"call": call})
+
+
+def _warm(policy: HedgePolicy, path: str = "/user", seconds: float = 0.01) -> None:
+    """Give policy enough latency samples to hedge path."""
+    for _ in range(policy.min_samples):
+        policy.latencies.observe("GET", path, seconds)
+
+
+def _client(handler: SlowFirstHandler, policy: HedgePolicy, **kwargs) -> Client:
+    """Client with hedging over mock transport."""
+    return Client(transport=httpx.MockTransport(handler), hedging=policy, **kwargs)
+
+
+class TestHedgePolicy:
+    """Test eligibility, delay and budget."""
+
+    def test_eligible(self):
+        """Test method and path prefix filters."""
+        policy = HedgePolicy(paths=("/receipt", "/user"))
+
+        assert policy.eligible("GET", "/user")
+        assert policy.eligible("GET", "/receipt/1/2/json")
+        assert not policy.eligible("GET", "/taxes")
+        assert not policy.eligible("POST", "/user")
+
+    def test_delay_needs_samples(self):
+        """Test delay is the latency percentile once enough samples exist."""
+        policy = HedgePolicy(percentile=50, min_samples=3, min_delay=0.02)
+
+        assert policy.delay_for("GET", "/user") is None
+        for seconds in (0.01, 0.05, 0.09):
+            policy.latencies.observe("GET", "/user", seconds)
+
+        assert policy.delay_for("GET", "/user") == 0.05
+        policy.latencies.observe("GET", "/fast", 0.001)
+        assert policy.delay_for("GET", "/fast") is None
+        assert policy.requests == 3
+
+    def test_budget(self):
+        """Test token bucket limits hedges to the budget."""
+        policy = HedgePolicy(budget=0.5, burst=1)
+
+        assert policy.acquire()
+        assert not policy.acquire()
+        policy.delay_for("GET", "/user")
+        policy.delay_for("GET", "/user")
+        assert policy.acquire()
+        assert policy.stats() == {
+            "requests": 2,
+            "hedged": 2,
+            "hedge_wins": 0,
+            "denied": 1,
+            "busy": 0,
+            "hedge_rate": 1.0,
+        }
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"percentile": 0},
+            {"budget": 0},
+            {"budget": 2},
+            {"burst": 0.5},
+            {"min_delay": -1},
+            {"window": 5, "min_samples": 6},
+        ],
+    )
+    def test_validation(self, kwargs):
+        """Test out of range parameters are rejected."""
+        with pytest.raises(ValueError):
+            HedgePolicy(**kwargs)
+
+
+class TestHedgingMiddleware:
+    """Test hedged requests through the client."""
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_primary_cancelled(self):
+        """Test faster hedge wins and slow primary is cancelled."""
+        handler = SlowFirstHandler(first_delay=1.0)
+        policy = HedgePolicy()
+        _warm(policy)
+        metrics = HTTPMetrics()
+        client = _client(handler, policy, metrics=metrics)
+
+        result = await asyncio.wait_for(client.user().get(), 0.5)
+
+        assert result == {"call": 2}
+        assert handler.cancelled == 1
+        assert policy.hedged == 1
+        assert policy.hedge_wins == 1
+        assert metrics.hedges.get(("GET", "/user", "sent")) == 1
+        assert metrics.hedges.get(("GET", "/user", "won")) == 1
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_not_hedged(self):
+        """Test primary answering before the delay sends no hedge."""
+        handler = SlowFirstHandler(first_delay=0)
+        policy = HedgePolicy()
+        _warm(policy, seconds=0.2)
+        client = _client(handler, policy)
+
+        assert await client.user().get() == {"call": 1}
+        assert handler.calls == 1
+        assert policy.hedge_rate == 0
+
+    @pytest.mark.asyncio
+    async def test_no_samples_no_hedge(self):
+        """Test endpoint without enough samples is not hedged."""
+        handler = SlowFirstHandler(first_delay=0.05)
+        policy = HedgePolicy(min_samples=2)
+        client = _client(handler, policy)
+
+        await client.user().get()
+
+        assert handler.calls == 1
+        assert policy.latencies.count("GET", "/user") == 1
+
+    @pytest.mark.asyncio
+    async def test_budget_exhausted(self):
+        """Test hedge is denied when the budget is spent."""
+        handler = SlowFirstHandler(first_delay=0.05)
+        policy = HedgePolicy(burst=1)
+        policy.tokens = 0
+        _warm(policy, seconds=0.001)
+        metrics = HTTPMetrics()
+        client = _client(handler, policy, metrics=metrics)
+
+        assert await client.user().get() == {"call": 1}
+        assert handler.calls == 1
+        assert policy.denied == 1
+        assert metrics.hedges.get(("GET", "/user", "denied")) == 1
+
+    @pytest.mark.asyncio
+    async def test_primary_error_hedge_succeeds(self):
+        """Test failed primary falls back to the hedge response."""
+        handler = SlowFirstHandler(first_delay=0.05, first_error=True)
+        policy = HedgePolicy()
+        _warm(policy, seconds=0.001)
+        client = _client(handler, policy)
+
+        assert await client.user().get() == {"call": 2}
+
+    @pytest.mark.asyncio
+    async def test_post_not_hedged(self):
+        """Test non-idempotent methods are never hedged."""
+        handler = SlowFirstHandler(first_delay=0.05)
+        policy = HedgePolicy(methods=("GET",))
+        _warm(policy, seconds=0.001)
+        client = _client(handler, policy)
+
+        await client.http_client.post("/user", json_data={})
+
+        assert handler.calls == 1
+        assert policy.requests == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_skipped_without_free_slot(self):
+        """Test hedge is not sent when the scheduler has no free slot."""
+        handler = SlowFirstHandler(first_delay=0.05)
+        policy = HedgePolicy()
+        _warm(policy, seconds=0.001)
+        metrics = HTTPMetrics()
+        scheduler = RequestScheduler(concurrency=1)
+        client = _client(handler, policy, metrics=metrics, scheduler=scheduler)
+
+        assert await client.user().get() == {"call": 1}
+        assert handler.calls == 1
+        assert policy.busy == 1
+        assert policy.tokens == policy.burst
+        assert metrics.hedges.get(("GET", "/user", "busy")) == 1
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_hedge_holds_scheduler_slot(self):
+        """Test hedge takes a slot of its own and releases it when done."""
+        handler = SlowFirstHandler(first_delay=1.0)
+        policy = HedgePolicy()
+        _warm(policy)
+        scheduler = RequestScheduler(concurrency=2)
+        active: list[int] = []
+
+        async def observed(request: httpx.Request) -> httpx.Response:
+            active.append(scheduler.active)
+            return await handler(request)
+
+        client = Client(
+            transport=httpx.MockTransport(observed),
+            hedging=policy,
+            scheduler=scheduler,
+        )
+
+        assert await asyncio.wait_for(client.user().get(), 0.5) == {"call": 2}
+        assert active == [1, 2]
+        assert scheduler.active == 0
+        assert scheduler.stats()["interactive"]["served"] == 2
@@ -3,7 +3,10 @@ Async tests for Income API functionality.
 Tests income creation, cancellation, and validation.
 """
 
+import asyncio
+import contextlib
 import json
+from datetime import UTC, datetime
 from decimal import Decimal
 
 import httpx
@@ -130,7 +133,7 @@ class TestIncomeAPI:
                 contact_phone="+79001234567",
                 display_name="Custom Client",
                 income_type=IncomeType.FROM_INDIVIDUAL,
-                inn="123456789012",
+                inn="500100732259",
             )
 
             income_api = client.income()
@@ -202,7 +205,7 @@ class TestIncomeAPI:
             legal_client = IncomeClient(
                 display_name="LLC Company",
                 income_type=IncomeType.FROM_LEGAL_ENTITY,
-                inn="1234567890",  # 10 digits for legal entity
+                inn="7707083893",  # 10 digits for legal entity
             )
 
             income_api = client.income()
@@ -244,7 +247,7 @@ class TestIncomeAPI:
         legal_client = IncomeClient(
             display_name=None,  # Missing display name
             income_type=IncomeType.FROM_LEGAL_ENTITY,
-            inn="1234567890",
+            inn="7707083893",
         )
 
         income_api = client.income()
@@ -390,7 +393,7 @@ class TestIncomeClient:
             contact_phone="+79001234567",
             display_name="Test Client",
             income_type=IncomeType.FROM_LEGAL_ENTITY,
-            inn="1234567890",
+            inn="7707083893",
         )
 
         serialized = client.model_dump()
@@ -399,18 +402,18 @@ class TestIncomeClient:
             "contactPhone": "+79001234567",
             "displayName": "Test Client",
             "incomeType": "FROM_LEGAL_ENTITY",
-            "inn": "1234567890",
+            "inn": "7707083893",
         }
 
     def test_inn_validation_valid_lengths(self):
         """Test INN validation for valid lengths (10 and 12 digits)."""
         # 10 digits for legal entity
-        client1 = IncomeClient(inn="1234567890")
-        assert client1.inn == "1234567890"
+        client1 = IncomeClient(inn="7707083893")
+        assert client1.inn == "7707083893"
 
         # 12 digits for individual
-        client2 = IncomeClient(inn="123456789012")
-        assert client2.inn == "123456789012"
+        client2 = IncomeClient(inn="500100732259")
+        assert client2.inn == "500100732259"
 
     def test_inn_validation_invalid_length(self):
         """Test INN validation for invalid length."""
@@ -421,3 +424,143 @@ class TestIncomeClient:
         """Test INN validation for non-numeric input."""
         with pytest.raises(ValueError, match="INN must contain only numbers"):
             IncomeClient(inn="12345abcde")
+
+    def test_inn_validation_checksum(self):
+        """Test INN validation of control digits."""
+        with pytest.raises(ValueError, match="INN checksum is invalid"):
+            IncomeClient(inn="1234567890")
+        with pytest.raises(ValueError, match="INN checksum is invalid"):
+            IncomeClient(inn="500100732258")
+
+
+def _listing_side_effect(total: int, calls: list[int]):
+    """Build respx side effect serving `total` incomes page by page."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        calls.append(offset)
+        content = [
+            {"approvedReceiptUuid": f"uuid-{i}", "totalAmount": 100}
+            for i in range(offset, min(offset + limit, total))
+        ]
+        return httpx.Response(
+            200,
+            json={
+                "content": content,
+                "hasMore": offset + limit < total,
+                "currentOffset": offset,
+                "currentLimit": limit,
+            },
+        )
+
+    return handler
+
+
+class TestIncomeListing:
+    """Test paginated income listing."""
+
+    @pytest.mark.asyncio
+    async def test_iter_incomes_all_pages(self, authenticated_client):
+        """Test iteration over all pages of incomes."""
+        client, token_json = authenticated_client
+        await client.authenticate(token_json)
+        calls: list[int] = []
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/incomes").mock(side_effect=_listing_side_effect(5, calls))
+
+            uuids = [
+                record["approvedReceiptUuid"]
+                async for record in client.income().iter_incomes(page_size=2)
+            ]
+
+        assert uuids == [f"uuid-{i}" for i in range(5)]
+        assert calls == [0, 2, 4]
+
+    @pytest.mark.asyncio
+    async def test_iter_incomes_prefetches_next_page(self, authenticated_client):
+        """Test next page is requested while the current one is processed."""
+        client, token_json = authenticated_client
+        await client.authenticate(token_json)
+        calls: list[int] = []
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/incomes").mock(side_effect=_listing_side_effect(4, calls))
+
+            pages = client.income().iter_income_pages(page_size=2)
+            first = await pages.__anext__()
+            await asyncio.sleep(0)
+
+            assert first["currentOffset"] == 0
+            assert calls == [0, 2]
+            await pages.aclose()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("close", ["aclosing", "break"])
+    async def test_early_exit_cancels_prefetch(self, close):
+        """Test stopping after the first page cancels the pending prefetch."""
+        income = Client().income()
+        cancelled = asyncio.Event()
+
+        async def list_incomes(*args: object) -> dict:
+            if args[2] == 0:
+                return {"content": [{"approvedReceiptUuid": "a"}], "hasMore": True}
+            try:
+                await asyncio.Event().wait()
+            finally:
+                cancelled.set()
+            return {}
+
+        income.list_incomes = list_incomes  # type: ignore[method-assign]
+
+        if close == "aclosing":
+            async with contextlib.aclosing(income.iter_incomes(page_size=1)) as it:
+                async for _ in it:
+                    await asyncio.sleep(0)  # prefetch starts
+                    break
+            assert cancelled.is_set()
+        else:
+            # Abandoned iterator is closed by the event loop's finalizer
+            async for _ in income.iter_incomes(page_size=1):
+                await asyncio.sleep(0)
+                break
+            await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_iter_incomes_resume_and_filters(self, authenticated_client):
+        """Test resuming from offset and passing time range filters."""
+        client, token_json = authenticated_client
+        await client.authenticate(token_json)
+        calls: list[int] = []
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/incomes").mock(
+                side_effect=_listing_side_effect(5, calls)
+            )
+
+            records = [
+                record
+                async for record in client.income().iter_incomes(
+                    from_=datetime(2024, 1, 1),
+                    to=datetime(2024, 1, 31, tzinfo=UTC),
+                    page_size=10,
+                    offset=3,
+                )
+            ]
+
+            params = route.calls[0].request.url.params
+            assert params["from"] == "2024-01-01T00:00:00.000+00:00"
+            assert params["to"] == "2024-01-31T00:00:00.000+00:00"
+
+        assert [r["approvedReceiptUuid"] for r in records] == ["uuid-3", "uuid-4"]
+        assert calls == [3]
+
+    @pytest.mark.asyncio
+    async def test_list_incomes_validation(self, authenticated_client):
+        """Test validation of listing arguments."""
+        client, token_json = authenticated_client
+        await client.authenticate(token_json)
+
+        with pytest.raises(ValueError, match="Limit must be greater than 0"):
+            await client.income().list_incomes(limit=0)
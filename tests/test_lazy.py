@@ -0,0 +1,143 @@
+"""
+Tests for lazily validated response models.
+"""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+import respx
+from pydantic import ValidationError
+
+from nalogo.client import Client
+from nalogo.dto.lazy import LazyList, LazyModel
+from nalogo.dto.tax import History
+from nalogo.dto.user import UserType
+
+
+@pytest.fixture
+def user_json():
+    """User profile in API format."""
+    return {
+        "id": 1000000,
+        "displayName": "Иванов Иван",
+        "phone": "79000000000",
+        "inn": "500100732259",
+        "avatarExists": False,
+        "registrationDate": "2023-05-01T10:00:00Z",
+        "hideCancelledReceipt": False,
+        "restrictedMode": False,
+    }
+
+
+@pytest.fixture
+async def client():
+    """Authenticated client."""
+    client = Client()
+    await client.authenticate(json.dumps({"token": "test_access_token"}))
+    return client
+
+
+class TestLazyModel:
+    """Test per-field validation."""
+
+    def test_fields_validated_on_access(self, user_json):
+        """Test only accessed fields are validated."""
+        user_json["avatarExists"] = "not-a-bool"
+        user = LazyModel(UserType, user_json)
+
+        assert user.registration_date == datetime(2023, 5, 1, 10, tzinfo=UTC)
+        assert user.display_name == "Иванов Иван"
+        assert user.email is None
+        with pytest.raises(ValidationError, match=r"avatarExists|avatar_exists"):
+            _ = user.avatar_exists
+        with pytest.raises(ValidationError):
+            user.to_model()
+
+    def test_missing_required_and_unknown(self, user_json):
+        """Test missing required field and unknown attribute errors."""
+        del user_json["phone"]
+        user = LazyModel(UserType, user_json)
+
+        with pytest.raises(ValidationError, match="phone"):
+            _ = user.phone
+        with pytest.raises(AttributeError, match="no field 'nickname'"):
+            _ = user.nickname
+
+    def test_raw_field_and_to_model(self):
+        """Test History.data returns raw entry and full model matches."""
+        entry = {"taxPeriodId": 202401, "taxAmount": 12.5, "oktmo": "45000000"}
+        history = LazyModel(History, entry)
+
+        assert history.data is entry
+        assert history.tax_amount == Decimal("12.5")
+        assert history.to_model().tax_period_id == 202401
+        assert history.model_dump() == entry
+
+
+class TestTypedApi:
+    """Test typed API methods."""
+
+    @pytest.mark.asyncio
+    async def test_user_get_typed(self, client, user_json):
+        """Test UserAPI.get_typed returns lazy UserType."""
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/user").mock(
+                return_value=httpx.Response(200, json=user_json)
+            )
+            user = await client.user().get_typed()
+
+        assert user.inn == "500100732259"
+        assert user.to_model().id == 1000000
+
+    @pytest.mark.asyncio
+    async def test_history_and_payments_typed(self, client):
+        """Test tax records are returned as LazyList."""
+        records = [
+            {"taxPeriodId": 202400 + month, "taxAmount": "bad" if month == 2 else 1}
+            for month in range(1, 4)
+        ]
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/taxes/history").mock(
+                return_value=httpx.Response(200, json={"records": records})
+            )
+            respx_mock.post("/taxes/payments").mock(
+                return_value=httpx.Response(200, json={"records": []})
+            )
+
+            history = await client.tax().history_typed(oktmo="45000000")
+            payments = await client.tax().payments_typed(only_paid=True)
+
+        assert isinstance(history, LazyList)
+        assert len(history) == 3
+        # Invalid taxAmount of one record does not affect reading other fields
+        assert [record.tax_period_id for record in history] == [202401, 202402, 202403]
+        assert history.raw == records
+        assert len(payments) == 0
+
+    @pytest.mark.asyncio
+    async def test_payment_type_table_typed(self, client):
+        """Test payment type table as lazy models."""
+        table = [
+            {
+                "id": 1,
+                "type": "ACCOUNT",
+                "bankName": "Банк",
+                "bankBik": "044525225",
+                "corrAccount": "30101810400000000225",
+                "favorite": True,
+                "currentAccount": "40817810000000000000",
+                "availableForPa": False,
+            }
+        ]
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/payment-type/table").mock(
+                return_value=httpx.Response(200, json=table)
+            )
+            payment_types = await client.payment_type().table_typed()
+
+        assert payment_types[0].bank_name == "Банк"
+        assert payment_types[0].is_favorite()
+        assert [p.id for p in payment_types.to_models()] == [1]
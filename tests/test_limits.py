@@ -0,0 +1,215 @@
+"""
+Tests for annual income limit guard.
+"""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.dto.income import CancelCommentType
+from nalogo.exceptions import IncomeLimitExceededException
+from nalogo.limits import IncomeLimitGuard, income_year
+
+
+@pytest.fixture
+def token_json():
+    """Token JSON with user profile."""
+    return json.dumps(
+        {"token": "test_access_token", "profile": {"inn": "500100732259"}}
+    )
+
+
+class TestIncomeLimitGuard:
+    """Test limit guard integration with IncomeAPI."""
+
+    @pytest.mark.asyncio
+    async def test_reject_before_network(self, token_json):
+        """Test over-limit receipt is rejected without calling /income."""
+        guard = IncomeLimitGuard(limit=Decimal(1000))
+        guard.seed("500100732259", 2024, Decimal(950))
+        client = Client(income_limit_guard=guard)
+        await client.authenticate(token_json)
+
+        with respx.mock(
+            base_url="https://lknpd.nalog.ru/api/v1", assert_all_called=False
+        ) as respx_mock:
+            route = respx_mock.post("/income")
+
+            with pytest.raises(IncomeLimitExceededException, match="50 left") as exc:
+                await client.income().create(
+                    "Service", 100, operation_time=datetime(2024, 5, 1, tzinfo=UTC)
+                )
+
+            assert not route.called
+        assert exc.value.check.exceeded
+        assert guard.total("500100732259", 2024) == Decimal(950)
+
+    @pytest.mark.asyncio
+    async def test_success_commits_and_failure_releases(self, token_json):
+        """Test reservation is committed on success and released on error."""
+        guard = IncomeLimitGuard(limit=Decimal(1000))
+        client = Client(income_limit_guard=guard)
+        await client.authenticate(token_json)
+        when = datetime(2024, 5, 1, tzinfo=UTC)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/income").mock(
+                side_effect=[
+                    httpx.Response(200, json={"approvedReceiptUuid": "a"}),
+                    httpx.Response(500, text="Internal error"),
+                ]
+            )
+
+            await client.income().create("Service", "300.50", operation_time=when)
+            with pytest.raises(Exception, match="Internal error"):
+                await client.income().create("Service", 200, operation_time=when)
+
+        assert guard.total("500100732259", 2024) == Decimal("300.50")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_creates_counted_in_flight(self, token_json):
+        """Test concurrent creates cannot jointly exceed the limit."""
+        guard = IncomeLimitGuard(limit=Decimal(250))
+        client = Client(income_limit_guard=guard)
+        await client.authenticate(token_json)
+        when = datetime(2024, 5, 1, tzinfo=UTC)
+
+        async def slow_response(_request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"approvedReceiptUuid": "a"})
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/income").mock(side_effect=slow_response)
+
+            results = await asyncio.gather(
+                *(
+                    client.income().create("Service", 100, operation_time=when)
+                    for _ in range(3)
+                ),
+                return_exceptions=True,
+            )
+
+        rejected = [r for r in results if isinstance(r, IncomeLimitExceededException)]
+        assert len(rejected) == 1
+        assert route.call_count == 2
+        assert guard.total("500100732259", 2024) == Decimal(200)
+
+    @pytest.mark.asyncio
+    async def test_flag_mode_and_cancel(self, token_json):
+        """Test flag mode sends receipt and cancel returns budget."""
+        guard = IncomeLimitGuard(limit=Decimal(100), mode="flag")
+        client = Client(income_limit_guard=guard)
+        await client.authenticate(token_json)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/income").mock(
+                return_value=httpx.Response(200, json={"approvedReceiptUuid": "a"})
+            )
+            respx_mock.post("/cancel").mock(
+                return_value=httpx.Response(
+                    200,
+                    json={
+                        "incomeInfo": {
+                            "approvedReceiptUuid": "a",
+                            "operationTime": "2024-05-01T12:00:00+03:00",
+                            "totalAmount": 150,
+                        }
+                    },
+                )
+            )
+
+            await client.income().create(
+                "Service", 150, operation_time=datetime(2024, 5, 1, tzinfo=UTC)
+            )
+            assert len(guard.flagged) == 1
+            assert guard.total("500100732259", 2024) == Decimal(150)
+
+            await client.income().cancel("a", CancelCommentType.CANCEL)
+
+        assert guard.total("500100732259", 2024) == Decimal(0)
+
+    @pytest.mark.asyncio
+    async def test_seed_from_incomes(self, token_json):
+        """Test seeding from listing excludes cancelled receipts."""
+        guard = IncomeLimitGuard()
+        client = Client()
+        await client.authenticate(token_json)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/incomes").mock(
+                return_value=httpx.Response(
+                    200,
+                    json={
+                        "content": [
+                            {"totalAmount": "100.10", "cancellationInfo": None},
+                            {"totalAmount": 50, "cancellationInfo": {"comment": "x"}},
+                        ],
+                        "hasMore": False,
+                    },
+                )
+            )
+
+            total = await guard.seed_from_incomes("500100732259", client.income(), 2024)
+
+            params = route.calls[0].request.url.params
+            assert params["from"] == "2024-01-01T00:00:00.000+03:00"
+            assert params["to"] == "2024-12-31T23:59:59.999+03:00"
+
+        assert total == Decimal("100.10")
+
+    @pytest.mark.asyncio
+    async def test_account_from_stored_token(self, token_json):
+        """Test account comes from stored token profile without authenticate()."""
+        guard = IncomeLimitGuard(limit=Decimal(1000))
+        client = Client(income_limit_guard=guard)
+        await client.auth_provider.set_token(token_json)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/income").mock(
+                return_value=httpx.Response(200, json={"approvedReceiptUuid": "a"})
+            )
+            await client.income().create(
+                "Service", 100, operation_time=datetime(2024, 5, 1, tzinfo=UTC)
+            )
+
+        assert guard.total("500100732259", 2024) == Decimal(100)
+        assert guard.total("", 2024) == Decimal(0)
+
+    @pytest.mark.asyncio
+    async def test_unknown_account_rejected(self):
+        """Test guarded create without account INN fails before network."""
+        client = Client(income_limit_guard=IncomeLimitGuard())
+        await client.authenticate('{"token": "t"}')
+
+        with respx.mock(
+            base_url="https://lknpd.nalog.ru/api/v1", assert_all_called=False
+        ) as respx_mock:
+            route = respx_mock.post("/income")
+            with pytest.raises(ValueError, match="User profile not available"):
+                await client.income().create("Service", 100)
+            assert not route.called
+
+    def test_flagged_is_bounded(self):
+        """Test flag mode keeps only the latest flagged_size checks."""
+        guard = IncomeLimitGuard(limit=Decimal(10), mode="flag", flagged_size=2)
+        for amount in (20, 30, 40):
+            guard._reserve("500100732259", 2024, Decimal(amount))
+
+        assert [check.amount for check in guard.flagged] == [30, 40]
+
+    def test_income_year_uses_moscow_time(self):
+        """Test receipts after 21:00 UTC on Dec 31 belong to next year."""
+        assert income_year(datetime(2024, 12, 31, 21, 30, tzinfo=UTC)) == 2025
+
+    def test_invalid_mode(self):
+        """Test validation of guard mode."""
+        with pytest.raises(ValueError, match="Mode must be"):
+            IncomeLimitGuard(mode="ignore")
+        with pytest.raises(ValueError, match="flagged_size"):
+            IncomeLimitGuard(flagged_size=0)
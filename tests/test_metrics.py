@@ -0,0 +1,151 @@
+"""
+Tests for metrics registry and HTTP request metrics.
+"""
+
+import pytest
+
+from nalogo.client import Client
+from nalogo.exceptions import NotFoundException, UnauthorizedException
+from nalogo.metrics import HTTPMetrics, MetricsRegistry, endpoint_template
+from nalogo.testing import FakeNalogService
+
+
+class TestMetricsRegistry:
+    """Test counters, histograms and exposition format."""
+
+    def test_prometheus_text(self):
+        """Test counter and histogram text exposition with escaped labels."""
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("queue",))
+        histogram = registry.histogram("job_seconds", "Job time", buckets=(0.1, 1))
+        counter.inc(('a"b',))
+        counter.inc(('a"b',), 2)
+        histogram.observe((), 0.05)
+        histogram.observe((), 0.5)
+        histogram.observe((), 3)
+
+        assert registry.render_prometheus() == (
+            "# HELP jobs_total Jobs\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{queue="a\\"b"} 3\n'
+            "# HELP job_seconds Job time\n"
+            "# TYPE job_seconds histogram\n"
+            'job_seconds_bucket{le="0.1"} 1\n'
+            'job_seconds_bucket{le="1"} 2\n'
+            'job_seconds_bucket{le="+Inf"} 3\n'
+            "job_seconds_sum 3.55\n"
+            "job_seconds_count 3\n"
+        )
+
+    def test_snapshot(self):
+        """Test snapshot of metric values as dictionaries."""
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits", ("path",)).inc(("/a",))
+
+        assert registry.snapshot() == {
+            "hits_total": {
+                "type": "counter",
+                "help": "Hits",
+                "samples": [{"labels": {"path": "/a"}, "value": 1.0}],
+            }
+        }
+
+    def test_gauge(self):
+        """Test gauge keeps last value per label set."""
+        registry = MetricsRegistry()
+        gauge = registry.gauge("temperature", "Temperature", ("room",))
+        gauge.set(("a",), 21.5)
+        gauge.set(("a",), 19)
+
+        assert gauge.get(("a",)) == 19
+        assert gauge.get(("b",)) is None
+        assert registry.render_prometheus() == (
+            "# HELP temperature Temperature\n"
+            "# TYPE temperature gauge\n"
+            'temperature{room="a"} 19\n'
+        )
+
+    def test_validation(self):
+        """Test invalid labels, values, names and buckets are rejected."""
+        registry = MetricsRegistry()
+        counter = registry.counter("x_total", "X", ("a",))
+        with pytest.raises(ValueError):
+            counter.inc(("1", "2"))
+        with pytest.raises(ValueError):
+            counter.inc(("1",), -1)
+        with pytest.raises(ValueError):
+            registry.counter("x_total", "again")
+        with pytest.raises(ValueError):
+            registry.counter("bad-name", "X")
+        with pytest.raises(ValueError):
+            registry.histogram("h", "H", buckets=(1, 0.5))
+
+    def test_write_file(self, tmp_path):
+        """Test atomic write leaves no temporary file."""
+        registry = MetricsRegistry()
+        registry.counter("x_total", "X").inc()
+        path = tmp_path / "metrics" / "nalogo.prom"
+
+        registry.write_prometheus(path)
+
+        assert "x_total 1" in path.read_text()
+        assert list(path.parent.iterdir()) == [path]
+
+    def test_endpoint_template(self):
+        """Test ids in paths are replaced by placeholders."""
+        assert endpoint_template("/receipt/500100732259/20abc1/json") == (
+            "/receipt/{id}/{id}/json"
+        )
+        assert endpoint_template("/payment-type/table") == "/payment-type/table"
+
+
+class TestHTTPMetrics:
+    """Test metrics recorded by AsyncHTTPClient."""
+
+    @pytest.mark.asyncio
+    async def test_requests_and_errors(self, login):
+        """Test request, duration and error metrics per endpoint."""
+        service = FakeNalogService()
+        metrics = HTTPMetrics()
+        client = await login(service, metrics=metrics)
+
+        await client.user().get()
+        await client.user().get()
+        with pytest.raises(NotFoundException):
+            await client.receipt().json("missing1")
+
+        assert metrics.requests.get(("GET", "/user", "200")) == 2
+        assert metrics.duration.count(("GET", "/user")) == 2
+        assert metrics.requests.get(("GET", "/receipt/{id}/{id}/json", "404")) == 1
+        assert (
+            metrics.errors.get(("GET", "/receipt/{id}/{id}/json", "NotFoundException"))
+            == 1
+        )
+        text = metrics.render_prometheus()
+        assert (
+            'nalogo_http_requests_total{method="GET",endpoint="/user",status="200"} 2'
+            in text
+        )
+
+    @pytest.mark.asyncio
+    async def test_token_refresh(self, login):
+        """Test token refresh on 401 is counted."""
+        service = FakeNalogService()
+        metrics = HTTPMetrics()
+        client = await login(service, metrics=metrics)
+        service.expire_tokens()
+
+        await client.user().get()
+
+        assert metrics.token_refreshes.get(("success",)) == 1
+        assert metrics.requests.get(("GET", "/user", "200")) == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test client has no metrics unless given."""
+        service = FakeNalogService()
+        client = Client(transport=service.transport())
+
+        assert client.http_client.metrics is None
+        with pytest.raises(UnauthorizedException):
+            await client.user().get()
@@ -0,0 +1,185 @@
+"""
+Tests for the AsyncHTTPClient middleware chain.
+"""
+
+import httpx
+import pytest
+
+from nalogo.client import Client
+from nalogo.exceptions import NotFoundException, UnauthorizedException
+from nalogo.middleware import (
+    AuthMiddleware,
+    DeadlineMiddleware,
+    ErrorStatusMiddleware,
+    Middleware,
+    RequestContext,
+    TokenRefreshMiddleware,
+)
+from nalogo.testing import FakeNalogService
+
+
+class RecordingMiddleware(Middleware):
+    """Middleware appending hook calls to shared log."""
+
+    def __init__(self, name: str, log: list[str]):
+        self.name = name
+        self.log = log
+
+    async def before_request(self, _ctx: RequestContext) -> httpx.Response | None:
+        self.log.append(f"{self.name}.before")
+        return None
+
+    async def after_response(
+        self, _ctx: RequestContext, response: httpx.Response
+    ) -> httpx.Response:
+        self.log.append(f"{self.name}.after")
+        return response
+
+    async def on_error(
+        self, _ctx: RequestContext, error: Exception
+    ) -> httpx.Response | None:
+        self.log.append(f"{self.name}.error:{type(error).__name__}")
+        return None
+
+
+class CacheMiddleware(Middleware):
+    """Answer repeated GETs from memory."""
+
+    def __init__(self) -> None:
+        self.cache: dict[str, httpx.Response] = {}
+
+    async def before_request(self, ctx: RequestContext) -> httpx.Response | None:
+        if ctx.method == "GET":
+            return self.cache.get(ctx.path)
+        return None
+
+    async def after_response(
+        self, ctx: RequestContext, response: httpx.Response
+    ) -> httpx.Response:
+        if ctx.method == "GET":
+            self.cache[ctx.path] = response
+        return response
+
+
+class TestChain:
+    """Test ordering, short-circuit and error hooks."""
+
+    @pytest.mark.asyncio
+    async def test_default_chain(self):
+        """Test client builds default middleware chain."""
+        client = Client()
+        assert [type(m) for m in client.http_client.middlewares] == [
+            DeadlineMiddleware,
+            ErrorStatusMiddleware,
+            TokenRefreshMiddleware,
+            AuthMiddleware,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_hook_order(self, login):
+        """Test before hooks run in order and after hooks in reverse."""
+        log: list[str] = []
+        client = await login(
+            FakeNalogService(),
+            middlewares=[RecordingMiddleware("outer", log)],
+        )
+        client.http_client.add_middleware(RecordingMiddleware("inner", log))
+
+        await client.user().get()
+
+        assert log == ["outer.before", "inner.before", "inner.after", "outer.after"]
+        assert isinstance(client.http_client.middlewares[3], ErrorStatusMiddleware)
+
+    @pytest.mark.asyncio
+    async def test_short_circuit_from_cache(self, login):
+        """Test cached response skips the transport."""
+        service = FakeNalogService()
+        cache = CacheMiddleware()
+        client = await login(service, middlewares=[cache])
+
+        first = await client.user().get()
+        second = await client.user().get()
+
+        assert first == second
+        assert service.requests["user"] == 1
+
+    @pytest.mark.asyncio
+    async def test_on_error_sees_domain_exception(self, login):
+        """Test on_error receives mapped domain exception."""
+        log: list[str] = []
+        client = await login(
+            FakeNalogService(), middlewares=[RecordingMiddleware("m", log)]
+        )
+
+        with pytest.raises(NotFoundException):
+            await client.receipt().json("missing")
+
+        assert log == ["m.before", "m.error:NotFoundException"]
+
+    @pytest.mark.asyncio
+    async def test_on_error_recovers(self, login):
+        """Test response from on_error replaces the error."""
+
+        class Fallback(Middleware):
+            async def on_error(self, _ctx, _error):
+                return httpx.Response(200, json={"fallback": True})
+
+        client = await login(FakeNalogService(), middlewares=[Fallback()])
+
+        assert await client.receipt().json("missing") == {"fallback": True}
+
+
+class TestAuthMiddlewares:
+    """Test auth and refresh rebuilt as middlewares."""
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_retry(self, login):
+        """Test 401 refreshes token and retries once."""
+        service = FakeNalogService()
+        log: list[str] = []
+        client = await login(service)
+        client.http_client.add_middleware(
+            RecordingMiddleware("auth", log), index=len(client.http_client.middlewares)
+        )
+        service.expire_tokens()
+
+        await client.user().get()
+
+        assert service.requests["auth_token"] == 1
+        assert service.statuses[401] == 1
+        # Innermost middleware runs for the original request and the retry
+        assert log == ["auth.before", "auth.after", "auth.before", "auth.after"]
+
+    @pytest.mark.asyncio
+    async def test_caller_authorization_header_wins(self):
+        """Test caller Authorization header is sent until a refresh retry."""
+        sent: list[str] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request.headers.get("Authorization", ""))
+            if request.url.path.endswith("/auth/token"):
+                return httpx.Response(
+                    200, json={"token": "fresh", "refreshToken": "r2"}
+                )
+            if sent[-1] == "Bearer fresh":
+                return httpx.Response(200, json={})
+            return httpx.Response(401)
+
+        client = Client(transport=httpx.MockTransport(handler))
+        await client.authenticate('{"token": "stored", "refreshToken": "r1"}')
+
+        await client.http_client.get(
+            "/user", headers={"authorization": "Bearer caller"}
+        )
+
+        # Original request, refresh call, retry with the refreshed token
+        assert sent == ["Bearer caller", "", "Bearer fresh"]
+
+    @pytest.mark.asyncio
+    async def test_no_refresh_token(self):
+        """Test 401 without refresh token raises unauthorized error."""
+        transport = httpx.MockTransport(lambda _request: httpx.Response(401))
+        client = Client(transport=transport)
+
+        with pytest.raises(UnauthorizedException):
+            await client.user().get()
@@ -0,0 +1,188 @@
+"""
+Tests for local SQLite income mirror.
+"""
+
+import asyncio
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.dto.income import CancelCommentType
+from nalogo.mirror import IncomeMirror
+
+
+def _income(uuid: str, day: int, amount: int, cancelled: bool = False) -> dict:
+    """Build income record in listing format."""
+    return {
+        "approvedReceiptUuid": uuid,
+        "name": "Service",
+        "operationTime": f"2024-01-{day:02d}T12:00:00+03:00",
+        "totalAmount": amount,
+        "incomeType": "FROM_LEGAL_ENTITY",
+        "clientInn": "7707083893",
+        "cancellationInfo": {"comment": "Возврат средств"} if cancelled else None,
+    }
+
+
+def _listing(records: list[dict], seen: list[dict]):
+    """Build respx side effect serving records, recording query params."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.url.params))
+        offset = int(request.url.params["offset"])
+        limit = int(request.url.params["limit"])
+        return httpx.Response(
+            200,
+            json={
+                "content": records[offset : offset + limit],
+                "hasMore": offset + limit < len(records),
+            },
+        )
+
+    return handler
+
+
+@pytest.fixture
+async def client():
+    """Authenticated client."""
+    client = Client()
+    await client.authenticate(
+        json.dumps({"token": "test_access_token", "profile": {"inn": "123456789012"}})
+    )
+    return client
+
+
+class TestIncomeMirror:
+    """Test IncomeMirror sync and queries."""
+
+    @pytest.mark.asyncio
+    async def test_initial_and_incremental_sync(self, client):
+        """Test full first sync and incremental second sync with cancellation."""
+        mirror = IncomeMirror(page_size=2)
+        seen: list[dict] = []
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/incomes")
+            route.side_effect = _listing(
+                [_income("a", 1, 100), _income("b", 2, 200), _income("c", 3, 300)],
+                seen,
+            )
+            first = await mirror.sync(client.income())
+
+            route.side_effect = _listing(
+                [_income("c", 3, 300, cancelled=True), _income("d", 4, 50)], seen
+            )
+            second = await mirror.sync(client.income())
+
+        assert (first.fetched, first.inserted) == (3, 3)
+        assert "from" not in seen[0]
+        assert seen[-1]["sortBy"] == "operation_time:asc"
+        assert seen[-1]["from"].startswith("2023-12-03")
+        assert (second.inserted, second.updated, second.cancelled) == (1, 1, 1)
+        assert mirror.watermark == datetime(2024, 1, 4, 9, tzinfo=UTC)
+        assert len(mirror) == 4
+
+    @pytest.mark.asyncio
+    async def test_queries(self):
+        """Test indexed read queries."""
+        mirror = IncomeMirror()
+        for record in (
+            _income("a", 1, 100),
+            _income("b", 2, 200, cancelled=True),
+            {**_income("c", 3, 300), "clientInn": "500100732259"},
+        ):
+            mirror.upsert(record)
+
+        assert mirror.get("a")["totalAmount"] == 100
+        assert mirror.get("missing") is None
+        assert [r["approvedReceiptUuid"] for r in mirror.query(status="CANCELLED")] == [
+            "b"
+        ]
+        assert len(mirror.query(client_inn="7707083893")) == 2
+        assert len(mirror.query(from_=datetime(2024, 1, 2), limit=5)) == 2
+        assert mirror.total_amount() == Decimal(400)
+
+    @pytest.mark.asyncio
+    async def test_create_and_cancel_feed_mirror(self, client):
+        """Test IncomeAPI results are recorded without sync."""
+        mirror = IncomeMirror()
+        client.add_income_listener(mirror)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/income").mock(
+                return_value=httpx.Response(200, json={"approvedReceiptUuid": "new"})
+            )
+            respx_mock.post("/cancel").mock(
+                return_value=httpx.Response(200, json={"incomeInfo": None})
+            )
+
+            await client.income().create("Service", "150.50", 2)
+            assert mirror.get("new")["totalAmount"] == "301.00"
+            assert mirror.query(status="REGISTERED")[0]["name"] == "Service"
+
+            await client.income().cancel("new", CancelCommentType.REFUND)
+
+        assert mirror.query(status="CANCELLED")[0]["approvedReceiptUuid"] == "new"
+        assert mirror.total_amount() == Decimal(0)
+
+    @pytest.mark.asyncio
+    async def test_failed_sync_keeps_mirror_unchanged(self, client):
+        """Test API error during sync rolls back partial changes."""
+        mirror = IncomeMirror(page_size=1)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/incomes").mock(
+                side_effect=[
+                    httpx.Response(
+                        200, json={"content": [_income("a", 1, 100)], "hasMore": True}
+                    ),
+                    httpx.Response(500, text="Internal error"),
+                ]
+            )
+
+            with pytest.raises(Exception, match="Internal error"):
+                await mirror.sync(client.income())
+
+        assert len(mirror) == 0
+        assert mirror.watermark is None
+
+    @pytest.mark.asyncio
+    async def test_listener_during_failed_sync(self):
+        """Test create recorded during a failing sync survives its rollback."""
+        mirror = IncomeMirror()
+        paused = asyncio.Event()
+        resume = asyncio.Event()
+
+        class FailingListing:
+            async def iter_incomes(self, **_kwargs):
+                yield _income("a", 1, 100)
+                paused.set()
+                await resume.wait()
+                raise RuntimeError("listing failed")
+
+        sync = asyncio.create_task(mirror.sync(FailingListing()))
+        await paused.wait()
+        await mirror.income_created(
+            {
+                "services": [{"name": "Till", "amount": 10, "quantity": 1}],
+                "operationTime": "2024-01-05T12:00:00+03:00",
+                "totalAmount": "10",
+            },
+            {"approvedReceiptUuid": "till"},
+        )
+        # Not written while the sync transaction is open
+        assert mirror.get("till") is None
+        resume.set()
+
+        with pytest.raises(RuntimeError, match="listing failed"):
+            await sync
+
+        assert mirror.get("a") is None
+        assert mirror.get("till") is not None
+        assert len(mirror) == 1
+        assert mirror.watermark is None
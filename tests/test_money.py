@@ -0,0 +1,115 @@
+"""
+Tests for integer-kopeck money type.
+"""
+
+import json
+from decimal import Decimal
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.dto.fast import FastIncomeRequest, FastServiceItem
+from nalogo.dto.income import IncomeServiceItem, services_total
+from nalogo.money import Money, format_decimal, to_kopecks
+
+
+class TestMoney:
+    """Test conversion, arithmetic and formatting."""
+
+    @pytest.mark.parametrize(
+        ("value", "expected"),
+        [
+            (100, "100.00"),
+            ("100.5", "100.50"),
+            (" 7.25 ", "7.25"),
+            ("-0.05", "-0.05"),
+            (0.1, "0.10"),
+            (2.675, "2.68"),
+            (Decimal("1E+2"), "100.00"),
+            (Decimal("0.005"), "0.01"),
+            (Decimal("-0.005"), "-0.01"),
+            ("1e30", "1000000000000000000000000000000.00"),
+        ],
+    )
+    def test_of_and_str(self, value, expected):
+        """Test conversion rounds half up and formats without exponent."""
+        assert str(Money.of(value)) == expected
+
+    @pytest.mark.parametrize("value", ["abc", "NaN", "Infinity", ""])
+    def test_invalid(self, value):
+        """Test invalid amounts raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid money amount"):
+            Money.of(value)
+        assert to_kopecks(value) == 0
+
+    def test_arithmetic(self):
+        """Test integer arithmetic and quantity multiplication."""
+        price = Money.of("100.50")
+
+        assert price * 3 == Money(30150)
+        assert price * Decimal("0.5") == Money(5025)
+        assert Money.of("0.01") * "0.5" == Money(1)
+        assert Money.of("-1.50") * Decimal("0.5") == Money(-75)
+        assert sum([price, price]) == Money.sum([price, price]) == Money(20100)
+        assert price - Money.of(1) == Money(9950)
+        assert (price * 2).to_decimal() == Decimal("201.00")
+        assert Money(1) < Money(2)
+        assert not Money()
+
+    def test_format_decimal(self):
+        """Test plain notation for service amount and quantity."""
+        assert format_decimal(Decimal("1E+2")) == "100"
+        assert format_decimal(Decimal("1E-7")) == "0.0000001"
+        assert IncomeServiceItem(
+            name="A", amount=Decimal("1E+2"), quantity=Decimal("1E+1")
+        ).model_dump() == {"name": "A", "amount": "100", "quantity": "10"}
+
+
+class TestIncomeTotal:
+    """Test /income total uses Money formatting."""
+
+    @pytest.mark.asyncio
+    async def test_exponent_inputs(self):
+        """Test exponent Decimal inputs produce plain wire amounts."""
+        client = Client()
+        await client.authenticate('{"token": "t"}')
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/income").mock(
+                return_value=httpx.Response(200, json={"approvedReceiptUuid": "a"})
+            )
+            await client.income().create("Service", Decimal("1E+2"), Decimal("1E+0"))
+
+        body = json.loads(route.calls[0].request.content)
+        assert body["totalAmount"] == "100.00"
+        assert body["services"][0]["amount"] == "100"
+
+    @pytest.mark.asyncio
+    async def test_sub_kopeck_amounts(self):
+        """Test total matches sum of unrounded amount * quantity."""
+        client = Client()
+        await client.authenticate('{"token": "t"}')
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/income").mock(
+                return_value=httpx.Response(200, json={"approvedReceiptUuid": "a"})
+            )
+            await client.income().create("Service", Decimal("0.333"), 3)
+
+        body = json.loads(route.calls[0].request.content)
+        assert body["services"][0]["amount"] == "0.333"
+        assert body["totalAmount"] == "1.00"
+
+    def test_total_rounded_once(self):
+        """Test sub-kopeck products are summed before rounding."""
+        items = [
+            IncomeServiceItem(name="A", amount=Decimal("0.005"), quantity=1),
+            IncomeServiceItem(name="B", amount=Decimal("0.005"), quantity=1),
+        ]
+
+        assert items[0].get_total_money() == Money(1)
+        assert str(services_total(items)) == "0.01"
+        fast = [FastServiceItem.from_model(item) for item in items]
+        assert FastIncomeRequest.build(fast).total_amount == "0.01"
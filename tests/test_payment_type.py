@@ -0,0 +1,153 @@
+"""
+Tests for indexed and cached payment types.
+"""
+
+import json
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.dto.payment_type import PaymentTypeCollection
+
+
+def _payment_type(type_id: int, bik: str, favorite: bool = False) -> dict:
+    """Build payment type in API format."""
+    return {
+        "id": type_id,
+        "type": "ACCOUNT",
+        "bankName": f"Bank {bik}",
+        "bankBik": bik,
+        "corrAccount": "30101810400000000225",
+        "favorite": favorite,
+        "phone": None,
+        "bankId": None,
+        "currentAccount": f"4081781000000000000{type_id}",
+        "availableForPa": False,
+    }
+
+
+@pytest.fixture
+async def client():
+    """Authenticated client with payment type cache."""
+    client = Client(payment_type_cache_ttl=60)
+    await client.authenticate(json.dumps({"token": "test_access_token"}))
+    return client
+
+
+class TestPaymentTypeAPI:
+    """Test cached table lookups."""
+
+    @pytest.mark.asyncio
+    async def test_lookups_use_cached_table(self, client):
+        """Test favorite, id and BIK lookups share one request."""
+        table = [
+            _payment_type(1, "044525225"),
+            _payment_type(2, "044525974", favorite=True),
+            _payment_type(3, "044525225", favorite=True),
+        ]
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/payment-type/table").mock(
+                return_value=httpx.Response(200, json=table)
+            )
+            api = client.payment_type()
+
+            favorite = await api.favorite()
+            by_id = await client.payment_type().get(3)
+            by_bik = await api.by_bik("044525225")
+            missing = await api.get(42)
+
+        assert route.call_count == 1
+        assert favorite["id"] == 2
+        assert by_id["id"] == 3
+        assert [item["id"] for item in by_bik] == [1, 3]
+        assert missing is None
+
+    @pytest.mark.asyncio
+    async def test_reindex_only_on_change(self, client):
+        """Test refetch with same content keeps indexes and collection."""
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/payment-type/table")
+            route.return_value = httpx.Response(200, json=[_payment_type(1, "1")])
+            api = client.payment_type()
+
+            first = await api.collection()
+            same = await api.collection(refresh=True)
+            assert same is first
+            assert client.payment_type_table.version == 1
+
+            route.return_value = httpx.Response(
+                200, json=[_payment_type(1, "1", favorite=True)]
+            )
+            changed = await api.collection(refresh=True)
+
+        assert changed is not first
+        assert client.payment_type_table.version == 2
+        assert changed.favorite().id == 1
+
+    @pytest.mark.asyncio
+    async def test_results_are_copies(self, client):
+        """Test mutating returned entries does not change the cache."""
+        table = [_payment_type(1, "044525225", favorite=True)]
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.get("/payment-type/table").mock(
+                return_value=httpx.Response(200, json=table)
+            )
+            api = client.payment_type()
+
+            listed = await api.table()
+            listed[0]["bankBik"] = "changed"
+            listed.clear()
+            (await api.get(1))["favorite"] = False
+            (await api.favorite())["id"] = 42
+            (await api.by_bik("044525225"))[0]["id"] = 43
+
+            assert await api.table() == table
+            assert (await api.favorite())["id"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Test stale table is refetched and no cache fetches every call."""
+        now = [0.0]
+        client = Client(payment_type_cache_ttl=10)
+        client.payment_type_table.clock = lambda: now[0]
+        uncached = Client()
+        await client.authenticate('{"token": "t"}')
+        await uncached.authenticate('{"token": "t"}')
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/payment-type/table").mock(
+                return_value=httpx.Response(200, json=[])
+            )
+            await client.payment_type().table()
+            now[0] = 5
+            await client.payment_type().table()
+            assert route.call_count == 1
+            now[0] = 11
+            await client.payment_type().table()
+            assert route.call_count == 2
+
+            await uncached.payment_type().favorite()
+            await uncached.payment_type().favorite()
+            assert route.call_count == 4
+
+
+class TestPaymentTypeCollection:
+    """Test collection indexes."""
+
+    def test_indexes(self):
+        """Test id, BIK and favorite lookups and reindex."""
+        collection = PaymentTypeCollection.model_validate(
+            {"payment_types": [_payment_type(1, "A"), _payment_type(2, "A", True)]}
+        )
+
+        assert collection.get(2).bank_bik == "A"
+        assert [p.id for p in collection.by_bik("A")] == [1, 2]
+        assert collection.favorite().id == 2
+        assert collection.by_bik("B") == []
+
+        collection.payment_types.pop()
+        collection.reindex()
+        assert collection.favorite() is None
+        assert collection.get(2) is None
@@ -0,0 +1,185 @@
+"""
+Tests for local receipt rendering and receipt JSON cache.
+"""
+
+import json
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.receipt import ReceiptCache
+from nalogo.receipt_render import ReceiptView, render_receipt
+
+
+@pytest.fixture
+def receipt_payload():
+    """Receipt JSON payload in flat format returned by the service."""
+    return {
+        "receiptId": "200abcdef1",
+        "operationTime": "2024-01-01T12:00:00+03:00",
+        "inn": "123456789012",
+        "services": [
+            {"name": "Consulting <b>", "quantity": 2, "amount": 100.5},
+            {"name": "Support", "quantity": "1.5", "amount": "10"},
+        ],
+        "totalAmount": 216,
+        "incomeType": "FROM_LEGAL_ENTITY",
+        "clientInn": "7707083893",
+        "clientDisplayName": "ООО Ромашка",
+        "cancellationInfo": None,
+    }
+
+
+@pytest.fixture
+def authenticated_token():
+    """Token JSON with user profile."""
+    return json.dumps(
+        {
+            "token": "test_access_token",
+            "profile": {"inn": "123456789012", "displayName": "Test User"},
+        }
+    )
+
+
+class TestReceiptRender:
+    """Test receipt rendering from JSON payload."""
+
+    def test_view_from_flat_payload(self, receipt_payload):
+        """Test normalization of flat payload."""
+        view = ReceiptView.from_json(receipt_payload, seller_name="Test User")
+
+        assert view.receipt_id == "200abcdef1"
+        assert view.operation_time == "01.01.24 12:00(+03:00)"
+        assert view.client_inn == "7707083893"
+        assert len(view.services) == 2
+        assert str(view.services[1].total) == "15.0"
+        assert not view.cancelled
+
+    def test_view_from_nested_client_payload(self):
+        """Test normalization of payload with nested client object."""
+        view = ReceiptView.from_json(
+            {
+                "approvedReceiptUuid": "uuid-1",
+                "services": [{"name": "A", "quantity": "1", "amount": "100.00"}],
+                "client": {"inn": "7707083893", "displayName": "LLC"},
+            },
+            seller_inn="123456789012",
+        )
+
+        assert view.receipt_id == "uuid-1"
+        assert view.client_display_name == "LLC"
+        assert view.seller_inn == "123456789012"
+        assert str(view.total_amount) == "100.00"
+
+    def test_render_text(self, receipt_payload):
+        """Test plain-text output contains print view fields."""
+        text = render_receipt(receipt_payload, fmt="text", seller_name="Test User")
+
+        assert "Чек №200abcdef1" in text
+        assert "2 x 100.50 ₽" in text
+        assert "216.00 ₽" in text
+        assert "ИНН покупателя:" in text
+        assert "АННУЛИРОВАН" not in text
+
+    def test_render_html_escapes_values(self, receipt_payload):
+        """Test HTML output escapes payload values."""
+        html = render_receipt(receipt_payload, fmt="html")
+
+        assert "Consulting &lt;b&gt;" in html
+        assert "<b>" not in html
+
+    def test_render_cancelled(self, receipt_payload):
+        """Test cancelled receipts are marked."""
+        receipt_payload["cancellationInfo"] = {"comment": "Возврат средств"}
+
+        text = render_receipt(receipt_payload, fmt="text")
+
+        assert "АННУЛИРОВАН: Возврат средств" in text
+
+    @pytest.mark.parametrize(
+        ("comment", "line"),
+        [
+            ("Ошибка: ", "АННУЛИРОВАН: Ошибка: "),
+            ("", "АННУЛИРОВАН"),
+            (None, "АННУЛИРОВАН"),
+        ],
+    )
+    def test_cancellation_line_keeps_comment(self, receipt_payload, comment, line):
+        """Test comment is printed as is and empty comment drops the colon."""
+        receipt_payload["cancellationInfo"] = {"comment": comment}
+
+        text = render_receipt(receipt_payload, fmt="text")
+
+        assert text.splitlines()[-1] == line
+
+    def test_render_unknown_format(self, receipt_payload):
+        """Test validation error for unknown format."""
+        with pytest.raises(ValueError, match="Unknown receipt format"):
+            render_receipt(receipt_payload, fmt="pdf")
+
+
+class TestReceiptCache:
+    """Test receipt JSON cache integration."""
+
+    def test_lru_eviction(self):
+        """Test least recently used payload is evicted."""
+        cache = ReceiptCache(max_size=2)
+        cache.put("a", {"id": "a"})
+        cache.put("b", {"id": "b"})
+        cache.get("a")
+        cache.put("c", {"id": "c"})
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_payloads_are_copied(self):
+        """Test changes to stored or returned payloads don't reach the cache."""
+        cache = ReceiptCache()
+        payload = {"services": [{"name": "Service"}]}
+        cache.put("a", payload)
+        payload["services"][0]["name"] = "changed"
+
+        cached = cache.get("a")
+        cached["services"].clear()
+
+        assert cache.get("a") == {"services": [{"name": "Service"}]}
+
+    @pytest.mark.asyncio
+    async def test_render_uses_cached_json(self, authenticated_token, receipt_payload):
+        """Test repeat renders don't make network requests."""
+        client = Client(receipt_cache_size=10)
+        await client.authenticate(authenticated_token)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/receipt/123456789012/200abcdef1/json").mock(
+                return_value=httpx.Response(200, json=receipt_payload)
+            )
+
+            html = await client.receipt().render("200abcdef1")
+            text = await client.receipt().render("200abcdef1", fmt="text")
+            await client.receipt().json("200abcdef1", refresh=True)
+
+            assert "Test User" in html
+            assert "Test User" in text
+            assert route.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled_by_default(
+        self, authenticated_token, receipt_payload
+    ):
+        """Test json() always fetches without cache."""
+        client = Client()
+        await client.authenticate(authenticated_token)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.get("/receipt/123456789012/200abcdef1/json").mock(
+                return_value=httpx.Response(200, json=receipt_payload)
+            )
+
+            await client.receipt().json("200abcdef1")
+            await client.receipt().json("200abcdef1")
+
+            assert route.call_count == 2
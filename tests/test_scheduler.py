@@ -0,0 +1,183 @@
+"""
+Tests for priority request scheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from nalogo.metrics import HTTPMetrics
+from nalogo.scheduler import (
+    BULK,
+    INTERACTIVE,
+    RequestScheduler,
+    current_priority,
+    priority,
+)
+from nalogo.testing import FakeNalogService
+from nalogo.tracing import RecordingTracer
+
+
+class TestRequestScheduler:
+    """Test queueing order, fairness and statistics."""
+
+    @pytest.mark.asyncio
+    async def test_weighted_fair_order(self):
+        """Test slots are granted by weighted fair order between classes."""
+        scheduler = RequestScheduler(concurrency=1)
+        await scheduler.acquire()
+        granted: list[str] = []
+
+        async def request(name: str) -> None:
+            await scheduler.acquire(name)
+            granted.append(name[0])
+
+        tasks = [asyncio.create_task(request(BULK)) for _ in range(10)]
+        tasks += [asyncio.create_task(request(INTERACTIVE)) for _ in range(10)]
+        await asyncio.sleep(0)
+        assert scheduler.queued() == 20
+
+        for _ in range(10):
+            scheduler.release()
+            await asyncio.sleep(0)
+
+        # Interactive gets 4 of 5 slots, bulk still progresses
+        assert "".join(granted) == "iiiibiiiib"
+        for _ in range(11):
+            scheduler.release()
+            await asyncio.sleep(0)
+        await asyncio.gather(*tasks)
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_no_wait_below_concurrency(self):
+        """Test requests below concurrency do not queue."""
+        scheduler = RequestScheduler(concurrency=2)
+
+        async with scheduler.slot(BULK):
+            assert await scheduler.acquire() == 0.0
+            scheduler.release()
+
+        stats = scheduler.stats()
+        assert stats[BULK]["served"] == 1
+        assert stats[INTERACTIVE]["served"] == 1
+        assert stats[BULK]["wait_max"] == 0.0
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_statistics(self):
+        """Test queue wait statistics per class."""
+        scheduler = RequestScheduler(concurrency=1)
+        await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire(BULK))
+        await asyncio.sleep(0.02)
+        scheduler.release()
+
+        waited = await waiter
+
+        assert waited >= 0.015
+        stats = scheduler.stats()[BULK]
+        assert stats["wait_p99"] == stats["wait_max"] == waited
+        assert stats["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test cancelled waiter is removed from queue."""
+        scheduler = RequestScheduler(concurrency=1)
+        await scheduler.acquire()
+        waiter = asyncio.create_task(scheduler.acquire(BULK))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        assert scheduler.queued() == 0
+        scheduler.release()
+        assert scheduler.active == 0
+
+    @pytest.mark.asyncio
+    async def test_priority_context(self):
+        """Test priority() context selects class."""
+        scheduler = RequestScheduler(concurrency=1)
+
+        with priority(BULK):
+            assert current_priority() == BULK
+            await asyncio.create_task(scheduler.acquire())
+        scheduler.release()
+
+        assert current_priority() is None
+        assert scheduler.stats()[BULK]["served"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_class(self):
+        """Test unknown priority class is rejected."""
+        scheduler = RequestScheduler()
+
+        with pytest.raises(ValueError, match="Unknown priority"):
+            await scheduler.acquire("realtime")
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"concurrency": 0},
+            {"weights": {INTERACTIVE: 0}},
+            {"weights": {BULK: 1}},
+        ],
+    )
+    def test_validation(self, kwargs):
+        """Test invalid scheduler settings are rejected."""
+        with pytest.raises(ValueError):
+            RequestScheduler(**kwargs)
+
+
+class TestClientScheduling:
+    """Test scheduler in AsyncHTTPClient."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_workload(self, login):
+        """Test interactive requests wait less than bulk under load."""
+        service = FakeNalogService(latency=0.005)
+        metrics = HTTPMetrics()
+        scheduler = RequestScheduler(concurrency=2)
+        client = await login(service, scheduler=scheduler, metrics=metrics)
+
+        async def sweep() -> None:
+            with priority(BULK):
+                await asyncio.gather(*(client.user().get() for _ in range(10)))
+
+        async def till() -> None:
+            await asyncio.sleep(0.001)
+            await client.income().create("Service", 100, 1)
+
+        await asyncio.gather(sweep(), till())
+
+        assert client.http_client.peak_in_flight <= 2
+        stats = scheduler.stats()
+        assert stats[BULK]["served"] == 10
+        assert stats[INTERACTIVE]["served"] == 1
+        # Till request overtakes the queued bulk sweep
+        assert stats[INTERACTIVE]["wait_max"] < stats[BULK]["wait_max"]
+        assert metrics.queue_wait.count((BULK,)) == 10
+        assert metrics.queue_wait.count((INTERACTIVE,)) == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_span(self, login):
+        """Test waiting for a slot is traced as a queue span."""
+        tracer = RecordingTracer()
+        scheduler = RequestScheduler(concurrency=1)
+        client = await login(FakeNalogService(), scheduler=scheduler, tracer=tracer)
+        tracer.spans.clear()
+
+        await scheduler.acquire()
+        with priority(BULK):
+            waiting = asyncio.create_task(client.user().get())
+        await asyncio.sleep(0.02)
+        scheduler.release()
+        await waiting
+
+        (queue,) = tracer.find("queue")
+        (request,) = tracer.find("http.request")
+        assert queue.parent_id == request.span_id
+        assert queue.attributes["priority"] == BULK
+        assert queue.end_time - queue.start_time >= 10_000_000  # ns
@@ -0,0 +1,171 @@
+"""
+Tests for multi-OKTMO tax history and payments.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.tax import TaxRecordCache
+
+
+async def _client(**options) -> Client:
+    """Authenticated client."""
+    client = Client(**options)
+    await client.authenticate(json.dumps({"token": "test_access_token"}))
+    return client
+
+
+def _records_for(request: httpx.Request) -> httpx.Response:
+    """Respond with one record tagged by requested OKTMO."""
+    oktmo = json.loads(request.content)["oktmo"]
+    return httpx.Response(200, json={"records": [{"oktmo": oktmo, "n": 1}]})
+
+
+class TestTaxFanOut:
+    """Test concurrent fetching for several OKTMO codes."""
+
+    @pytest.mark.asyncio
+    async def test_history_many_merges_in_requested_order(self):
+        """Test results are merged in requested OKTMO order."""
+        client = await _client()
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/taxes/history").mock(side_effect=_records_for)
+
+            result = await client.tax().history_many(["3", "1", "2", "1"])
+
+        assert route.call_count == 3
+        assert result.ok
+        assert result.oktmos == ["3", "1", "2"]
+        assert [r["oktmo"] for r in result.records] == ["3", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_errors_are_isolated_per_code(self):
+        """Test failure of one code does not fail others."""
+        client = await _client()
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            if json.loads(request.content)["oktmo"] == "bad":
+                return httpx.Response(500, json={"message": "boom"})
+            return _records_for(request)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/taxes/payments").mock(side_effect=respond)
+
+            result = await client.tax().payments_many(["a", "bad", "b"])
+
+        assert not result.ok
+        assert set(result.errors) == {"bad"}
+        assert [r["oktmo"] for r in result.records] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """Test fan-out stays within concurrency limit."""
+        client = await _client()
+        active = 0
+        peak = 0
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return _records_for(request)
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/taxes/history").mock(side_effect=respond)
+
+            result = await client.tax().history_many(
+                [str(i) for i in range(8)], concurrency=2
+            )
+
+        assert len(result.records) == 8
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self):
+        """Test non-positive concurrency is rejected."""
+        client = await _client()
+        with pytest.raises(ValueError, match="Concurrency"):
+            await client.tax().history_many(["1"], concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_results_cached_per_code(self):
+        """Test records are cached per OKTMO code."""
+        client = await _client(tax_cache_ttl=60)
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/taxes/payments").mock(side_effect=_records_for)
+
+            await client.tax().payments_many(["1", "2"])
+            await client.tax().payments_many(["2", "3"])
+            assert route.call_count == 3
+
+            # only_paid is part of cache key
+            await client.tax().payments_many(["1"], only_paid=True)
+            assert route.call_count == 4
+
+            await client.tax().payments_many(["1"], refresh=True)
+            assert route.call_count == 5
+
+    @pytest.mark.asyncio
+    async def test_cached_results_are_copies(self):
+        """Test mutating returned records does not change later cache hits."""
+        client = await _client(tax_cache_ttl=60)
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/taxes/history").mock(side_effect=_records_for)
+
+            first = await client.tax().history_many(["1"])
+            first.by_oktmo["1"][0]["n"] = 42
+            first.by_oktmo["1"].append({"oktmo": "1", "n": 2})
+            second = await client.tax().history_many(["1"])
+            assert second.by_oktmo == {"1": [{"oktmo": "1", "n": 1}]}
+            second.records[0]["n"] = 43
+            third = await client.tax().history_many(["1"])
+
+        assert route.call_count == 1
+        assert third.records == [{"oktmo": "1", "n": 1}]
+
+    @pytest.mark.asyncio
+    async def test_failed_codes_not_cached(self):
+        """Test failed codes are fetched again."""
+        client = await _client(tax_cache_ttl=60)
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            route = respx_mock.post("/taxes/history").mock(
+                side_effect=[
+                    httpx.Response(500, json={"message": "boom"}),
+                    httpx.Response(200, json={"records": [{"oktmo": "1"}]}),
+                ]
+            )
+
+            first = await client.tax().history_many(["1"])
+            second = await client.tax().history_many(["1"])
+
+        assert route.call_count == 2
+        assert "1" in first.errors
+        assert second.records == [{"oktmo": "1"}]
+
+
+class TestTaxRecordCache:
+    """Test TTL expiry."""
+
+    def test_expiry(self):
+        """Test stale cache entries expire."""
+        now = [0.0]
+        cache = TaxRecordCache(ttl=10, clock=lambda: now[0])
+        cache.put(("history", "1"), [{"n": 1}])
+
+        now[0] = 9.9
+        assert cache.get(("history", "1")) == [{"n": 1}]
+        now[0] = 10
+        assert cache.get(("history", "1")) is None
+        assert len(cache) == 0
+
+    def test_invalid_ttl(self):
+        """Test non-positive TTL is rejected."""
+        with pytest.raises(ValueError):
+            TaxRecordCache(ttl=0)
@@ -0,0 +1,133 @@
+"""
+Tests for local SQLite tax history/payments mirror.
+"""
+
+import json
+
+import httpx
+import pytest
+import respx
+
+from nalogo.client import Client
+from nalogo.tax_mirror import TaxMirror, content_hash, record_key
+
+
+def _charge(charge_id: int, amount: str, oktmo: str = "45000000") -> dict:
+    """Build tax history entry in API format."""
+    return {
+        "krsbTaxChargeId": charge_id,
+        "taxPeriodId": 202401,
+        "taxAmount": amount,
+        "oktmo": oktmo,
+        "regionName": "Москва",
+    }
+
+
+@pytest.fixture
+async def client():
+    """Authenticated client."""
+    client = Client()
+    await client.authenticate(json.dumps({"token": "test_access_token"}))
+    return client
+
+
+class TestTaxMirror:
+    """Test TaxMirror sync and queries."""
+
+    @pytest.mark.asyncio
+    async def test_sync_writes_only_changes(self, client):
+        """Test sync inserts and updates only changed records."""
+        mirror = TaxMirror()
+        first = [_charge(1, "10.00"), _charge(2, "20.00")]
+        second = [_charge(1, "10.00"), _charge(2, "25.00"), _charge(3, "30.00")]
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/taxes/history").mock(
+                side_effect=[
+                    httpx.Response(200, json={"records": first}),
+                    httpx.Response(200, json={"records": second}),
+                ]
+            )
+
+            result = await mirror.sync_history(client.tax())
+            assert (result.inserted, result.updated, result.unchanged) == (2, 0, 0)
+
+            result = await mirror.sync_history(client.tax())
+
+        assert result.fetched == 3
+        assert (result.inserted, result.updated, result.unchanged) == (1, 1, 1)
+        # Updated record keeps its position
+        assert mirror.history() == second
+
+    @pytest.mark.asyncio
+    async def test_sync_per_oktmo_isolates_errors(self, client):
+        """Test failure of one OKTMO does not stop others."""
+        mirror = TaxMirror()
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            oktmo = json.loads(request.content)["oktmo"]
+            if oktmo == "bad":
+                return httpx.Response(500, json={"message": "boom"})
+            return httpx.Response(
+                200, json={"records": [{"sourceId": 1, "oktmo": oktmo, "amount": 5}]}
+            )
+
+        with respx.mock(base_url="https://lknpd.nalog.ru/api/v1") as respx_mock:
+            respx_mock.post("/taxes/payments").mock(side_effect=respond)
+
+            result = await mirror.sync_payments(client.tax(), ["1", "bad", "2"])
+
+        assert result.inserted == 2
+        assert set(result.errors) == {"bad"}
+        assert [r["oktmo"] for r in mirror.payments()] == ["1", "2"]
+        assert mirror.payments(oktmo="2") == [
+            {"sourceId": 1, "oktmo": "2", "amount": 5}
+        ]
+
+    def test_prune(self):
+        """Test prune deletes records missing from response."""
+        mirror = TaxMirror()
+        mirror.apply("history", {"": [_charge(1, "1"), _charge(2, "2")]})
+
+        result = mirror.apply("history", {"": [_charge(2, "2")]}, prune=True)
+
+        assert result.removed == 1
+        assert result.unchanged == 1
+        assert len(mirror) == 1
+
+    def test_without_prune_missing_records_are_kept(self):
+        """Test records missing from response are kept without prune."""
+        mirror = TaxMirror()
+        mirror.apply("history", {"": [_charge(1, "1")]})
+        result = mirror.apply("history", {"": []})
+
+        assert result.removed == 0
+        assert len(mirror) == 1
+
+    def test_persists_across_connections(self, tmp_path):
+        """Test mirror file keeps records between connections."""
+        path = tmp_path / "tax.sqlite3"
+        with TaxMirror(path) as mirror:
+            mirror.apply("payments", {"": [{"documentIndex": "X1", "amount": 1}]})
+
+        with TaxMirror(path) as mirror:
+            result = mirror.apply(
+                "payments", {"": [{"documentIndex": "X1", "amount": 1}]}
+            )
+            assert result.unchanged == 1
+
+
+class TestRecordIdentity:
+    """Test record keys and hashes."""
+
+    def test_hash_ignores_key_order(self):
+        """Test content hash does not depend on key order."""
+        assert content_hash({"a": 1, "b": 2}) == content_hash({"b": 2, "a": 1})
+
+    def test_keys(self):
+        """Test record keys for charges, payments and fallback."""
+        assert record_key("history", _charge(7, "1")) == "charge:7"
+        assert record_key("payments", {"sourceType": "X", "sourceId": 3}) == (
+            "source:X:3"
+        )
+        assert record_key("payments", {"amount": 1}).startswith("hash:")
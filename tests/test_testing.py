@@ -0,0 +1,166 @@
+"""
+Tests for the in-process Moy Nalog emulator.
+"""
+
+import asyncio
+
+import pytest
+
+from nalogo.client import Client
+from nalogo.dto.income import CancelCommentType
+from nalogo.exceptions import (
+    NotFoundException,
+    PhoneException,
+    ServerException,
+    UnauthorizedException,
+    UnknownErrorException,
+    ValidationException,
+)
+from nalogo.testing import FakeNalogService
+
+
+class TestFakeNalogService:
+    """Test emulator flows through the real Client."""
+
+    @pytest.mark.asyncio
+    async def test_receipt_lifecycle(self, login):
+        """Test create, get and cancel receipt against fake service."""
+        service = FakeNalogService()
+        client = await login(service)
+
+        created = await client.income().create("Консультация", 1500, 2)
+        receipt_uuid = created["approvedReceiptUuid"]
+
+        receipt = await client.receipt().json(receipt_uuid)
+        assert receipt["totalAmount"] == "3000.00"
+        assert receipt["inn"] == service.inn
+
+        await client.income().cancel(receipt_uuid, CancelCommentType.REFUND)
+        listing = await client.income().list_incomes()
+        assert listing["content"][0]["cancellationInfo"]["comment"] == (
+            CancelCommentType.REFUND.value
+        )
+
+        with pytest.raises(ValidationException):
+            await client.income().cancel(receipt_uuid, CancelCommentType.REFUND)
+        with pytest.raises(NotFoundException):
+            await client.receipt().json("missing")
+
+    @pytest.mark.asyncio
+    async def test_wrong_password(self):
+        """Test wrong password is rejected."""
+        service = FakeNalogService()
+        client = Client(transport=service.transport())
+
+        with pytest.raises(UnauthorizedException):
+            await client.create_new_access_token(service.inn, "wrong")
+
+    @pytest.mark.asyncio
+    async def test_sms_flow(self):
+        """Test SMS challenge and verification."""
+        service = FakeNalogService(sms_code="4321")
+        client = Client(transport=service.transport())
+
+        challenge = await client.create_phone_challenge(service.phone)
+        with pytest.raises(PhoneException):
+            await client.create_new_access_token_by_phone(
+                service.phone, challenge["challengeToken"], "0000"
+            )
+        token = await client.create_new_access_token_by_phone(
+            service.phone, challenge["challengeToken"], "4321"
+        )
+        await client.authenticate(token)
+
+        assert (await client.user().get())["inn"] == service.inn
+
+    @pytest.mark.asyncio
+    async def test_expired_token_is_refreshed_and_rotated(self, login):
+        """Test expired token is refreshed and refresh token rotated."""
+        now = [1_000_000.0]
+        service = FakeNalogService(token_ttl=60, clock=lambda: now[0])
+        client = await login(service)
+        old = await client.auth_provider.get_token()
+
+        now[0] += 61
+        assert (await client.user().get())["inn"] == service.inn
+
+        new = await client.auth_provider.get_token()
+        assert new["token"] != old["token"]
+        assert old["refreshToken"] not in service.refresh_tokens
+        assert service.requests["auth_token"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_request(self):
+        """Test request without token is rejected."""
+        service = FakeNalogService()
+        client = Client(transport=service.transport())
+
+        with pytest.raises(UnauthorizedException):
+            await client.user().get()
+
+    @pytest.mark.asyncio
+    async def test_tax_records(self, login):
+        """Test tax records are filtered by OKTMO."""
+        service = FakeNalogService()
+        service.tax_payments = [
+            {"sourceId": 1, "oktmo": "45000000", "status": "Paid"},
+            {"sourceId": 2, "oktmo": "45000000", "status": "New"},
+            {"sourceId": 3, "oktmo": "46000000", "status": "Paid"},
+        ]
+        client = await login(service)
+
+        paid = await client.tax().payments("45000000", only_paid=True)
+        assert [r["sourceId"] for r in paid["records"]] == [1]
+
+        result = await client.tax().payments_many(["45000000", "46000000"])
+        assert [r["sourceId"] for r in result.records] == [1, 2, 3]
+
+
+class TestFaults:
+    """Test injected latency, errors and throttling."""
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self, login):
+        """Test injected server errors."""
+        service = FakeNalogService(seed=1)
+        client = await login(service)
+        service.error_rate = 1.0
+
+        with pytest.raises(ServerException):
+            await client.user().get()
+        assert service.statuses[500] == 1
+
+    @pytest.mark.asyncio
+    async def test_throttling(self, login):
+        """Test requests over rate limit get 429."""
+        service = FakeNalogService()
+        client = await login(service)
+        service.rate_limit = 2
+
+        results = await asyncio.gather(
+            *(client.user().get() for _ in range(5)), return_exceptions=True
+        )
+
+        throttled = [r for r in results if isinstance(r, UnknownErrorException)]
+        assert len(throttled) >= 3
+        assert service.statuses[429] == len(throttled)
+
+    @pytest.mark.asyncio
+    async def test_latency_overlaps_concurrent_requests(self, login):
+        """Test latency delays concurrent requests in parallel."""
+        service = FakeNalogService()
+        client = await login(service)
+        service.latency = 0.05
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await asyncio.gather(*(client.user().get() for _ in range(10)))
+
+        assert loop.time() - started < 0.4
+
+    def test_invalid_settings(self):
+        """Test invalid service settings are rejected."""
+        with pytest.raises(ValueError):
+            FakeNalogService(error_rate=2)
+        with pytest.raises(ValueError):
+            FakeNalogService(rate_limit=0)
@@ -0,0 +1,297 @@
+"""
+Tests for endpoint timeouts and call deadlines.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from nalogo.client import Client
+from nalogo.exceptions import DeadlineExceededException
+from nalogo.metrics import HTTPMetrics
+from nalogo.middleware import Middleware, RequestContext
+from nalogo.testing import FakeNalogService
+from nalogo.timeouts import (
+    AdaptiveTimeouts,
+    EndpointTimeouts,
+    clamp,
+    current_deadline,
+    deadline,
+    remaining,
+)
+
+
+class TimeoutRecorder(Middleware):
+    """Remember timeout extension of requests."""
+
+    def __init__(self) -> None:
+        self.timeouts: list[dict[str, float | None]] = []
+
+    async def after_response(
+        self, ctx: RequestContext, response: httpx.Response
+    ) -> httpx.Response:
+        self.timeouts.append(dict(ctx.request.extensions["timeout"]))
+        return response
+
+
+class TestEndpointTimeouts:
+    """Test per-endpoint timeout selection."""
+
+    def test_longest_prefix(self):
+        """Test longest matching prefix wins."""
+        timeouts = EndpointTimeouts(
+            5.0,
+            {
+                "/receipt": httpx.Timeout(30.0, connect=2.0),
+                "/receipt/print": 60.0,
+            },
+        )
+
+        assert timeouts.for_path("/user") == httpx.Timeout(5.0)
+        assert timeouts.for_path("/receipt/1/2/json").connect == 2.0
+        assert timeouts.for_path("/receipt/print/1").read == 60.0
+
+    def test_invalid_prefix(self):
+        """Test prefix without leading slash is rejected."""
+        with pytest.raises(ValueError, match="must start with"):
+            EndpointTimeouts(endpoints={"receipt": 1.0})
+
+    def test_clamp(self):
+        """Test phase timeouts are clamped to remaining budget."""
+        timeout = httpx.Timeout(10.0, connect=1.0, pool=None)
+
+        assert clamp(timeout, 3.0) == {
+            "connect": 1.0,
+            "read": 3.0,
+            "write": 3.0,
+            "pool": 3.0,
+        }
+        assert clamp(timeout, -1.0)["read"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_request_uses_endpoint_timeout(self, login):
+        """Test request is sent with endpoint timeout."""
+        recorder = TimeoutRecorder()
+        client = await login(
+            FakeNalogService(),
+            timeout=EndpointTimeouts(5.0, {"/user": httpx.Timeout(7.0, connect=1.0)}),
+            middlewares=[recorder],
+        )
+
+        await client.user().get()
+
+        assert recorder.timeouts == [
+            {"connect": 1.0, "read": 7.0, "write": 7.0, "pool": 7.0}
+        ]
+
+
+class TestDeadline:
+    """Test deadline scopes and enforcement."""
+
+    def test_nested_deadline_never_extends(self):
+        """Test inner deadline cannot extend outer one."""
+        assert current_deadline() is None
+        with deadline(1.0) as outer:
+            with deadline(10.0) as inner:
+                assert inner == outer
+            with deadline(0.5) as inner:
+                assert inner < outer
+            assert 0 < remaining() <= 1.0
+        assert remaining() is None
+
+    def test_negative_deadline(self):
+        """Test negative deadline is rejected."""
+        with pytest.raises(ValueError, match="negative"), deadline(-1):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_deadline_exceeded(self, login):
+        """Test slow request raises deadline exceeded."""
+        service = FakeNalogService()
+        client = await login(service)
+        service.latency = 0.5
+
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceededException), deadline(0.05):
+            await client.user().get()
+
+        assert time.monotonic() - start < 0.4
+
+    @pytest.mark.asyncio
+    async def test_budget_clamps_phase_timeouts(self, login):
+        """Test remaining budget clamps phase timeouts."""
+        recorder = TimeoutRecorder()
+        client = await login(FakeNalogService(), middlewares=[recorder])
+
+        with deadline(2.0):
+            await client.user().get()
+
+        assert all(0 < value <= 2.0 for value in recorder.timeouts[0].values())
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_retry_share_budget(self, login):
+        """Test token refresh and retry share one deadline."""
+        service = FakeNalogService()
+        client = await login(service)
+        service.latency = 0.04
+        service.expire_tokens()
+
+        # Request, refresh and retry take ~0.12s together
+        with pytest.raises(DeadlineExceededException), deadline(0.1):
+            await client.user().get()
+        assert service.requests["auth_token"] == 1
+
+        service.expire_tokens()
+        with deadline(2.0):
+            await client.user().get()
+
+    @pytest.mark.asyncio
+    async def test_client_default_deadline(self, login):
+        """Test client default deadline applies to requests."""
+        service = FakeNalogService()
+        client = await login(service, deadline=0.05)
+        service.latency = 0.5
+
+        with pytest.raises(DeadlineExceededException):
+            await client.user().get()
+        # Explicit shorter scope still wins over the client default
+        with pytest.raises(DeadlineExceededException), deadline(0.01):
+            await client.user().get()
+
+    @pytest.mark.asyncio
+    async def test_explicit_deadline_overrides_client_default(self, login):
+        """Test explicit deadline longer than client default is kept."""
+        service = FakeNalogService()
+        client = await login(service, deadline=0.05)
+        service.latency = 0.1
+
+        with deadline(5.0):
+            assert (await client.user().get())["id"] == 1
+        response = await client.http_client.get("/user", deadline=5.0)
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_request_argument(self, login):
+        """Test per-request deadline argument."""
+        service = FakeNalogService()
+        client = await login(service)
+        service.latency = 0.5
+
+        with pytest.raises(DeadlineExceededException):
+            await client.http_client.get("/user", deadline=0.05)
+
+    @pytest.mark.asyncio
+    async def test_spent_budget_fails_before_sending(self, login):
+        """Test spent budget fails without sending request."""
+        service = FakeNalogService()
+        client = await login(service)
+
+        with deadline(0.01):
+            await asyncio.sleep(0.02)
+            with pytest.raises(DeadlineExceededException, match="before"):
+                await client.user().get()
+
+        assert service.requests["user"] == 0
+
+
+class TestAdaptiveTimeouts:
+    """Test timeouts derived from latency percentiles."""
+
+    def test_percentile_times_factor(self):
+        """Test timeout is percentile latency times factor."""
+        timeouts = AdaptiveTimeouts(
+            percentile=90, factor=2, minimum=0.1, maximum=10, min_samples=10
+        )
+        for i in range(1, 11):
+            timeouts.observe("GET", "/user", i / 10)
+
+        assert timeouts.seconds_for("GET", "/user") == pytest.approx(1.8)
+        assert timeouts.timeout_for("GET", "/user") == httpx.Timeout(1.8)
+        # Other endpoints still use maximum
+        assert timeouts.seconds_for("POST", "/income") == 10
+
+    def test_bounds(self):
+        """Test timeout is clamped to minimum and maximum."""
+        timeouts = AdaptiveTimeouts(minimum=0.5, maximum=2, min_samples=1)
+        timeouts.observe("GET", "/fast", 0.01)
+        timeouts.observe("GET", "/slow", 5)
+
+        assert timeouts.seconds_for("GET", "/fast") == 0.5
+        assert timeouts.seconds_for("GET", "/slow") == 2
+
+    def test_rolling_window_and_templates(self):
+        """Test rolling window per endpoint template."""
+        timeouts = AdaptiveTimeouts(
+            percentile=100, factor=1, minimum=0.01, window=3, min_samples=3
+        )
+        for seconds in (5.0, 0.2, 0.2, 0.2):
+            timeouts.observe("GET", "/receipt/500100732259/abc1/json", seconds)
+
+        assert timeouts.values() == {("GET", "/receipt/{id}/{id}/json"): 0.2}
+        assert timeouts.seconds_for("GET", "/receipt/1/2/json") == 0.2
+
+    def test_fixed_connect(self):
+        """Test connect timeout stays fixed."""
+        timeouts = AdaptiveTimeouts(connect=1.5)
+
+        assert timeouts.timeout_for("GET", "/user").connect == 1.5
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            {"percentile": 0},
+            {"factor": 0},
+            {"minimum": 2, "maximum": 1},
+            {"window": 10, "min_samples": 11},
+        ],
+    )
+    def test_validation(self, kwargs):
+        """Test invalid adaptive settings are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveTimeouts(**kwargs)
+
+    @pytest.mark.asyncio
+    async def test_client_adapts_and_reports(self, login):
+        """Test client adapts timeouts and reports them."""
+        adaptive = AdaptiveTimeouts(
+            percentile=99, factor=3, minimum=0.05, maximum=5, min_samples=5
+        )
+        metrics = HTTPMetrics()
+        recorder = TimeoutRecorder()
+        client = await login(
+            FakeNalogService(latency=0.01),
+            adaptive_timeouts=adaptive,
+            metrics=metrics,
+            middlewares=[recorder],
+        )
+
+        for _ in range(6):
+            await client.user().get()
+
+        assert recorder.timeouts[0]["read"] == 5
+        current = adaptive.seconds_for("GET", "/user")
+        assert 0.05 <= current < 1
+        assert recorder.timeouts[-1]["read"] == current
+        gauge = metrics.adaptive_timeout.get(("GET", "/user"))
+        assert gauge == recorder.timeouts[-1]["read"]
+        assert "nalogo_http_adaptive_timeout_seconds" in metrics.render_prometheus()
+
+    @pytest.mark.asyncio
+    async def test_timeout_recorded_as_sample(self):
+        """Test timed out request is recorded as latency sample."""
+
+        def timeout(request: httpx.Request) -> httpx.Response:
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        adaptive = AdaptiveTimeouts(minimum=0.1, maximum=3, min_samples=1)
+        client = Client(
+            transport=httpx.MockTransport(timeout), adaptive_timeouts=adaptive
+        )
+
+        with pytest.raises(httpx.ReadTimeout):
+            await client.user().get()
+
+        # Sample is the timeout used (maximum, no samples yet)
+        assert adaptive.values() == {("GET", "/user"): 3}
@@ -0,0 +1,189 @@
+"""
+Tests for tracing spans and correlation IDs.
+"""
+
+import contextlib
+import logging
+
+import pytest
+
+from nalogo.client import Client
+from nalogo.exceptions import NotFoundException
+from nalogo.testing import FakeNalogService
+from nalogo.tracing import (
+    CORRELATION_ATTRIBUTE,
+    CorrelationIdFilter,
+    HTTPPhaseTrace,
+    OpenTelemetryTracer,
+    RecordingTracer,
+    correlation_scope,
+    current_correlation_id,
+)
+
+
+class TestApiSpans:
+    """Test spans recorded around API calls."""
+
+    @pytest.mark.asyncio
+    async def test_create_phases(self, login):
+        """Test receipt creation records HTTP phase spans."""
+        tracer = RecordingTracer()
+        client = await login(FakeNalogService(), tracer=tracer)
+
+        await client.income().create("Service", 100, 1)
+
+        (root,) = tracer.find("IncomeAPI.create")
+        assert root.parent_id is None
+        (inner,) = tracer.find("IncomeAPI.create_multiple_items")
+        assert inner.parent_id == root.span_id
+        assert [s.name for s in tracer.children(inner)] == [
+            "validation",
+            "model_dump",
+            "http.request",
+            "json.parse",
+        ]
+        (request,) = tracer.find("http.request")
+        assert request.attributes["http.route"] == "/income"
+        assert request.attributes["http.status_code"] == 200
+        assert all(s.end_time is not None for s in tracer.spans)
+
+    @pytest.mark.asyncio
+    async def test_correlation_id(self, login):
+        """Test correlation id is sent and set on spans."""
+        tracer = RecordingTracer()
+        client = await login(FakeNalogService(), tracer=tracer)
+
+        await client.tax().get()
+        await client.tax().get()
+        first, second = tracer.find("TaxAPI.get")
+        assert first.attributes[CORRELATION_ATTRIBUTE] != (
+            second.attributes[CORRELATION_ATTRIBUTE]
+        )
+        assert current_correlation_id() is None
+
+        with correlation_scope("req-42"):
+            await client.tax().history_many(["1", "2"])
+        (many,) = tracer.find("TaxAPI.history_many")
+        assert many.attributes[CORRELATION_ATTRIBUTE] == "req-42"
+        assert all(
+            s.attributes[CORRELATION_ATTRIBUTE] == "req-42"
+            for s in tracer.find("TaxAPI.history")
+        )
+        assert [s.parent_id for s in tracer.find("queue")] == [many.span_id] * 2
+
+    @pytest.mark.asyncio
+    async def test_render(self, login):
+        """Test local receipt rendering is traced around the JSON fetch."""
+        service = FakeNalogService()
+        tracer = RecordingTracer()
+        client = await login(service, tracer=tracer)
+        created = await client.income().create("Service", 100, 1)
+
+        await client.receipt().render(created["approvedReceiptUuid"])
+
+        (root,) = tracer.find("ReceiptAPI.render")
+        (fetch,) = tracer.find("ReceiptAPI.json")
+        assert root.parent_id is None
+        assert fetch.parent_id == root.span_id
+
+    @pytest.mark.asyncio
+    async def test_refresh_and_error(self, login):
+        """Test token refresh and errors are traced."""
+        service = FakeNalogService()
+        tracer = RecordingTracer()
+        client = await login(service, tracer=tracer)
+        service.expire_tokens()
+
+        with pytest.raises(NotFoundException):
+            await client.receipt().json("missing1")
+
+        (refresh,) = tracer.find("auth.refresh")
+        (request,) = tracer.find("http.request")
+        assert refresh.parent_id == request.span_id
+        assert request.attributes["http.status_code"] == 404
+        (root,) = tracer.find("ReceiptAPI.json")
+        assert isinstance(root.exception, NotFoundException)
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self):
+        """Test client tracer is disabled unless given."""
+        client = Client()
+        assert client.http_client.tracer.enabled is False
+
+
+class TestHTTPPhaseTrace:
+    """Test spans built from httpx trace events."""
+
+    @pytest.mark.asyncio
+    async def test_phases(self):
+        """Test phase trace records spans and errors."""
+        tracer = RecordingTracer()
+        trace = HTTPPhaseTrace(tracer)
+        error = OSError("reset")
+
+        with tracer.span("http.request") as request:
+            for event in (
+                "connection.connect_tcp.started",
+                "connection.connect_tcp.complete",
+                "connection.start_tls.started",
+                "connection.start_tls.complete",
+                "http11.send_request_headers.started",
+                "http11.send_request_headers.complete",
+                "http11.receive_response_headers.started",
+                "http11.receive_response_headers.complete",
+                "http11.receive_response_body.started",
+                "http11.response_closed.started",
+            ):
+                await trace(event, {})
+            await trace("http11.receive_response_body.failed", {"exception": error})
+
+        assert [s.name for s in tracer.children(request)] == [
+            "http.connect",
+            "http.tls",
+            "http.send",
+            "http.server_wait",
+            "http.receive",
+        ]
+        assert tracer.find("http.receive")[0].exception is error
+        assert all(s.end_time for s in tracer.spans)
+
+
+class TestOpenTelemetryTracer:
+    """Test adapter calls OpenTelemetry tracer API."""
+
+    def test_adapter(self):
+        """Test OpenTelemetry adapter forwards spans and attributes."""
+        calls = []
+
+        class FakeOtelTracer:
+            def start_as_current_span(self, name, attributes=None, **kwargs):
+                calls.append(("current", name, attributes, kwargs))
+                return contextlib.nullcontext()
+
+            def start_span(self, name, attributes=None, start_time=None):
+                calls.append(("span", name, attributes, start_time))
+                return object()
+
+        tracer = OpenTelemetryTracer(FakeOtelTracer())
+        with tracer.span("a", {"k": 1}):
+            tracer.start_span("b", start_time=5)
+
+        assert calls == [
+            ("current", "a", {"k": 1}, {"record_exception": True}),
+            ("span", "b", None, 5),
+        ]
+
+
+class TestCorrelationIdFilter:
+    """Test log record enrichment."""
+
+    def test_filter(self):
+        """Test log filter adds correlation id to records."""
+        record = logging.LogRecord("x", logging.INFO, "", 0, "msg", (), None)
+        log_filter = CorrelationIdFilter()
+
+        log_filter.filter(record)
+        assert record.correlation_id == "-"
+        with correlation_scope("abc"):
+            log_filter.filter(record)
+        assert record.correlation_id == "abc"
@@ -0,0 +1,99 @@
+"""
+Tests for INN checksum and batch client validation.
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from nalogo.dto.income import IncomeClient, IncomeType
+from nalogo.validation import (
+    DISPLAY_NAME_MAX_LENGTH,
+    RowError,
+    inn_error,
+    is_valid_inn,
+    validate_clients,
+)
+
+
+class TestInn:
+    """Test INN control digit validation."""
+
+    @pytest.mark.parametrize(
+        "inn", ["7707083893", "7736207543", "500100732259", "773400211252"]
+    )
+    def test_valid(self, inn):
+        """Test real organization and individual INNs."""
+        assert is_valid_inn(inn)
+
+    @pytest.mark.parametrize(
+        ("inn", "message"),
+        [
+            ("7707083894", "INN checksum is invalid"),
+            ("500100732250", "INN checksum is invalid"),
+            ("123456789", "INN length must be 10 or 12 digits"),
+            ("77070838９3", "INN must contain only numbers"),  # noqa: RUF001
+            ("", "INN must contain only numbers"),
+        ],
+    )
+    def test_invalid(self, inn, message):
+        """Test checksum, length and non-ASCII digit errors."""
+        assert inn_error(inn) == message
+
+
+class TestValidateClients:
+    """Test batch pre-validation."""
+
+    def test_mixed_rows(self):
+        """Test per-row errors for models and raw mappings."""
+        rows = [
+            IncomeClient(inn="7707083893", display_name="ООО Ромашка"),
+            {"incomeType": "FROM_LEGAL_ENTITY", "inn": "7707083894"},
+            {"income_type": "FROM_LEGAL_ENTITY", "display_name": "  "},
+            {"inn": "500100732259", "displayName": "x" * 300},
+            {"incomeType": "FROM_NOWHERE"},
+            {},
+        ]
+
+        assert validate_clients(rows) == [
+            RowError(1, "inn", "INN checksum is invalid"),
+            RowError(
+                1, "display_name", "Client DisplayName cannot be empty for legal entity"
+            ),
+            RowError(2, "inn", "Client INN cannot be empty for legal entity"),
+            RowError(
+                2, "display_name", "Client DisplayName cannot be empty for legal entity"
+            ),
+            RowError(
+                3, "display_name", "Client DisplayName must be at most 256 characters"
+            ),
+            RowError(4, "income_type", "Unknown income type: FROM_NOWHERE"),
+        ]
+
+    @pytest.mark.parametrize("length", [256, 257])
+    def test_display_name_limit_matches_model(self, length):
+        """Test batch validation and IncomeClient share the length limit."""
+        record = {"inn": "500100732259", "display_name": "x" * (length - 1) + " "}
+
+        errors = validate_clients([record])
+        try:
+            IncomeClient(**record)
+        except ValidationError:
+            accepted = False
+        else:
+            accepted = True
+
+        assert accepted is (length <= DISPLAY_NAME_MAX_LENGTH)
+        assert (errors == []) is accepted
+
+    def test_large_batch(self):
+        """Test valid batch of thousands of rows has no errors."""
+        rows = [
+            {
+                "incomeType": IncomeType.FROM_LEGAL_ENTITY,
+                "inn": "7736207543",
+                "displayName": f"Client {i}",
+            }
+            for i in range(5000)
+        ]
+
+        assert validate_clients(rows) == []